@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Solve time against chiller count with one binary per chiller and with
+the aggregated (number of chillers on) formulation.
+
+Run from the top of the repository:
+
+    python -m benchmarks.chiller_symmetry
+"""
+
+import argparse
+
+from econ_dispatch.optimizer import get_optimization_function
+from benchmarks.common import get_parameters, hospital_forecast
+
+
+def main(chiller_counts, hours, start, solver):
+    optimize = get_optimization_function({"name": "use_case_1", "solver": solver})
+    # Scale the cooling load with the number of chillers so they all get used.
+    forecast = hospital_forecast(hours, start)
+
+    row = "{:>9} {:>14} {:>14} {:>14} {:>14}"
+    print(row.format("chillers", "binary (s)", "aggregate (s)", "binary obj", "aggregate obj"))
+    for chiller_count in chiller_counts:
+        scaled = [dict(record, cool_load=record["cool_load"] * chiller_count / 3.0) for record in forecast]
+
+        parameters = get_parameters(chiller_count)
+        binary = optimize(None, scaled, parameters)
+
+        parameters["chiller_aggregate"] = True
+        aggregate = optimize(None, scaled, parameters)
+
+        print(row.format(chiller_count,
+                         "{:.3f}".format(binary["Convergence Time"]),
+                         "{:.3f}".format(aggregate["Convergence Time"]),
+                         "{:.2f}".format(binary["Objective Value"]),
+                         "{:.2f}".format(aggregate["Objective Value"])))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chillers", type=int, nargs="+", default=[1, 2, 4, 6, 8, 10])
+    parser.add_argument("--hours", type=int, default=24)
+    parser.add_argument("--start", type=int, default=4226, help="First row of the hospital data")
+    parser.add_argument("--solver", default="default")
+    args = parser.parse_args()
+
+    main(args.chillers, args.hours, args.start, args.solver)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Shared optimizer workloads for the benchmark scripts."""
+
+import numpy as np
+import pandas as pd
+
+HOSPITAL_DATA = "hospital_modeled_data.csv"
+
+# Values of the static component models in example.config.
+STATIC_PARAMETERS = {
+    "mat_prime_mover": [0.553388269906111, 0.00770880111175251],
+    "xmax_prime_mover": 408.200000000000,
+    "xmin_prime_mover": 20.5100000000000,
+    "cap_prime_mover": 500.0,
+
+    "mat_boiler": [[1.02338001783412, -5.47472301330830, -11.2128369305035],
+                   [1.25837185026029, 1.52937309060521, 1.65693038866453]],
+    "xmax_boiler": [23.9781302213668, 44.9845991134643, 61.2098989486694],
+    "xmin_boiler": [0.149575993418693, 23.9781302213668, 44.9845991134643],
+    "cap_boiler": 8.0,
+
+    "mat_chillerIGV": [14.0040999536939, 35.4182417367909],
+    "xmax_chillerIGV": 2.13587853974753,
+    "xmin_chillerIGV": 0.155991129307404,
+    "capacity_per_chiller": 200.0,
+    "chiller_count": 3,
+
+    "mat_abschiller": [1.42355081496335, 0.426344465964358],
+    "xmax_abschiller": 7.91954964176049,
+    "xmin_abschiller": 6.55162743091095,
+    "cap_abs_chiller": 464.0,
+}
+
+
+def get_parameters(chiller_count=3):
+    """Component parameters in the form returned by SystemModel.get_parameters."""
+    parameters = dict(STATIC_PARAMETERS)
+    parameters["xmax_boiler"] = list(parameters["xmax_boiler"])
+    parameters["xmin_boiler"] = list(parameters["xmin_boiler"])
+    parameters["chiller_count"] = chiller_count
+    return parameters
+
+
+def make_forecast(elec_load, heat_load, cool_load, natural_gas_cost=7.614, electricity_cost=0.1):
+    forecast = []
+    for elec, heat, cool in zip(elec_load, heat_load, cool_load):
+        forecast.append({"elec_load": float(elec),
+                         "heat_load": float(heat),
+                         "cool_load": float(cool),
+                         "solar_kW": 0.0,
+                         "natural_gas_cost": natural_gas_cost,
+                         "electricity_cost": electricity_cost})
+    return forecast
+
+
+def hospital_forecast(hours=24, start=4226, file_name=HOSPITAL_DATA):
+    """Forecast taken directly from the hospital data, as in test_opt.py."""
+    data = pd.read_csv(file_name)
+    rows = data.iloc[start:start + hours]
+    return make_forecast(rows["Building Electric Load"].values,
+                         rows["Building Heating Load"].values / 293.1,  # kW -> mmBtu/hr
+                         rows["Building Cooling Load"].values / 293.1)
+
+
+def synthetic_forecast(hours=24, seed=0):
+    """Daily load profiles with some noise."""
+    rng = np.random.RandomState(seed)
+    hour_of_day = np.arange(hours) % 24
+    daily = np.sin(np.pi * (hour_of_day - 6) / 12.0).clip(0)
+
+    elec_load = 600.0 + 400.0 * daily + rng.normal(0, 20, hours)
+    heat_load = (2.0 - 1.5 * daily + rng.normal(0, 0.1, hours)).clip(0)
+    cool_load = (0.5 + 3.0 * daily + rng.normal(0, 0.1, hours)).clip(0)
+
+    return make_forecast(elec_load, heat_load, cool_load)
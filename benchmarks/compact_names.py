@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Time building the PuLP model of use_case_1 and writing it as an LP file
+with the variable and constraint names and with compact names.
+
+Run from the top of the repository:
+
+    python -m benchmarks.compact_names
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import timeit
+
+from econ_dispatch.optimizer.use_case_1 import get_optimization_matrix
+from benchmarks.common import get_parameters, synthetic_forecast
+
+
+def time_call(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def time_mode(problem, compact_names, lp_file, repeat):
+    problem.compact_names = compact_names
+    build_time = time_call(problem.to_pulp, repeat)
+    prob = problem.to_pulp()
+    write_time = time_call(lambda: prob.writeLP(lp_file), repeat)
+    return build_time, write_time, os.path.getsize(lp_file)
+
+
+def main(horizons, chiller_counts, repeat):
+    directory = tempfile.mkdtemp()
+    lp_file = os.path.join(directory, "benchmark.lp")
+
+    row = "{:>8} {:>9} {:>7} {:>12} {:>12} {:>12}"
+    print(row.format("horizon", "chillers", "names", "build (s)", "write (s)", "size (kB)"))
+    try:
+        for hours in horizons:
+            forecast = synthetic_forecast(hours)
+            for chiller_count in chiller_counts:
+                problem = get_optimization_matrix(forecast, get_parameters(chiller_count))
+                for compact_names in (False, True):
+                    build_time, write_time, size = time_mode(problem, compact_names, lp_file, repeat)
+                    print(row.format(hours, chiller_count,
+                                     "compact" if compact_names else "full",
+                                     "{:.4f}".format(build_time),
+                                     "{:.4f}".format(write_time),
+                                     "{:.0f}".format(size / 1000.0)))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--horizons", type=int, nargs="+", default=[24, 48, 96, 168])
+    parser.add_argument("--chillers", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    main(args.horizons, args.chillers, args.repeat)
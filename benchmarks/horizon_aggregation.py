@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Objective and solve time of a long horizon at full hourly resolution
+and with later hours aggregated into longer blocks.
+
+Run from the top of the repository:
+
+    python -m benchmarks.horizon_aggregation
+
+The objective of both is the cost over the whole horizon. The first hour
+dispatch is what gets sent to the components, the last column shows
+whether both resolutions agree on which units are on in that hour.
+"""
+
+import argparse
+import json
+
+from econ_dispatch.optimizer import get_optimization_function
+from benchmarks.common import get_parameters, hospital_forecast
+
+DEFAULT_AGGREGATION = [[24, 1], [24, 2], [24, 4], [96, 8]]
+
+
+def first_hour_units(result):
+    return sorted(name for name, value in result.items()
+                  if name.startswith("S") and name.endswith("_hour00") and value and value > 0.5)
+
+
+def main(starts, hours, chiller_count, solver, aggregation):
+    full = get_optimization_function({"name": "use_case_1", "solver": solver})
+    aggregated = get_optimization_function({"name": "use_case_1", "solver": solver,
+                                            "horizon_aggregation": aggregation})
+    parameters = get_parameters(chiller_count)
+
+    row = "{:>6} {:>10} {:>10} {:>12} {:>12} {:>9} {:>11}"
+    print(row.format("start", "full (s)", "agg (s)", "full obj", "agg obj", "diff (%)", "same hour0"))
+    for start in starts:
+        forecast = hospital_forecast(hours, start)
+        full_result = full(None, forecast, parameters)
+        aggregated_result = aggregated(None, forecast, parameters)
+
+        difference = 100.0 * (aggregated_result["Objective Value"] - full_result["Objective Value"]) / \
+            full_result["Objective Value"]
+        print(row.format(start,
+                         "{:.3f}".format(full_result["Convergence Time"]),
+                         "{:.3f}".format(aggregated_result["Convergence Time"]),
+                         "{:.2f}".format(full_result["Objective Value"]),
+                         "{:.2f}".format(aggregated_result["Objective Value"]),
+                         "{:.2f}".format(difference),
+                         str(first_hour_units(full_result) == first_hour_units(aggregated_result))))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--starts", type=int, nargs="+", default=[500, 2000, 4226, 6000],
+                        help="First rows of the hospital data")
+    parser.add_argument("--hours", type=int, default=168, help="Optimization horizon")
+    parser.add_argument("--chillers", type=int, default=3)
+    parser.add_argument("--solver", default="default")
+    parser.add_argument("--aggregation", type=json.loads, default=DEFAULT_AGGREGATION,
+                        help="[hours, block length] pairs as JSON")
+    args = parser.parse_args()
+
+    main(args.starts, args.hours, args.chillers, args.solver, args.aggregation)
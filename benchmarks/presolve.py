@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Fixed variables and solve time with and without presolve.
+
+Run from the top of the repository:
+
+    python -m benchmarks.presolve
+
+The default start is a stretch of the hospital data with several hours
+without cooling load.
+"""
+
+import argparse
+
+from econ_dispatch.optimizer import get_optimization_function
+from benchmarks.common import get_parameters, hospital_forecast
+
+
+def run(config, start, steps, hours, chiller_count):
+    optimize = get_optimization_function(config)
+    parameters = get_parameters(chiller_count)
+
+    total_time = 0.0
+    total_objective = 0.0
+    fixed_variables = 0
+    inactive_constraints = 0
+    for step in range(steps):
+        forecast = hospital_forecast(hours, start + step)
+        result = optimize(None, forecast, parameters)
+        total_time += result["Convergence Time"]
+        total_objective += result["Objective Value"]
+        fixed_variables += result.get("Presolve Fixed Variables", 0)
+        inactive_constraints += result.get("Presolve Inactive Constraints", 0)
+
+    return total_time, total_objective, fixed_variables / float(steps), inactive_constraints / float(steps)
+
+
+def main(start, steps, hours, chiller_count, solver):
+    row = "{:>9} {:>16} {:>16} {:>14} {:>16}"
+    print(row.format("presolve", "solve time (s)", "sum objective", "fixed vars", "inactive constr"))
+    for presolve in (False, True):
+        config = {"name": "use_case_1",
+                  "solver": solver,
+                  "presolve": presolve}
+        total_time, total_objective, fixed_variables, inactive_constraints = run(config, start, steps, hours,
+                                                                                 chiller_count)
+        print(row.format(str(presolve),
+                         "{:.3f}".format(total_time),
+                         "{:.2f}".format(total_objective),
+                         "{:.1f}".format(fixed_variables),
+                         "{:.1f}".format(inactive_constraints)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--start", type=int, default=130, help="First row of the hospital data")
+    parser.add_argument("--steps", type=int, default=24, help="Number of hourly optimizations")
+    parser.add_argument("--hours", type=int, default=24, help="Optimization horizon")
+    parser.add_argument("--chillers", type=int, default=3)
+    parser.add_argument("--solver", default="default")
+    args = parser.parse_args()
+
+    main(args.start, args.steps, args.hours, args.chillers, args.solver)
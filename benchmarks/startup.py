@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Import time and memory of looking up the component and forecast model
+classes of a small configuration, against importing every component module
+as the registry did before it became lazy.
+
+Each measurement runs in a fresh interpreter. Run from the top of the
+repository:
+
+    python -m benchmarks.startup
+"""
+
+import argparse
+import json
+import logging
+import resource
+import subprocess
+import sys
+import time
+
+DEFAULT_COMPONENTS = ["boiler", "chiller", "electric_meter", "natural_gas_meter"]
+DEFAULT_FORECASTS = ["electricity_cost.static", "natural_gas_cost.static"]
+
+
+def measure(components, forecasts, eager):
+    """Time and peak memory growth of the lookups in this interpreter."""
+    logging.disable(logging.CRITICAL)
+    modules = len(sys.modules)
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+
+    from econ_dispatch.component_models import get_component_class, _componentList
+    for name in (_componentList if eager else components):
+        get_component_class(name)
+
+    if forecasts:
+        from econ_dispatch.forecast_models import get_forecast_model_type
+        for forecast in forecasts:
+            get_forecast_model_type(*forecast.split("."))
+
+    return {"time": time.time() - start,
+            "memory": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memory,
+            "modules": len(sys.modules) - modules}
+
+
+def run(components, forecasts, eager):
+    command = [sys.executable, "-m", "benchmarks.startup", "--child",
+               "--components"] + components + ["--forecasts"] + forecasts
+    if eager:
+        command.append("--eager")
+    return json.loads(subprocess.check_output(command).decode("utf-8").splitlines()[-1])
+
+
+def main(components, forecasts, repeat):
+    row = "{:>8} {:>10} {:>14} {:>9}"
+    print(row.format("registry", "time (s)", "memory (MB)", "modules"))
+    for eager in (True, False):
+        results = [run(components, forecasts, eager) for _ in range(repeat)]
+        best = min(results, key=lambda result: result["time"])
+        print(row.format("eager" if eager else "lazy",
+                         "{:.3f}".format(best["time"]),
+                         # ru_maxrss is in kB on Linux.
+                         "{:.1f}".format(best["memory"] / 1024.0),
+                         best["modules"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--components", nargs="*", default=DEFAULT_COMPONENTS)
+    parser.add_argument("--forecasts", nargs="*", default=DEFAULT_FORECASTS,
+                        help="Forecast models as name.type")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.components, args.forecasts, args.eager)))
+    else:
+        main(args.components, args.forecasts, args.repeat)
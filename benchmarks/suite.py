@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Optimizer benchmark over horizon, chiller count, solver and workload.
+
+Run from the top of the repository:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --output new.json --compare results.json
+
+Every case builds a fresh optimization function and solves the workload
+--repeat times, so the first run includes building the model template and
+later runs only update it. The results file holds the environment and one
+record per run, --compare prints the change in solve time and objective
+against an earlier results file, matching cases by workload, horizon,
+chillers and solver. Node counts are only reported by the "highs" backend.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+
+import numpy as np
+
+from econ_dispatch.optimizer import get_optimization_function
+from benchmarks.common import get_parameters, hospital_forecast, synthetic_forecast
+
+WORKLOADS = {"hospital": lambda hours, start: hospital_forecast(hours, start),
+             "synthetic": lambda hours, start: synthetic_forecast(hours, seed=start)}
+
+CASE_KEYS = ("workload", "hours", "chillers", "solver")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"]).decode("ascii").strip()
+    except Exception:
+        return None
+
+
+def run_case(workload, hours, chillers, solver, start, repeat):
+    optimize = get_optimization_function({"name": "use_case_1",
+                                          "solver": solver,
+                                          "timing": True})
+    forecast = WORKLOADS[workload](hours, start)
+    parameters = get_parameters(chillers)
+
+    records = []
+    for run in range(repeat):
+        record = {"workload": workload, "hours": hours, "chillers": chillers, "solver": solver, "run": run}
+        result = optimize(None, forecast, parameters)
+        record.update({"status": result["Optimization Status"],
+                       "source": result["Solution Source"],
+                       "objective": result["Objective Value"],
+                       "build_time": result["Build Time"],
+                       "solve_time": result["Solve Time"],
+                       "node_count": result.get("Node Count"),
+                       "variables": len(result.layout.names)})
+        records.append(record)
+    return records
+
+
+def compare(records, baseline_file):
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+
+    def by_case(rows):
+        cases = {}
+        for row in rows:
+            if "error" not in row:
+                cases.setdefault(tuple(row[key] for key in CASE_KEYS), []).append(row)
+        return cases
+
+    old_cases = by_case(baseline["records"])
+    row = "{:>10} {:>6} {:>9} {:>8} {:>12} {:>12} {:>14}"
+    print(row.format("workload", "hours", "chillers", "solver", "solve ratio", "build ratio", "objective diff"))
+    for case, new in sorted(by_case(records).items()):
+        old = old_cases.get(case)
+        if old is None:
+            continue
+        solve_ratio = np.median([r["solve_time"] for r in new]) / np.median([r["solve_time"] for r in old])
+        build_ratio = np.median([r["build_time"] for r in new]) / np.median([r["build_time"] for r in old])
+        objective_diff = new[0]["objective"] - old[0]["objective"]
+        print(row.format(case[0], case[1], case[2], case[3],
+                         "{:.2f}".format(solve_ratio),
+                         "{:.2f}".format(build_ratio),
+                         "{:.4f}".format(objective_diff)))
+
+
+def main(workloads, horizons, chiller_counts, solvers, start, repeat, output, baseline):
+    records = []
+    row = "{:>10} {:>6} {:>9} {:>8} {:>12} {:>12} {:>8} {:>14}"
+    print(row.format("workload", "hours", "chillers", "solver", "build (s)", "solve (s)", "nodes", "objective"))
+    for workload in workloads:
+        for hours in horizons:
+            for chillers in chiller_counts:
+                for solver in solvers:
+                    try:
+                        case_records = run_case(workload, hours, chillers, solver, start, repeat)
+                    except Exception as e:
+                        # e.g. a solver that is not installed
+                        records.append({"workload": workload, "hours": hours, "chillers": chillers,
+                                        "solver": solver, "error": str(e)})
+                        print(row.format(workload, hours, chillers, solver, "error", "", "", ""))
+                        continue
+                    records.extend(case_records)
+                    last = case_records[-1]
+                    print(row.format(workload, hours, chillers, solver,
+                                     "{:.4f}".format(np.median([r["build_time"] for r in case_records])),
+                                     "{:.4f}".format(np.median([r["solve_time"] for r in case_records])),
+                                     "" if last["node_count"] is None else last["node_count"],
+                                     "{:.2f}".format(last["objective"])))
+
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump({"commit": git_commit(),
+                       "date": datetime.datetime.now().isoformat(),
+                       "python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "start": start,
+                       "repeat": repeat,
+                       "records": records}, f, indent=1)
+
+    if baseline is not None:
+        compare(records, baseline)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workloads", nargs="+", default=["hospital", "synthetic"], choices=sorted(WORKLOADS))
+    parser.add_argument("--horizons", nargs="+", type=int, default=[24, 48, 96, 168])
+    parser.add_argument("--chillers", nargs="+", type=int, default=[1, 3, 5, 10])
+    parser.add_argument("--solvers", nargs="+", default=["default"])
+    parser.add_argument("--start", type=int, default=4226,
+                        help="First row of the hospital data, or the seed of the synthetic loads")
+    parser.add_argument("--repeat", type=int, default=3, help="Solves per case")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    main(args.workloads, args.horizons, args.chillers, args.solvers, args.start, args.repeat,
+         args.output, args.compare)
@@ -57,8 +57,10 @@
 
 from system_model import SystemModel
 from econ_dispatch.component_models import get_component_class
-from econ_dispatch.forecast_models import get_forecast_model_class
+from econ_dispatch.forecast_models import get_forecast_model_type
 from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.trigger_policy import TriggerPolicy
+from econ_dispatch.snapshot import SnapshotCache
 from econ_dispatch.utils import OptimizerCSVOutput
 from collections import OrderedDict, defaultdict
 import datetime
@@ -98,9 +100,26 @@ class Results(object):
     def insert_table_row(self, table, row):
         self.table_output[table].append(row)
 
+def build_model(snapshots, kind, model_name, klass, settings, **kwargs):
+    """Instance of klass with settings, loaded from a snapshot of the fitted
+    model if snapshots is a SnapshotCache."""
+    build = lambda: klass(**dict(settings, **kwargs))
+    if snapshots is None:
+        return build()
+    return snapshots.get(kind, model_name, klass, settings, build)
+
 def build_model_from_config(config):
     _log.debug("Starting parse_config")
 
+    if config.get("horizon_aggregation") and config["optimizer"].get("horizon_aggregation"):
+        raise ValueError("horizon_aggregation is set both at the top level and in the optimizer "
+                         "configuration, the forecast would be aggregated twice")
+
+    snapshots = None
+    snapshot_directory = config.get("snapshot_cache")
+    if snapshot_directory:
+        snapshots = SnapshotCache(snapshot_directory)
+
     weather_config = config["weather"]
 
     weather_type = weather_config["type"]
@@ -108,9 +127,15 @@ def build_model_from_config(config):
     module = __import__("weather."+weather_type, globals(), locals(), ['Weather'], 1)
     klass = module.Weather
 
+    # Nothing is fitted for the weather and its settings may hold an API key.
     weather_model = klass(**weather_config["settings"])
 
-    opt_func = get_optimization_function(config["optimizer"])
+    timing = config.get("timing", False)
+
+    optimizer_config = config["optimizer"]
+    if timing:
+        optimizer_config = dict(optimizer_config, timing=True)
+    opt_func = get_optimization_function(optimizer_config)
 
     optimization_frequency = int(config.get("optimization_frequency", 60))
 
@@ -121,7 +146,18 @@ def build_model_from_config(config):
     if optimizer_csv_filename is not None:
         optimizer_csv = OptimizerCSVOutput(optimizer_csv_filename)
 
-    system_model = SystemModel(opt_func, weather_model, optimization_frequency, optimizer_debug_csv=optimizer_csv)
+    trigger_policy = None
+    reoptimization_config = config.get("reoptimization")
+    if reoptimization_config:
+        if reoptimization_config is True:
+            reoptimization_config = {}
+        trigger_policy = TriggerPolicy(**reoptimization_config)
+
+    system_model = SystemModel(opt_func, weather_model, optimization_frequency, optimizer_debug_csv=optimizer_csv,
+                               horizon_aggregation=config.get("horizon_aggregation"),
+                               trigger_policy=trigger_policy,
+                               timing=timing,
+                               forecast_buffer=config.get("forecast_buffer", True))
 
     forecast_model_configs = config["forecast_models"]
     components = config["components"]
@@ -129,7 +165,8 @@ def build_model_from_config(config):
 
     for name, config_dict in forecast_model_configs.iteritems():
         model_type = config_dict["type"]
-        forecast_model = get_forecast_model_class(name, model_type, **config_dict.get("settings",{}))
+        klass = get_forecast_model_type(name, model_type)
+        forecast_model = build_model(snapshots, "forecast", name, klass, config_dict.get("settings",{}))
         system_model.add_forecast_model(forecast_model, name)
 
     for component_dict in components:
@@ -142,7 +179,8 @@ def build_model_from_config(config):
             continue
 
         try:
-            component = klass(name=component_name, **component_dict.get("settings", {}))
+            component = build_model(snapshots, "component", component_name, klass,
+                                    component_dict.get("settings", {}), name=component_name)
         except Exception as e:
             _log.exception("Error creating component " + klass_name)
             continue
@@ -159,6 +197,8 @@ def build_model_from_config(config):
         except Exception as e:
             _log.error("Error adding connection: " + str(e))
 
+    if snapshots is not None:
+        _log.info("Models loaded from snapshots: {}, fitted: {}".format(snapshots.hits, snapshots.misses))
 
     return system_model
 
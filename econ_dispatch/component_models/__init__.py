@@ -61,6 +61,8 @@ import pkgutil
 
 _componentList = [name for _, name, _ in pkgutil.iter_modules(__path__)]
 
+# Component classes by module name, each module is imported on the first
+# get_component_class for it. None for modules that failed to import.
 _componentDict = {}
 
 valid_io_types = set([u"heated_water",
@@ -74,6 +76,18 @@ valid_io_types = set([u"heated_water",
 
 class ComponentBase(object):
     __metaclass__ = abc.ABCMeta
+
+    # Names of the inputs the optimization parameters depend on. They are
+    # only recomputed when one of these changes between updates. None means
+    # any change of the inputs, an empty tuple means the parameters only
+    # depend on the configuration and are computed once.
+    parameter_inputs = None
+
+    parameter_cache_hits = 0
+    parameter_cache_misses = 0
+    _cached_parameters = None
+    _parameter_key = None
+
     def __init__(self, name="MISSING_NAME", **kwargs):
         self.name = name
 
@@ -130,24 +144,63 @@ class ComponentBase(object):
         """Update the internal parameters of the component based on the input values."""
         pass
 
+    def refresh_parameters(self, timestamp, inputs):
+        """Update the component and mark the cached optimization parameters
+        dirty if an input they depend on changed."""
+        self.update_parameters(timestamp, inputs)
+
+        if self.parameter_inputs is None:
+            key = dict(inputs)
+        else:
+            key = tuple(inputs.get(name) for name in self.parameter_inputs)
+
+        if key != self._parameter_key:
+            self._parameter_key = key
+            self._cached_parameters = None
+
+    def get_cached_optimization_parameters(self):
+        """get_optimization_parameters, recomputed only when dirty."""
+        if self._cached_parameters is None:
+            self.parameter_cache_misses += 1
+            self._cached_parameters = self.get_optimization_parameters()
+        else:
+            self.parameter_cache_hits += 1
+        return self._cached_parameters.copy()
+
+    def prepare_parameters(self):
+        """Compute parameters that only depend on the configuration ahead of
+        the first update, e.g. before the component is snapshotted."""
+        if self.parameter_inputs == () and self._cached_parameters is None:
+            self._parameter_key = ()
+            self._cached_parameters = self.get_optimization_parameters()
+
+    def invalidate_parameters(self):
+        """Recompute the optimization parameters on the next request, e.g.
+        after the component was retrained."""
+        self._cached_parameters = None
+
     def __str__(self):
         return '"Component: ' + self.name + '"'
 
-for componentName in _componentList:
+def _import_component(componentName):
     try:
         module = __import__(componentName,globals(),locals(),['Component'], 1)
         klass = module.Component
     except Exception as e:
         logging.error('Module {name} cannot be imported. Reason: {ex}'.format(name=componentName, ex=e))
-        continue
+        return None
 
     #Validation of Algorithm class
 
     if not issubclass(klass, ComponentBase):
         logging.warning('The implementation of {name} does not inherit from econ_dispatch.component_models.ComponentBase.'.format(name=componentName))
 
-    _componentDict[componentName] = klass
+    return klass
 
 
 def get_component_class(name):
-    return _componentDict.get(name)
\ No newline at end of file
+    if name not in _componentList:
+        return None
+    if name not in _componentDict:
+        _componentDict[name] = _import_component(name)
+    return _componentDict[name]
\ No newline at end of file
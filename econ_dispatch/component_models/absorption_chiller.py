@@ -77,6 +77,8 @@ DENSITY_WATER = 1.000 # kg/L
 
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, history_data_file=None, capacity=464.0, **kwargs):
         super(Component, self).__init__(**kwargs)
         #Chilled water temperature setpoint outlet from absorption chiller
@@ -97,13 +99,8 @@ class Component(ComponentBase):
         self.capacity = float(capacity)
 
         self.historical_data = {}
-        self.cached_parameters = {}
 
         self.setup_historical_data(history_data_file)
-
-        # Set to True whenever something happens that causes us to need to recalculate
-        # the optimization parameters.
-        self.opt_params_dirty = True
         
         # Gordon-Ng model coefficients
         # self.a0, self.a1 = self.train()
@@ -130,9 +127,6 @@ class Component(ComponentBase):
 
 
     def get_optimization_parameters(self):
-        if not self.opt_params_dirty:
-            return self.cached_parameters.copy()
-
         Qch = self.historical_data["Qch(tons)"] * (3.517 / 293.1) # chiller cooling output in mmBTU/hr (converted from cooling Tons)
         Qin = self.historical_data["Qin(MMBtu/h)"] # chiller heat input in mmBTU/hr
     
@@ -144,14 +138,12 @@ class Component(ComponentBase):
         xmax_AbsChiller = np.amax(Xdata)
         xmin_AbsChiller = np.amin(Xdata)
 
-        self.cached_parameters = {
+        return {
                                     "xmax_abschiller": xmax_AbsChiller,
                                     "xmin_abschiller": xmin_AbsChiller,
                                     "mat_abschiller": m_AbsChiller.tolist(),
                                     "cap_abs_chiller": self.capacity
                                 }
-        self.opt_params_dirty = False
-        return self.cached_parameters.copy()
 
     def update_parameters(self, timestamp, inputs):
         self.Tcho = inputs.get("Tcho", DEFAULT_TCHO)
@@ -77,6 +77,9 @@ DEFAULT_IDLE_B = -0.00024
 
 
 class Component(ComponentBase):
+    parameter_inputs = ("capacity", "input_power_request", "timestep", "PrevSOC", "InputCurrent", "minimumSOC",
+                        "InvEFF_Charge", "IR_Charge", "InvEFF_DisCharge", "IR_DisCharge", "Idle_A", "Idle_B")
+
     def __init__(self,
                  charging_training_file=None,
                  discharging_training_file=None,
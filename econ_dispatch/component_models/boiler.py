@@ -65,16 +65,13 @@ from econ_dispatch.utils import least_squares_regression
 DEFAULT_QBP = 55
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, history_data_file=None, capacity=8.0, **kwargs):
         super(Component, self).__init__(**kwargs)
 
         self.history_data_file = history_data_file
         self.historical_data = {}
-        self.cached_parameters = {}
-
-        #Set to True whenever seomthing happens that causes us to need to recalculate
-        # the optimization parameters.
-        self.opt_params_dirty = True
 
         self.setup_historical_data()
 
@@ -120,9 +117,6 @@ class Component(ComponentBase):
 
     def get_optimization_parameters(self):
 
-        if not self.opt_params_dirty:
-            return self.cached_parameters.copy()
-
         historical_Qbp = self.historical_data["boiler_heat_output"]
         historical_Gbp = self.historical_data["boiler_gas_input"]
 
@@ -158,14 +152,12 @@ class Component(ComponentBase):
         mat_boiler[1][1] = (y2 - y1) / (x2 - x1)
         mat_boiler[0][1] = y1 - mat_boiler[1][1] * x1
 
-        self.cached_parameters = {
+        return {
                                     "xmin_boiler": xmin_boiler.tolist(),
                                     "xmax_boiler": xmax_boiler.tolist(),
                                     "mat_boiler": mat_boiler.tolist(),
                                     "cap_boiler": self.capacity
                                 }
-        self.opt_params_dirty = False
-        return self.cached_parameters.copy()
 
     def update_parameters(self, timestamp, inputs):
         self.current_Qbp = inputs.get("Qbp", DEFAULT_QBP)
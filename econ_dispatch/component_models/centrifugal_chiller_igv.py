@@ -69,9 +69,12 @@ DEFAULT_QCH_KW = 500
 
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, training_data_file=None,
                  capacity_per_chiller = 200.0,
-                 count = 3, **kwargs):
+                 count = 3,
+                 aggregate = False, **kwargs):
         super(Component, self).__init__(**kwargs)
         # Chilled water temperature setpoint outlet from chiller
         self.Tcho = DEFAULT_TCHO
@@ -87,13 +90,15 @@ class Component(ComponentBase):
         self.capacity = float(capacity_per_chiller)
         self.count = int(count)
 
+        # Model the chillers as one unit with an integer number of chillers on.
+        self.aggregate = bool(aggregate)
+
+        # Command points and first hour load variables of each chiller.
+        self.on_points = ["chiller{}_on".format(i) for i in xrange(self.count)]
+        self.load_names = ["E_chillerelec{}_hour00".format(i) for i in xrange(self.count)]
+
         self.training_data_file = training_data_file
         self.historical_data = {}
-        self.cached_parameters = {}
-
-        # Set to True whenever seomthing happens that causes us to need to recalculate
-        # the optimization parameters.
-        self.opt_params_dirty = True
         self.setup_historical_data()
 
     def setup_historical_data(self):
@@ -112,19 +117,19 @@ class Component(ComponentBase):
     def get_commands(self, component_loads):
         points = {}
         commands = {self.name: points}
-        for i in xrange(self.count):
-            if component_loads["E_chillerelec{}_hour00".format(i)] > 0.0:
-                points["chiller{}_on".format(i)] = True
-            else:
-                points["chiller{}_on".format(i)] = False
+        if self.aggregate:
+            chillers_on = int(round(component_loads["Nchiller_hour00"]))
+            for i, point in enumerate(self.on_points):
+                points[point] = i < chillers_on
+            return commands
+
+        for point, load_name in zip(self.on_points, self.load_names):
+            points[point] = component_loads[load_name] > 0.0
 
         return commands
 
     def get_optimization_parameters(self):
 
-        if not self.opt_params_dirty:
-            return self.cached_parameters.copy()
-
         # chiller cooling output in mmBtu/hr (converted from cooling Tons)
         Qch = np.array(self.historical_data["Qch(tons)"]) * 3.517 / 293.1
 
@@ -135,15 +140,14 @@ class Component(ComponentBase):
         xmax_ChillerIGV = max(Qch)
         xmin_ChillerIGV = min(Qch)
 
-        self.cached_parameters = {
+        return {
                                     "mat_chillerIGV": m_ChillerIGV.tolist(),
                                     "xmax_chillerIGV": xmax_ChillerIGV,
                                     "xmin_chillerIGV": xmin_ChillerIGV,
                                     "capacity_per_chiller": self.capacity,
-                                    "chiller_count": self.count
+                                    "chiller_count": self.count,
+                                    "chiller_aggregate": self.aggregate
                                 }
-        self.opt_params_dirty = False
-        return self.cached_parameters.copy()
 
     def update_parameters(self, timestamp, inputs):
         self.Tcho = inputs.get("Tcho", DEFAULT_TCHO)
@@ -68,6 +68,8 @@ DEFAULT_QCH_KW = 1758.5
 
 
 class Component(ComponentBase):
+    parameter_inputs = ("Tcho", "Tcdi", "Qch_kW")
+
     def __init__(self, history_data_file=None, **kwargs):
         super(Component, self).__init__(**kwargs)
         # Regression models were built separately (Training Module) and
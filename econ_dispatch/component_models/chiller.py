@@ -58,6 +58,8 @@
 from econ_dispatch.component_models import ComponentBase
 
 class Component(ComponentBase):
+    parameter_inputs = ("efficiency",)
+
     def __init__(self, efficiency=10.00, **kwargs):
         super(Component, self).__init__(efficiency=efficiency, **kwargs)
 
@@ -73,6 +73,8 @@ DEFAULT_RH_OA = 0.6
 DEFAULT_T_HW = 46.1
 
 class Component(ComponentBase):
+    parameter_inputs = ("cfm_OA", "fan_status", "T_OA", "RH_OA", "T_HW")
+
     def __init__(self, training_data_file=None, **kwargs):
         super(Component, self).__init__(**kwargs)
 
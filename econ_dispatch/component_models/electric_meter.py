@@ -58,6 +58,8 @@
 from econ_dispatch.component_models import ComponentBase
 
 class Component(ComponentBase):
+    parameter_inputs = ("cost",)
+
     def __init__(self, cost=0.07, **kwargs):
         super(Component, self).__init__(cost=cost, **kwargs)
 
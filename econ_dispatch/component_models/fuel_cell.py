@@ -83,6 +83,8 @@ Coef.ExhaustTemperature = np.array([0.0, 0.0, 0.0])
 Coef.gain = 1.4
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, training_data_file=None, capacity=500.0, **kwargs):
         super(Component, self).__init__(**kwargs)
         self.fuel_type= 'CH4'
@@ -97,14 +99,9 @@ class Component(ComponentBase):
         self.capacity = capacity
 
         self.training_data = {}
-        self.cached_parameters = {}
 
         self.setup_training_data(training_data_file)
 
-        # Set to True whenever something happens that causes us to need to recalculate
-        # the optimization parameters.
-        self.opt_params_dirty = True
-
         
     def get_output_metadata(self):
         return [u"electricity", u"waste_heat"]
@@ -116,9 +113,6 @@ class Component(ComponentBase):
         self.training_data = pd.read_csv(training_data_file, header=0)
 
     def get_optimization_parameters(self):
-        if not self.opt_params_dirty:
-            return self.cached_parameters.copy()
-
         Valid = self.training_data['Valid'].values
 
         Power = self.training_data['Power'].values
@@ -147,16 +141,13 @@ class Component(ComponentBase):
 
         mat_prime_mover = least_squares_regression(inputs=Xdata[n1:n2+1], output=Ydata[n1:n2+1])
 
-        self.cached_parameters = {
+        return {
             "mat_prime_mover": mat_prime_mover.tolist(),
             "xmax_prime_mover": xmax_prime_mover,
             "xmin_prime_mover": xmin_prime_mover,
             "cap_prime_mover": self.capacity
         }
 
-        self.opt_params_dirty = False
-        return self.cached_parameters.copy()
-
     def get_commands(self, component_loads):
         return {self.name:
                     {"fuel_cell_set_point":
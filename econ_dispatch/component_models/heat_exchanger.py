@@ -58,6 +58,8 @@
 from econ_dispatch.component_models import ComponentBase
 
 class Component(ComponentBase):
+    parameter_inputs = ("efficiency",)
+
     def __init__(self, input_type=u"hot_water", output_type=u"hot_air", efficiency=10.00, **kwargs):
         super(Component, self).__init__(efficiency=efficiency, **kwargs)
         self.input_type = input_type if isinstance(input_type, list) else [input_type]
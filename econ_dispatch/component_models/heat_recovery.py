@@ -72,6 +72,8 @@ DEFAULT_PRIME_MOVER_SPEED = 0.75
 
 
 class Component(ComponentBase):
+    parameter_inputs = ("MFR_ex", "MFR_water", "T_ex_i", "T_water_i", "prime_mover_current_speed")
+
     def __init__(self, training_data_file=None, **kwargs):
         super(Component, self).__init__(**kwargs)
         # kg/s
@@ -66,6 +66,8 @@ DEFAULT_CAPACITY = 150.0
 DEFAULT_ELEC_IN = 10.0
 
 class Component(ComponentBase):
+    parameter_inputs = ("capacity", "electricity_in")
+
     def __init__(self, inverter_curve_file=None, **kwargs):
         super(Component, self).__init__(**kwargs)
 
@@ -79,6 +79,8 @@ Coef.FlowOut = np.array([-65.85, 164.5])
 
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, training_data_file=None, **kwargs):
         global Coef
         super(Component, self).__init__(**kwargs)
@@ -93,6 +95,8 @@ class Component(ComponentBase):
         AirFlow = np.array(capstone_turndown_data['AirFlow'])
         Time = np.array([])
         Coef = self.GasTurbine_Calibrate(Coef, Time, self.Pdemand, self.Temperature, FuelFlow, AirFlow, [])
+        # Kept with the component so a snapshot of it has the calibration.
+        self.coef = Coef
 
     def get_output_metadata(self):
         return [u"electricity", u"waste_heat"]
@@ -106,7 +110,7 @@ class Component(ComponentBase):
                          component_loads["Q_prime_mover_hour00"] * 293.1}}
 
     def get_optimization_parameters(self):
-        AirFlow, FuelFlow, Tout, Efficiency = self.GasTurbine_Operate(self.Pdemand, self.Temperature, 0, Coef)
+        AirFlow, FuelFlow, Tout, Efficiency = self.GasTurbine_Operate(self.Pdemand, self.Temperature, 0, self.coef)
         return {"efficiency":Efficiency}
 
     def update_parameters(self, timestamp, inputs):
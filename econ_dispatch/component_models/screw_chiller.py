@@ -67,6 +67,8 @@ DEFAULT_TCDI = 75
 DEFAULT_QCH_KW = 656.09
 
 class Component(ComponentBase):
+    parameter_inputs = ("Tcho", "Tcdi", "Qch_kW")
+
     def __init__(self, history_data_file=None, **kwargs):
         super(Component, self).__init__(**kwargs)
 
@@ -63,6 +63,8 @@ from econ_dispatch.component_models import ComponentBase
 from econ_dispatch.utils import least_squares_regression
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, mat_abschill = [], xmax_abschill = 0.0, xmin_abschill = 0.0, **kwargs):
         super(Component, self).__init__(**kwargs)
         self.mat_abschill = mat_abschill
@@ -63,6 +63,8 @@ from econ_dispatch.component_models import ComponentBase
 from econ_dispatch.utils import least_squares_regression
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, mat_boiler = [], xmax_boiler = [], xmin_boiler = [], **kwargs):
         super(Component, self).__init__(**kwargs)
         self.mat_boiler = mat_boiler
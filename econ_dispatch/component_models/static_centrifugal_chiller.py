@@ -64,6 +64,8 @@ from econ_dispatch.utils import least_squares_regression
 
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, chiller_type="IGV", mat_chiller = [], xmax_chiller = 0.0, xmin_chiller = 0.0, **kwargs):
         super(Component, self).__init__(**kwargs)
         self.mat_chiller = mat_chiller
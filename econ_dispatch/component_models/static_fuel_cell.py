@@ -65,6 +65,8 @@ from econ_dispatch.component_models import ComponentBase
 
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, mat = [], xmax = 0.0, xmin = 0.0, capacity = 0.0, **kwargs):
         super(Component, self).__init__(**kwargs)
         self.mat = mat
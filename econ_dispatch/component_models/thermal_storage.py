@@ -70,6 +70,8 @@ DENSITY_WATER = 1.000 #kg/L
 
 
 class Component(ComponentBase):
+    parameter_inputs = ()
+
     def __init__(self, **kwargs):
         super(Component, self).__init__(**kwargs)
 
@@ -58,10 +58,12 @@
 import abc
 import logging
 import pkgutil
+import numpy as np
 import pandas as pd
 
 _modelList = [name for _, name, _ in pkgutil.iter_modules(__path__)]
 
+# Model classes by "name.type", each module is imported on first use.
 _modelDict = {}
 
 
@@ -73,6 +75,17 @@ class ForecastModelBase(object):
         """Get the predicted load values based on the independent variables."""
         pass
 
+    def derive_horizon(self, timestamps, weather_frame):
+        """Get the predicted values for every hour of a horizon at once.
+
+        weather_frame holds one row of independent variable values per
+        timestamp. Returns a DataFrame with one row per timestamp in the
+        same order. Models that can vectorize this override it, the default
+        calls derive_variables hour by hour."""
+        records = [self.derive_variables(timestamp, values)
+                   for timestamp, values in zip(timestamps, weather_frame.to_dict("records"))]
+        return pd.DataFrame(records, index=range(len(records)))
+
     @abc.abstractmethod
     def add_training_data(self, now, variable_values={}):
         """Update the training data with the last hour."""
@@ -86,6 +99,10 @@ class HistoryModelBase(ForecastModelBase):
         now = now.replace(year=self.history_year)
         return self.get_historical_hour(now)
 
+    def derive_horizon(self, timestamps, weather_frame):
+        timestamps = [t.replace(year=self.history_year) for t in timestamps]
+        return self.get_historical_hours(timestamps)
+
     def add_training_data(self, now, variable_values={}):
         """Update the training data with the last hour."""
         pass
@@ -97,16 +114,43 @@ class HistoryModelBase(ForecastModelBase):
 
         self.history_year = self.historical_data[self.time_column][0].year
 
+        # Sorted history times for the nearest hour lookup of a whole horizon.
+        times = self.historical_data[self.time_column].values
+        self._history_order = np.argsort(times, kind="mergesort")
+        self._history_times = times[self._history_order]
+
     def get_historical_hour(self, now):
         #Index of the closest timestamp.
         index = abs(self.historical_data[self.time_column] - now).idxmin()
         #Return the row as a dict.
         return dict(self.historical_data.iloc[index])
 
+    def get_historical_hours(self, timestamps):
+        """Rows closest to each timestamp as a DataFrame, the vectorized
+        get_historical_hour."""
+        times = self._history_times
+        targets = pd.to_datetime(timestamps).values
+        right = np.searchsorted(times, targets).clip(1, len(times) - 1)
+        left = right - 1
+        # Ties go to the earlier row like idxmin does.
+        take_right = abs(times[right] - targets) < abs(targets - times[left])
+        nearest = np.where(take_right, right, left)
+        if len(times) == 1:
+            nearest[:] = 0
+        rows = self.historical_data.iloc[self._history_order[nearest]]
+        return rows.reset_index(drop=True)
+
+
+def get_forecast_model_type(name, type):
+    module_name = name + "." + type
+    klass = _modelDict.get(module_name)
+    if klass is None:
+        module = __import__(module_name, globals(), locals(), ['Model'], 1)
+        klass = _modelDict[module_name] = module.Model
+    return klass
+
 
 def get_forecast_model_class(name, type, **kwargs):
-    module_name = name + "." + type
-    module = __import__(module_name, globals(), locals(), ['Model'], 1)
-    klass = module.Model
+    klass = get_forecast_model_type(name, type)
     return klass(**kwargs)
 
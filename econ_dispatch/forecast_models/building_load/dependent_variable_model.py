@@ -55,6 +55,7 @@
 # under Contract DE-AC05-76RL01830
 # }}}
 
+import numpy as np
 import pandas as pd
 from econ_dispatch.forecast_models import ForecastModelBase
 
@@ -94,6 +95,38 @@ class Model(ForecastModelBase):
 
         return result
 
+    def derive_horizon(self, timestamps, weather_frame):
+        df = self.data_frame
+        tolerances = self.independent_variable_tolerances
+        times = df[self.time_stamp_column].dt
+
+        # One row of the filter per forecast hour, one column per training row.
+        day_of_week = np.array([t.weekday() for t in timestamps])[:, None]
+        hour_of_day = np.array([t.hour for t in timestamps])[:, None]
+        hours = times.hour.values[None, :]
+
+        filter = (  (times.weekday.values[None, :] == day_of_week)
+                  & (hours <= hour_of_day + self.time_diff_tolerance)
+                  & (hours >= hour_of_day - self.time_diff_tolerance))
+
+        for variable in weather_frame.columns:
+            tolerance = tolerances.get(variable, None)
+            if tolerance is None:
+                continue
+            values = weather_frame[variable].values.astype(float)[:, None]
+            training = df[variable].values[None, :]
+            filter &= (training >= values-tolerance) & (training <= values+tolerance)
+
+        result = {}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for dep in self.dependent_variables:
+                training = df[dep].values.astype(float)
+                valid = filter & ~np.isnan(training)[None, :]
+                total = np.where(valid, training[None, :], 0.0).sum(axis=1)
+                result[dep] = total / valid.sum(axis=1)
+
+        return pd.DataFrame(result, index=range(len(timestamps)), columns=self.dependent_variables)
+
     def add_training_data(self, now, variable_values={}):
         """Do nothing for now."""
         pass
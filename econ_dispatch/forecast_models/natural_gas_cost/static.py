@@ -55,6 +55,7 @@
 # under Contract DE-AC05-76RL01830
 # }}}
 
+import pandas as pd
 from econ_dispatch.forecast_models import ForecastModelBase
 
 
@@ -66,6 +67,9 @@ class Model(ForecastModelBase):
         """Get the predicted load values based on the independent variables."""
         return {"natural_gas_cost": self.cost}
 
+    def derive_horizon(self, timestamps, weather_frame):
+        return pd.DataFrame({"natural_gas_cost": self.cost}, index=range(len(timestamps)))
+
     def add_training_data(self, now, variable_values={}):
         """Update the training data with the last hour."""
         pass
\ No newline at end of file
@@ -55,6 +55,7 @@
 # under Contract DE-AC05-76RL01830
 # }}}
 
+import pandas as pd
 from econ_dispatch.forecast_models import ForecastModelBase
 
 class Model(ForecastModelBase):
@@ -62,6 +63,9 @@ class Model(ForecastModelBase):
         """Get the predicted load values based on the independent variables."""
         return {"solar_kW": 0}
 
+    def derive_horizon(self, timestamps, weather_frame):
+        return pd.DataFrame({"solar_kW": 0}, index=range(len(timestamps)))
+
     def add_training_data(self, now, variable_values={}):
         """Update the training data with the last hour."""
         pass
\ No newline at end of file
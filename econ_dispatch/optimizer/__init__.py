@@ -55,61 +55,323 @@
 # under Contract DE-AC05-76RL01830
 # }}}
 
-import pulp
 import logging
 _log = logging.getLogger(__name__)
 import os.path
+import re
 import os
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pulp
+
+from econ_dispatch.utils import fingerprint, aggregate_forecasts, natural_keys, PhaseTimer, NullTimer
+from econ_dispatch.optimizer.decomposition import get_pool, split_problem, solve_decomposed
+from econ_dispatch.optimizer.solvers import get_solver, PuLPSolverBase, Solution
+from econ_dispatch.optimizer.warm_start import WarmStart
+from econ_dispatch.optimizer.presolve import count_fixed
+from econ_dispatch.optimizer.result import OptimizationResult, ResultLayout
+from econ_dispatch.optimizer.cache import SolutionCache, CachedOptimizer
+from econ_dispatch.optimizer.stochastic import StochasticOptimizer, IGNORED_SETTINGS
+from econ_dispatch.optimizer.archive import LPArchive
+
+TEMPLATE_CACHE_SIZE = 4
+
+# Slack allowed when checking whether a non-optimal solution can still be used.
+FEASIBILITY_TOLERANCE = 1e-6
+
+def get_config_solver(config):
+    """Name and instance of the solver backend selected by an optimizer
+    configuration."""
+    use_glpk = config.get("use_glpk", False)
+    glpk_options = config.get("glpk_options", [])
+    solver_name = config.get("solver", "glpk" if use_glpk else "default")
+    solver_options = dict(config.get("solver_options", {"options": glpk_options} if use_glpk else {}))
+    for key in ("time_limit", "mip_gap"):
+        if key in config:
+            solver_options[key] = config[key]
+    return solver_name, get_solver(solver_name, **solver_options)
 
 def get_optimization_function(config):
     name = config["name"]
     write_lp = config.get("write_lp", False)
-    use_glpk = config.get("use_glpk", False)
-    glpk_options = config.get("glpk_options", [])
     lp_out_dir = config.get("lp_out_dir", "lps")
+    lp_archive = config.get("lp_archive")
+    builder = config.get("builder", "matrix")
+    decompose = config.get("decompose")
+    decompose_workers = config.get("decompose_workers")
+    reuse_model = config.get("reuse_model", True)
+    use_warm_start = config.get("warm_start", False)
+    presolve = config.get("presolve", False)
+    horizon_aggregation = config.get("horizon_aggregation")
+    timing = config.get("timing", False)
+    use_duals = config.get("duals", False)
+    compact_names = config.get("compact_names", False)
+
+    module = __import__(name, globals(), locals(), ['get_optimization_problem'], 1)
+
+    stochastic = config.get("stochastic")
+    if stochastic:
+        if hasattr(module, "get_dispatch"):
+            raise ValueError("Stochastic dispatch requires an optimization module")
+        if use_duals:
+            _log.warning("Duals are not computed with stochastic dispatch")
+        # Each scenario is solved by a deterministic optimization function built from the rest of the config.
+        settings = dict((key, value) for key, value in config.items() if key not in IGNORED_SETTINGS)
+        return with_solution_cache(StochasticOptimizer(settings, **stochastic), config)
+
+    if hasattr(module, "get_dispatch"):
+        # Heuristic dispatch, there is no optimization problem to solve.
+        return with_solution_cache(get_dispatch_function(module.get_dispatch, horizon_aggregation, timing), config)
 
-    if write_lp:
+    archive = None
+    if lp_archive:
+        # Replaces the .lp files in lp_out_dir, see econ_dispatch.optimizer.archive.
+        archive = LPArchive(lp_out_dir, "day" if lp_archive is True else lp_archive)
+        write_lp = False
+    elif write_lp:
         try:
             os.makedirs(lp_out_dir)
         except Exception:
             pass
 
-    module = __import__(name, globals(), locals(), ['get_optimization_problem'], 1)
-    get_optimization_problem = module.get_optimization_problem
+    solver_name, solver = get_config_solver(config)
 
-    def optimize(now, forecast, parameters = {}):
-        prob = get_optimization_problem(forecast, parameters)
+    warm_start = None
+    if use_warm_start:
+        if solver.supports_warm_start:
+            warm_start = WarmStart()
+        else:
+            _log.warning("Solver {} does not support warm starts".format(solver_name))
 
-        if write_lp:
-            prob.writeLP(os.path.join(lp_out_dir, str(now).replace(":", "_")+".lp"))
+    get_fallback_dispatch = getattr(module, "get_fallback_dispatch", None)
 
-        convergence_time = -1
-        objective_value = -1
+    # Constraints whose duals are added to the result, e.g. ElecBalance00.
+    dual_re = None
+    if use_duals:
+        if not solver.supports_duals:
+            _log.warning("Solver {} does not support duals".format(solver_name))
+        elif getattr(module, "DUAL_CONSTRAINTS", None):
+            dual_re = re.compile(r"^({})\d+$".format("|".join(module.DUAL_CONSTRAINTS)))
 
-        try:
-            if use_glpk:
-                prob.solve(pulp.solvers.GLPK_CMD(options=glpk_options))
+    get_optimization_matrix = None
+    get_template = None
+    if builder == "matrix" and hasattr(module, "get_optimization_matrix"):
+        get_optimization_matrix = module.get_optimization_matrix
+
+        if hasattr(module, "get_optimization_template"):
+            get_template = module.get_optimization_template
+
+            if reuse_model:
+                # Templates keyed by component parameters and horizon length, least recently used first.
+                templates = OrderedDict()
+
+                def get_template(parameters, n_hours):
+                    key = (fingerprint(parameters), n_hours)
+                    template = templates.pop(key, None)
+                    if template is None:
+                        _log.debug("Building new optimization model template")
+                        template = module.get_optimization_template(parameters, n_hours)
+                    templates[key] = template
+                    while len(templates) > TEMPLATE_CACHE_SIZE:
+                        templates.popitem(last=False)
+                    return template
+
+    elif builder in ("matrix", "pulp"):
+        get_optimization_problem = module.get_optimization_problem
+        if not isinstance(solver, PuLPSolverBase):
+            raise ValueError("Solver {} requires the matrix problem builder".format(solver_name))
+    else:
+        raise ValueError("Unknown optimization problem builder: " + str(builder))
+
+    pool = None
+    if decompose:
+        if get_optimization_matrix is None:
+            raise ValueError("Decomposition requires the matrix problem builder")
+        pool = get_pool(decompose, decompose_workers)
+
+    if compact_names and get_optimization_matrix is None:
+        raise ValueError("Compact names require the matrix problem builder")
+
+    if presolve and get_template is None:
+        raise ValueError("Presolve requires the matrix problem builder and a module with get_optimization_template")
+
+    def optimize(now, forecast, parameters = {}, fixed=None):
+        """fixed optionally maps variable names to values they are held at,
+        e.g. the commitment decided for the first hour."""
+        # Phase times go into the result as "Build Time" etc.
+        timer = PhaseTimer() if timing else NullTimer()
+
+        if horizon_aggregation:
+            forecast = aggregate_forecasts(forecast, horizon_aggregation)
+
+        lp_file = os.path.join(lp_out_dir, str(now).replace(":", "_")+".lp")
+
+        if get_optimization_matrix is not None:
+            if get_template is not None:
+                template = get_template(parameters, len(forecast))
+                problem = template.update(forecast)
+                lb, ub = template.presolve_bounds(forecast) if presolve else (template.lb, template.ub)
+            else:
+                problem = get_optimization_matrix(forecast, parameters)
+                lb, ub = problem.lb, problem.ub
+            names = problem.var_names
+            layout = problem.result_layout()
+
+            if fixed:
+                lb, ub = lb.copy(), ub.copy()
+                for name, value in fixed.items():
+                    lb[layout.index[name]] = ub[layout.index[name]] = value
+
+            # A reused template still has the bounds of the last run.
+            problem.set_bounds(lb, ub)
+            if presolve:
+                fixed_variables, inactive_constraints = count_fixed(problem, lb, ub)
+                _log.debug("Presolve fixed {} variables, {} constraints have none left free".format(
+                    fixed_variables, inactive_constraints))
+
+            x0 = warm_start.get(now, names) if warm_start is not None else None
+            problem.compact_names = compact_names
+            timer.lap("Build Time")
+
+            # Solves with fixed variables are variants of the problem of now.
+            if write_lp and not fixed:
+                problem.pulp_problem().writeLP(lp_file)
+                if compact_names:
+                    problem.write_names(lp_file + ".names")
+            elif archive is not None and not fixed:
+                archive.put(now, problem)
+            timer.lap("LP Write Time")
+
+            blocks = split_problem(problem) if pool is not None else []
+            if len(blocks) > 1:
+                _log.debug("Solving {} independent sub-problems".format(len(blocks)))
+                solution = solve_decomposed(problem, blocks, pool, solver, x0)
             else:
-                prob.solve()
-            #
-        except Exception as e:
-            _log.warning("PuLP failed: " + str(e))
+                solution = solver.solve(problem, x0)
+            timer.lap("Solve Time")
+
+            is_feasible = problem.is_feasible
+            objective_value = problem.objective_value
         else:
-            convergence_time = prob.solutionTime
-            objective_value = pulp.value(prob.objective)
+            prob = get_optimization_problem(forecast, parameters)
+            variables = prob.variables()
+            names = [var.name for var in variables]
+            layout = ResultLayout(names, [var.cat == pulp.LpInteger for var in variables])
+
+            if fixed:
+                for var in variables:
+                    if var.name in fixed:
+                        var.lowBound = var.upBound = fixed[var.name]
+
+            x0 = warm_start.get(now, names) if warm_start is not None else None
+            timer.lap("Build Time")
+
+            if write_lp and not fixed:
+                prob.writeLP(lp_file)
+            elif archive is not None and not fixed:
+                archive.put(now, prob)
+            timer.lap("LP Write Time")
+
+            solution = solver.solve_pulp(prob, variables, x0)
+            timer.lap("Solve Time")
+
+            cost = np.array([prob.objective.get(var, 0.0) for var in variables])
+
+            def is_feasible(x):
+                # The variables still hold the values of x from the solve.
+                return x is not None and not np.any(np.isnan(x)) and prob.valid(FEASIBILITY_TOLERANCE)
 
-        status = pulp.LpStatus[prob.status]
+            def objective_value(x):
+                return float(np.dot(cost, x)) + prob.objective.constant
 
-        result = {}
+        source = "solver"
+        if solution.status != "Optimal":
+            if is_feasible(solution.x):
+                # e.g. the time limit ran out after an integer solution was found
+                _log.warning("Optimization status {}, using the best solution found".format(solution.status))
+                source = "incumbent"
+                solution.objective_value = objective_value(solution.x)
+            elif get_fallback_dispatch is not None:
+                _log.warning("Optimization status {}, using the fallback dispatch".format(solution.status))
+                source = "fallback"
+                values = get_fallback_dispatch(forecast, parameters)
+                x = np.array([values.get(name, np.nan) for name in names], dtype=float)
+                solution = Solution(solution.status, objective_value(np.nan_to_num(x)), solution.solution_time, x)
 
-        for var in prob.variables():
-            result[var.name] = var.varValue
+        result = OptimizationResult(layout, solution.x)
 
-        result["Optimization Status"] = status
+        result["Optimization Status"] = solution.status
 
-        result["Objective Value"] = objective_value
-        result["Convergence Time"] = convergence_time
+        result["Objective Value"] = -1 if solution.objective_value is None else solution.objective_value
+        result["Convergence Time"] = -1 if solution.solution_time is None else solution.solution_time
+        result["Solution Source"] = source
+        if solution.node_count is not None:
+            result["Node Count"] = solution.node_count
+
+        if presolve:
+            result["Presolve Fixed Variables"] = fixed_variables
+            result["Presolve Inactive Constraints"] = inactive_constraints
+
+        if warm_start is not None:
+            warm_start.update(now, names, solution.x)
+            result["Warm Start"] = x0 is not None
+            result["Warm Start Hit Rate"] = warm_start.hit_rate
+
+        timer.lap("Extract Time")
+
+        if dual_re is not None and source in ("solver", "incumbent"):
+            # LP with the commitment of the solution fixed, on the model already built.
+            fixed_values = dict((j, float(np.round(solution.x[j]))) for j in np.nonzero(layout.integer)[0])
+            if get_optimization_matrix is not None:
+                rows = [i for i, name in enumerate(problem.row_names) if dual_re.match(name)]
+                row_names = [problem.row_names[i] for i in rows]
+                duals = solver.solve_duals(problem, fixed_values, rows)
+            else:
+                row_names = sorted((name for name in prob.constraints if dual_re.match(name)), key=natural_keys)
+                duals = solver.solve_pulp_duals(prob, dict((names[j], value) for j, value in fixed_values.items()),
+                                                row_names)
+            for name, value in zip(row_names, duals.tolist()):
+                result[name] = None if np.isnan(value) else value
+            timer.lap("Duals Time")
+
+        result.summary.update(timer.phases)
+
+        return result
+
+    return with_solution_cache(optimize, config)
+
+
+def with_solution_cache(optimize, config):
+    """Put a SolutionCache in front of optimize if the config has
+    "solution_cache", either true or the SolutionCache settings."""
+    cache_config = config.get("solution_cache")
+    if not cache_config:
+        return optimize
+    if cache_config is True:
+        cache_config = {}
+    settings = dict((key, value) for key, value in config.items() if key != "solution_cache")
+    return CachedOptimizer(optimize, SolutionCache(namespace=fingerprint(settings), **cache_config))
+
+
+def get_dispatch_function(get_dispatch, horizon_aggregation=None, timing=False):
+    """Optimization function for a module that computes the dispatch
+    directly, get_dispatch(forecast, parameters) returns the values keyed by
+    name and their cost."""
+    def optimize(now, forecast, parameters = {}):
+        if horizon_aggregation:
+            forecast = aggregate_forecasts(forecast, horizon_aggregation)
 
+        start = time.time()
+        values, cost = get_dispatch(forecast, parameters)
+        result = OptimizationResult.from_dict(values)
+        result["Optimization Status"] = "Heuristic"
+        result["Objective Value"] = cost
+        result["Convergence Time"] = time.time() - start
+        result["Solution Source"] = "heuristic"
+        if timing:
+            result["Solve Time"] = result["Convergence Time"]
         return result
 
-    return optimize
\ No newline at end of file
+    return optimize
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Compressed archive of the optimization problems that were solved.
+
+Problems are written by a background thread to one append-only file per
+day or month, each record a separate gzip member holding the pickled
+arrays of the problem (see MatrixProblem.to_arrays). index.jsonl lists the timestamp, file, offset and length of every
+record so a single problem can be read back without scanning the file.
+
+A record is written and synced to its data file before its index row is
+appended, both under a lock on the index, so the index never points past
+the data even with several processes writing to the same archive.
+"""
+
+import os
+import json
+import gzip
+import pickle
+import atexit
+import datetime
+import threading
+from io import BytesIO
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+try:
+    import fcntl
+except ImportError:
+    # No file locking on Windows, only one process may write an archive.
+    fcntl = None
+
+from econ_dispatch.optimizer.matrix import MatrixProblem
+
+import logging
+_log = logging.getLogger(__name__)
+
+PERIODS = {"day": "%Y-%m-%d",
+           "month": "%Y-%m"}
+
+INDEX_FILE = "index.jsonl"
+
+
+def _compress(data):
+    buffer = BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb") as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+class LPArchive(object):
+    """Writes problems to the archive in directory without blocking the
+    caller. If the writer falls more than queue_size problems behind new
+    problems are dropped with a warning rather than waiting for it."""
+    def __init__(self, directory, period="day", queue_size=100):
+        if period not in PERIODS:
+            raise ValueError("Unknown archive period: " + str(period))
+        self.directory = directory
+        self.period = period
+        self.dropped = 0
+
+        try:
+            os.makedirs(directory)
+        except OSError:
+            pass
+
+        self.queue = queue.Queue(queue_size)
+        self.thread = threading.Thread(target=self._write_loop, name="LPArchive")
+        self.thread.daemon = True
+        self.thread.start()
+        atexit.register(self.close)
+
+    def put(self, now, problem):
+        """Queue problem, a MatrixProblem or pulp.LpProblem, for archiving
+        under the time now. Only the arrays of the problem are taken here,
+        a copy since templates are updated in place by the next run and a
+        pulp.LpProblem is changed by the solve, pickling and compressing
+        them is left to the writer thread. A pulp.LpProblem is read back
+        as the equivalent MatrixProblem."""
+        if not isinstance(problem, MatrixProblem):
+            problem = MatrixProblem.from_pulp(problem)
+        record = ("matrix", problem.to_arrays())
+        try:
+            self.queue.put_nowait((now, record))
+        except queue.Full:
+            self.dropped += 1
+            _log.warning("LP archive is behind, dropped the problem for " + str(now))
+
+    def file_name(self, now):
+        if isinstance(now, (datetime.date, datetime.datetime)):
+            return now.strftime(PERIODS[self.period]) + ".gz"
+        return "undated.gz"
+
+    def _write_loop(self):
+        while True:
+            now, record = self.queue.get()
+            try:
+                self._write(now, record)
+            except Exception:
+                _log.exception("Failed to archive the problem for " + str(now))
+            finally:
+                self.queue.task_done()
+
+    def _write(self, now, record):
+        kind, problem = record
+        data = _compress(pickle.dumps(problem, pickle.HIGHEST_PROTOCOL))
+        file_name = self.file_name(now)
+        with open(os.path.join(self.directory, INDEX_FILE), "ab") as index:
+            if fcntl is not None:
+                fcntl.flock(index.fileno(), fcntl.LOCK_EX)
+            try:
+                with open(os.path.join(self.directory, file_name), "ab") as f:
+                    f.seek(0, os.SEEK_END)
+                    offset = f.tell()
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                entry = {"timestamp": str(now), "file": file_name, "offset": offset, "length": len(data),
+                         "kind": kind}
+                index.write((json.dumps(entry, sort_keys=True) + "\n").encode("utf-8"))
+                index.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index.fileno(), fcntl.LOCK_UN)
+
+    def close(self):
+        """Wait until the queued problems are written."""
+        self.queue.join()
+
+
+class LPArchiveReader(object):
+    """Reads problems back from an archive written by LPArchive."""
+    def __init__(self, directory):
+        self.directory = directory
+        self.index = {}
+        self.timestamps = []
+        with open(os.path.join(directory, INDEX_FILE), "rb") as f:
+            for line in f:
+                try:
+                    row = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    # A row cut short by a crash, its record may be incomplete.
+                    _log.warning("Skipping a damaged archive index row")
+                    continue
+                if row["timestamp"] not in self.index:
+                    self.timestamps.append(row["timestamp"])
+                # The last record wins if a time was archived more than once.
+                self.index[row["timestamp"]] = row
+
+    def load(self, timestamp):
+        """The problem archived for timestamp (a datetime or its string),
+        a MatrixProblem, or a pulp.LpProblem for records of the "pulp" kind
+        written by earlier versions."""
+        row = self.index[str(timestamp)]
+        with open(os.path.join(self.directory, row["file"]), "rb") as f:
+            f.seek(int(row["offset"]))
+            data = f.read(int(row["length"]))
+        if len(data) != int(row["length"]):
+            raise ValueError("Archived problem for {} is truncated: {} of {} bytes".format(
+                timestamp, len(data), row["length"]))
+        with gzip.GzipFile(fileobj=BytesIO(data), mode="rb") as f:
+            problem = pickle.loads(f.read())
+        if row["kind"] == "matrix":
+            problem = MatrixProblem.from_arrays(**problem)
+        return problem
+
+    def write_lp(self, timestamp, file_name):
+        """Extract the problem of timestamp as an LP file."""
+        problem = self.load(timestamp)
+        if isinstance(problem, MatrixProblem):
+            problem = problem.to_pulp()
+        problem.writeLP(file_name)
+
+    def replay(self, timestamp, solver):
+        """Solve the problem of timestamp again with solver (see
+        econ_dispatch.optimizer.solvers.get_solver) and return the Solution."""
+        problem = self.load(timestamp)
+        if isinstance(problem, MatrixProblem):
+            return solver.solve(problem)
+        return solver.solve_pulp(problem)
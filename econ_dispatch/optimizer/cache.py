@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import os
+import json
+import pickle
+import hashlib
+from collections import OrderedDict
+
+from econ_dispatch.utils import fingerprint
+from econ_dispatch.optimizer.result import OptimizationResult
+
+import logging
+_log = logging.getLogger(__name__)
+
+# Forecast values the formulations use, the rest of a forecast record (e.g.
+# the time and weather columns of history models) does not change the
+# result and is left out of the key.
+FORECAST_KEYS = ("elec_load", "heat_load", "cool_load", "solar_kW",
+                 "electricity_cost", "natural_gas_cost", "duration")
+
+
+class SolutionCache(object):
+    """Least recently used cache of optimization results keyed by the
+    forecast loads and prices (FORECAST_KEYS) and the component parameters.
+
+    Forecast values are rounded to multiples of tolerance before hashing,
+    so forecasts that differ by less than that share a result. tolerance is
+    a number for all forecast values or a dict by forecast name (names not
+    in it are used as they are). With file_name the cache is loaded from
+    that file if it exists and written back by save. namespace is part of
+    every key, e.g. to keep results of different optimizer settings apart
+    in the same file."""
+    def __init__(self, size=256, tolerance=None, file_name=None, namespace=""):
+        self.size = size
+        self.namespace = namespace
+        self.tolerance = tolerance
+        self.file_name = file_name
+
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if file_name is not None and os.path.exists(file_name):
+            self.load()
+
+    def key(self, forecast, parameters):
+        quantized = [[(name, self.quantize(name, record[name])) for name in FORECAST_KEYS if name in record]
+                     for record in forecast]
+        data = json.dumps([self.namespace, quantized, fingerprint(parameters)])
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    def quantize(self, name, value):
+        tolerance = self.tolerance
+        if isinstance(tolerance, dict):
+            tolerance = tolerance.get(name)
+        if not tolerance:
+            return float(value)
+        return int(round(float(value) / tolerance))
+
+    def get(self, key):
+        """Copy of the result stored for key or None, counting hits and misses."""
+        result = self.results.pop(key, None)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.results[key] = result
+        return OptimizationResult(result.layout, result.x, result.summary)
+
+    def put(self, key, result):
+        self.results.pop(key, None)
+        self.results[key] = OptimizationResult(result.layout, result.x, result.summary)
+        while len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def load(self):
+        try:
+            with open(self.file_name, "rb") as cache_file:
+                results = pickle.load(cache_file)
+        except Exception as e:
+            _log.warning("Could not read solution cache {}: {}".format(self.file_name, e))
+            return
+        self.results = OrderedDict(list(results.items())[-self.size:])
+        _log.info("Loaded {} cached solutions from {}".format(len(self.results), self.file_name))
+
+    def save(self):
+        if self.file_name is None:
+            return
+        with open(self.file_name, "wb") as cache_file:
+            pickle.dump(self.results, cache_file, pickle.HIGHEST_PROTOCOL)
+
+
+class CachedOptimizer(object):
+    """Optimization function that returns the cached result for inputs it
+    has seen before instead of solving again. Cached results have "cache"
+    as their "Solution Source" and zero solve times."""
+    def __init__(self, optimize, cache):
+        self.optimize = optimize
+        self.cache = cache
+
+    def __call__(self, now, forecast, parameters={}, fixed=None):
+        if fixed:
+            # Solves with fixed variables are one-offs, e.g. stochastic candidates.
+            return self.optimize(now, forecast, parameters, fixed=fixed)
+
+        key = self.cache.key(forecast, parameters)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.optimize(now, forecast, parameters)
+            # Fallback dispatches and incumbents are not worth reusing.
+            if result.get("Optimization Status") in ("Optimal", "Heuristic") and \
+                    result.get("Solution Source") in ("solver", "heuristic"):
+                self.cache.put(key, result)
+            result["Solution Cache Hit"] = False
+        else:
+            _log.debug("Using cached solution")
+            result.mark_reused("cache")
+            result["Solution Cache Hit"] = True
+        return result
+
+    def close(self):
+        self.cache.save()
+        close = getattr(self.optimize, "close", None)
+        if close is not None:
+            close()
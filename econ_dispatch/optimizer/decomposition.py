@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import time
+import atexit
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+from econ_dispatch.optimizer.solvers import Solution
+
+import logging
+_log = logging.getLogger(__name__)
+
+POOL_TYPES = {"thread": ThreadPool,
+              "process": multiprocessing.Pool}
+
+
+def get_pool(pool_type, workers=None):
+    """New pool of pool_type, closed at exit if close_pool is not called
+    before."""
+    try:
+        klass = POOL_TYPES[pool_type]
+    except KeyError:
+        raise ValueError("Unknown decomposition pool type: " + str(pool_type))
+    pool = klass(workers)
+    atexit.register(close_pool, pool)
+    return pool
+
+
+def close_pool(pool):
+    """Let the workers of pool finish their tasks and wait for them to exit."""
+    pool.close()
+    pool.join()
+
+
+def split_problem(problem):
+    """Split a MatrixProblem into independent sub-problems.
+    With use_case_1 this yields one sub-problem per hour.
+
+    Returns a list of (variable indexes, sub-problem) pairs."""
+    blocks = problem.find_blocks()
+    return [(var_index, problem.subproblem(var_index, row_index, "{} block {}".format(problem.name, i)))
+            for i, (var_index, row_index) in enumerate(blocks)]
+
+
+def _solve_block(args):
+    problem, solver, warm_start, deadline = args
+    if deadline is not None:
+        # Blocks wait for a worker, only the time left of the budget is theirs.
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return Solution("Not Solved")
+        solver = solver.with_time_limit(remaining)
+    return solver.solve(problem, warm_start)
+
+
+def solve_decomposed(problem, blocks, pool, solver, warm_start=None):
+    """Solve the independent sub-problems from split_problem in pool and merge
+    the solutions into a Solution for the whole problem.
+
+    The status is "Optimal" only if every sub-problem was solved to
+    optimality, otherwise it is the status of the first sub-problem that was
+    not. The objective value is the sum over the sub-problems, the solution
+    time is the wall clock time of the parallel solve. As with a single
+    solve, both are None if the solver failed on any sub-problem.
+
+    The time limit of solver is the budget of the whole solve, not of each
+    sub-problem: a sub-problem gets the time left when a worker picks it up
+    and is not solved if none is left."""
+    start = time.time()
+    deadline = None if solver.time_limit is None else start + solver.time_limit
+    tasks = [(sub_problem, solver, None if warm_start is None else warm_start[var_index], deadline)
+             for var_index, sub_problem in blocks]
+    solutions = pool.map(_solve_block, tasks)
+    solution_time = time.time() - start
+
+    status = "Optimal"
+    objective_value = 0.0
+    node_count = 0
+    x = np.full(problem.num_vars, np.nan)
+    for (var_index, _), solution in zip(blocks, solutions):
+        if solution.x is not None:
+            x[var_index] = solution.x
+        if status == "Optimal" and solution.status != "Optimal":
+            status = solution.status
+        if solution.objective_value is None:
+            objective_value = None
+        elif objective_value is not None:
+            objective_value += solution.objective_value
+        if solution.node_count is None:
+            node_count = None
+        elif node_count is not None:
+            node_count += solution.node_count
+
+    if objective_value is None:
+        solution_time = None
+
+    return Solution(status, objective_value, solution_time, x, node_count)
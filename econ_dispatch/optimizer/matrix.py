@@ -0,0 +1,539 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import numpy as np
+
+import pulp
+
+from econ_dispatch.optimizer.result import ResultLayout
+
+import logging
+_log = logging.getLogger(__name__)
+
+LE = pulp.LpConstraintLE
+EQ = pulp.LpConstraintEQ
+GE = pulp.LpConstraintGE
+
+
+class MatrixProblem(object):
+    """Mixed integer linear program stored as coefficient arrays.
+
+        minimize    c x
+        subject to  A x (<=, ==, >=) b
+                    lb <= x <= ub
+                    x[integrality] integer
+
+    Variables and constraints are added a whole family at a time
+    (e.g. one variable per hour) so building the model is a handful of
+    NumPy operations rather than one Python object per term.
+    """
+    def __init__(self, name="Building Optimization"):
+        self.name = name
+
+        self.var_names = []
+        self.row_names = []
+
+        self.num_vars = 0
+        self.num_rows = 0
+
+        self._lb = []
+        self._ub = []
+        self._integer = []
+        self._cost = []
+
+        self._coo_rows = []
+        self._coo_cols = []
+        self._coo_vals = []
+
+        self._sense = []
+        self._rhs = []
+
+        self._arrays = None
+        self._layout = None
+
+        # With compact_names the PuLP model names its variables x0, x1, ...
+        # and its constraints c0, c1, ..., var_names and row_names are the
+        # table to translate them back. Saves PuLP checking and hashing the
+        # long names when building and writing the model.
+        self.compact_names = False
+
+        self._pulp = None
+        self._pulp_rows = set()
+        self._pulp_cols = set()
+        self._pulp_bounds = set()
+
+    @classmethod
+    def from_arrays(cls, name, var_names, row_names, c, lb, ub, integrality, A_coo, sense, b):
+        """Create a problem directly from its arrays. A_coo is a (rows, columns, values) tuple."""
+        problem = cls(name)
+        problem.add_variables(var_names, lb, ub)
+        problem._integer = [np.asarray(integrality, dtype=bool)]
+        problem.add_cost(np.arange(len(var_names)), c)
+
+        rows, cols, vals = A_coo
+        problem.row_names = list(row_names)
+        problem.num_rows = len(row_names)
+        problem._coo_rows = [np.asarray(rows, dtype=int)]
+        problem._coo_cols = [np.asarray(cols, dtype=int)]
+        problem._coo_vals = [np.asarray(vals, dtype=float)]
+        problem._sense = [np.asarray(sense, dtype=int)]
+        problem._rhs = [np.asarray(b, dtype=float)]
+        return problem
+
+    @classmethod
+    def from_pulp(cls, prob):
+        """Create the equivalent problem from a pulp.LpProblem, the inverse
+        of to_pulp. A constant in the objective is dropped."""
+        variables = prob.variables()
+        index = dict((var.name, j) for j, var in enumerate(variables))
+        lb = [-np.inf if var.lowBound is None else var.lowBound for var in variables]
+        ub = [np.inf if var.upBound is None else var.upBound for var in variables]
+        integrality = [var.cat == pulp.LpInteger for var in variables]
+
+        c = np.zeros(len(variables))
+        for var, value in prob.objective.items():
+            c[index[var.name]] = value
+
+        row_names = []
+        rows, cols, vals, sense, b = [], [], [], [], []
+        for i, (name, constraint) in enumerate(prob.constraints.items()):
+            row_names.append(name)
+            for var, value in constraint.items():
+                rows.append(i)
+                cols.append(index[var.name])
+                vals.append(value)
+            sense.append(constraint.sense)
+            b.append(-constraint.constant)
+
+        return cls.from_arrays(prob.name, [var.name for var in variables], row_names, c, lb, ub, integrality,
+                               (rows, cols, vals), sense, b)
+
+    def to_arrays(self):
+        """Keyword arguments of from_arrays that recreate the problem. The
+        arrays changed by set_rhs, set_cost and set_bounds are copies."""
+        arrays = self._finalize()
+        return {"name": self.name,
+                "var_names": list(self.var_names),
+                "row_names": list(self.row_names),
+                "c": arrays["c"].copy(),
+                "lb": arrays["lb"].copy(),
+                "ub": arrays["ub"].copy(),
+                "integrality": arrays["integrality"],
+                "A_coo": (arrays["rows"], arrays["cols"], arrays["vals"]),
+                "sense": arrays["sense"],
+                "b": arrays["b"].copy()}
+
+    def add_variables(self, names, lb=0.0, ub=np.inf, integer=False):
+        """Add one variable per name and return their column indexes.
+        lb and ub may be scalars or per variable sequences, None means unbounded."""
+        count = len(names)
+        index = np.arange(self.num_vars, self.num_vars + count)
+
+        if lb is None:
+            lb = -np.inf
+        if ub is None:
+            ub = np.inf
+
+        self.var_names.extend(names)
+        self._lb.append(_broadcast(lb, count))
+        self._ub.append(_broadcast(ub, count))
+        self._integer.append(np.full(count, bool(integer)))
+
+        self.num_vars += count
+        self._arrays = None
+        self._layout = None
+        return index
+
+    def add_binaries(self, names):
+        return self.add_variables(names, 0.0, 1.0, integer=True)
+
+    def add_constraints(self, names, terms, sense, rhs=0.0):
+        """Add one constraint per name and return their row indexes.
+
+        terms is a list of (coefficient, column indexes) pairs, one pair per
+        term of the constraint. Each index array (and coefficient, if it is
+        not a scalar) must have one entry per constraint."""
+        count = len(names)
+        rows = np.arange(self.num_rows, self.num_rows + count)
+
+        for coefficient, index in terms:
+            self._coo_rows.append(rows)
+            self._coo_cols.append(np.asarray(index, dtype=int))
+            self._coo_vals.append(_broadcast(coefficient, count))
+
+        self.row_names.extend(names)
+        self._sense.append(np.full(count, sense, dtype=int))
+        self._rhs.append(_broadcast(rhs, count))
+
+        self.num_rows += count
+        self._arrays = None
+        return rows
+
+    def add_cost(self, index, coefficient):
+        """Add coefficient * x[index] to the objective."""
+        index = np.asarray(index, dtype=int)
+        self._cost.append((index, _broadcast(coefficient, len(index))))
+        self._arrays = None
+
+    def set_rhs(self, rows, values):
+        """Replace the right-hand sides of existing constraints."""
+        b = self._compact()["b"]
+        b[rows] = values
+        self._pulp_rows.update(np.atleast_1d(rows).tolist())
+
+    def set_cost(self, index, values):
+        """Replace the objective coefficients of existing variables."""
+        c = self._compact()["c"]
+        c[index] = values
+        self._pulp_cols.update(np.atleast_1d(index).tolist())
+
+    def set_bounds(self, lb, ub):
+        """Replace the bounds of all variables with the arrays lb and ub,
+        e.g. tightened by a presolve. Only the bounds that change are
+        updated in the PuLP model."""
+        arrays = self._compact()
+        lb = np.asarray(lb, dtype=float)
+        ub = np.asarray(ub, dtype=float)
+        changed = np.nonzero((arrays["lb"] != lb) | (arrays["ub"] != ub))[0]
+        arrays["lb"][changed] = lb[changed]
+        arrays["ub"][changed] = ub[changed]
+        self._pulp_bounds.update(changed.tolist())
+
+    def _compact(self):
+        """Finalize and keep only the finalized arrays so in place changes
+        to them survive adding more variables or constraints."""
+        arrays = self._finalize()
+        self._cost = [(np.arange(self.num_vars), arrays["c"])]
+        self._rhs = [arrays["b"]]
+        self._lb = [arrays["lb"]]
+        self._ub = [arrays["ub"]]
+        return arrays
+
+    def _finalize(self):
+        if self._arrays is not None:
+            return self._arrays
+
+        self._pulp = None
+
+        n = self.num_vars
+
+        c = np.zeros(n)
+        for index, coefficient in self._cost:
+            np.add.at(c, index, coefficient)
+
+        if self._coo_rows:
+            rows = np.concatenate(self._coo_rows)
+            cols = np.concatenate(self._coo_cols)
+            vals = np.concatenate(self._coo_vals)
+            # Merge duplicate entries so every (row, column) pair appears once.
+            keys, inverse = np.unique(rows * n + cols, return_inverse=True)
+            vals = np.bincount(inverse.ravel(), weights=vals, minlength=len(keys))
+            rows = keys // n
+            cols = keys % n
+        else:
+            rows = np.zeros(0, dtype=int)
+            cols = np.zeros(0, dtype=int)
+            vals = np.zeros(0)
+
+        self._arrays = {
+            "c": c,
+            "lb": _concatenate(self._lb),
+            "ub": _concatenate(self._ub),
+            "integrality": _concatenate(self._integer, dtype=bool),
+            "rows": rows,
+            "cols": cols,
+            "vals": vals,
+            "sense": _concatenate(self._sense, dtype=int),
+            "b": _concatenate(self._rhs),
+        }
+        return self._arrays
+
+    @property
+    def c(self):
+        return self._finalize()["c"]
+
+    @property
+    def lb(self):
+        return self._finalize()["lb"]
+
+    @property
+    def ub(self):
+        return self._finalize()["ub"]
+
+    @property
+    def integrality(self):
+        return self._finalize()["integrality"]
+
+    @property
+    def sense(self):
+        return self._finalize()["sense"]
+
+    @property
+    def b(self):
+        return self._finalize()["b"]
+
+    def A_coo(self):
+        """Constraint matrix as (rows, columns, values) arrays."""
+        arrays = self._finalize()
+        return arrays["rows"], arrays["cols"], arrays["vals"]
+
+    def A_sparse(self):
+        """Constraint matrix as a scipy.sparse CSR matrix."""
+        from scipy.sparse import coo_matrix
+        rows, cols, vals = self.A_coo()
+        return coo_matrix((vals, (rows, cols)), shape=(self.num_rows, self.num_vars)).tocsr()
+
+    def row_bounds(self):
+        """Constraint bounds in lower <= A x <= upper form."""
+        b = self.b
+        sense = self.sense
+        lower = np.where(sense == LE, -np.inf, b)
+        upper = np.where(sense == GE, np.inf, b)
+        return lower, upper
+
+    def subproblem(self, var_index, row_index, name=None):
+        """Problem restricted to the given variables and constraints.
+        The constraints must not reference any variable outside var_index."""
+        arrays = self._finalize()
+        var_index = np.asarray(var_index, dtype=int)
+        row_index = np.asarray(row_index, dtype=int)
+
+        var_map = np.full(self.num_vars, -1, dtype=int)
+        var_map[var_index] = np.arange(len(var_index))
+        row_map = np.full(self.num_rows, -1, dtype=int)
+        row_map[row_index] = np.arange(len(row_index))
+
+        rows, cols, vals = arrays["rows"], arrays["cols"], arrays["vals"]
+        keep = row_map[rows] >= 0
+
+        problem = MatrixProblem.from_arrays(name or self.name,
+                                            [self.var_names[j] for j in var_index],
+                                            [self.row_names[i] for i in row_index],
+                                            arrays["c"][var_index],
+                                            arrays["lb"][var_index],
+                                            arrays["ub"][var_index],
+                                            arrays["integrality"][var_index],
+                                            (row_map[rows[keep]], var_map[cols[keep]], vals[keep]),
+                                            arrays["sense"][row_index],
+                                            arrays["b"][row_index])
+        problem.compact_names = self.compact_names
+        return problem
+
+    def find_blocks(self):
+        """Split the problem into independent blocks, i.e. groups of variables
+        that share no constraint with any other group.
+
+        Returns a list of (variable indexes, row indexes) pairs. Variables that
+        appear in no constraint are added to the first block."""
+        rows, cols, _ = self.A_coo()
+
+        # Label propagation over the bipartite row/column graph.
+        labels = np.arange(self.num_vars)
+        while True:
+            row_labels = np.full(self.num_rows, self.num_vars)
+            np.minimum.at(row_labels, rows, labels[cols])
+            new_labels = labels.copy()
+            np.minimum.at(new_labels, cols, row_labels[rows])
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+
+        row_labels = np.full(self.num_rows, self.num_vars)
+        np.minimum.at(row_labels, rows, labels[cols])
+
+        has_rows = np.zeros(self.num_vars, dtype=bool)
+        has_rows[cols] = True
+
+        block_labels = np.unique(labels[has_rows])
+        if len(block_labels) == 0:
+            return [(np.arange(self.num_vars), np.arange(self.num_rows))]
+
+        blocks = []
+        for label in block_labels:
+            var_index = np.nonzero((labels == label) & has_rows)[0]
+            row_index = np.nonzero(row_labels == label)[0]
+            blocks.append((var_index, row_index))
+
+        orphans = np.nonzero(~has_rows)[0]
+        if len(orphans):
+            blocks[0] = (np.concatenate((blocks[0][0], orphans)), blocks[0][1])
+
+        return blocks
+
+    def result_layout(self):
+        """ResultLayout for the variables, kept until variables are added."""
+        if self._layout is None:
+            self._layout = ResultLayout(self.var_names, self.integrality)
+        return self._layout
+
+    def objective_value(self, x):
+        return float(np.dot(self.c, x))
+
+    def is_feasible(self, x, tolerance=1e-6):
+        """True if x satisfies the bounds, integrality and constraints,
+        allowing for a violation of tolerance (relative for the constraints)."""
+        x = np.asarray(x, dtype=float)
+        if x.shape != (self.num_vars,) or np.any(np.isnan(x)):
+            return False
+
+        if np.any(x < self.lb - tolerance) or np.any(x > self.ub + tolerance):
+            return False
+
+        integer = x[self.integrality]
+        if np.any(np.abs(integer - np.round(integer)) > tolerance):
+            return False
+
+        rows, cols, vals = self.A_coo()
+        activity = np.bincount(rows, weights=vals * x[cols], minlength=self.num_rows)
+        lower, upper = self.row_bounds()
+        slack = tolerance * (1.0 + np.abs(self.b))
+        return not (np.any(activity < lower - slack) or np.any(activity > upper + slack))
+
+    def pulp_var_names(self):
+        """Names of the variables in the PuLP model."""
+        if self.compact_names:
+            return ["x{}".format(j) for j in range(self.num_vars)]
+        return self.var_names
+
+    def pulp_row_names(self):
+        """Names of the constraints in the PuLP model."""
+        if self.compact_names:
+            return ["c{}".format(i) for i in range(self.num_rows)]
+        return self.row_names
+
+    def write_names(self, file_name):
+        """Write a "pulp_name name" line for each variable and constraint,
+        to read an LP file written with compact_names."""
+        with open(file_name, "w") as f:
+            for pulp_names, names in ((self.pulp_var_names(), self.var_names),
+                                      (self.pulp_row_names(), self.row_names)):
+                for pulp_name, name in zip(pulp_names, names):
+                    f.write("{} {}\n".format(pulp_name, name))
+
+    def to_pulp(self):
+        """Build the equivalent pulp.LpProblem, e.g. for a PuLP solver or writeLP."""
+        arrays = self._finalize()
+
+        prob = pulp.LpProblem(self.name, pulp.LpMinimize)
+
+        variables = []
+        for name, lb, ub, integer in zip(self.pulp_var_names(), arrays["lb"], arrays["ub"], arrays["integrality"]):
+            lb = None if np.isinf(lb) else float(lb)
+            ub = None if np.isinf(ub) else float(ub)
+            cat = pulp.LpInteger if integer else pulp.LpContinuous
+            variables.append(pulp.LpVariable(name, lb, ub, cat))
+
+        cost_index = np.nonzero(arrays["c"])[0]
+        objective = pulp.LpAffineExpression([(variables[j], float(arrays["c"][j])) for j in cost_index])
+        prob += objective, "Objective Function"
+
+        rows, cols, vals = arrays["rows"], arrays["cols"], arrays["vals"]
+        starts = np.searchsorted(rows, np.arange(self.num_rows + 1))
+        for i, name in enumerate(self.pulp_row_names()):
+            terms = [(variables[cols[k]], float(vals[k])) for k in range(starts[i], starts[i + 1])]
+            constraint = pulp.LpConstraint(pulp.LpAffineExpression(terms),
+                                           int(arrays["sense"][i]),
+                                           name,
+                                           float(arrays["b"][i]))
+            prob += constraint
+
+        return prob
+
+    def pulp_problem(self):
+        """Like to_pulp but the LpProblem is kept and only the right-hand
+        sides, objective coefficients and bounds changed with set_rhs,
+        set_cost and set_bounds are updated on later calls."""
+        if self._pulp is None:
+            self._pulp = self.to_pulp()
+        elif self._pulp_rows or self._pulp_cols or self._pulp_bounds:
+            arrays = self._finalize()
+            row_names = self.pulp_row_names()
+            for i in self._pulp_rows:
+                self._pulp.constraints[row_names[i]].constant = -float(arrays["b"][i])
+
+            variables = self._pulp.variablesDict()
+            var_names = self.pulp_var_names()
+            for j in self._pulp_cols | self._pulp_bounds:
+                variable = variables.get(var_names[j])
+                if variable is None:
+                    # Variable was not in the model when it was built.
+                    self._pulp = self.to_pulp()
+                    break
+                if j in self._pulp_cols:
+                    self._pulp.objective[variable] = float(arrays["c"][j])
+                if j in self._pulp_bounds:
+                    lb, ub = arrays["lb"][j], arrays["ub"][j]
+                    variable.lowBound = None if np.isinf(lb) else float(lb)
+                    variable.upBound = None if np.isinf(ub) else float(ub)
+
+        self._pulp_rows.clear()
+        self._pulp_cols.clear()
+        self._pulp_bounds.clear()
+        return self._pulp
+
+    def __str__(self):
+        return '"MatrixProblem: {} ({} variables, {} constraints)"'.format(self.name, self.num_vars, self.num_rows)
+
+
+def _broadcast(value, count):
+    return np.array(np.broadcast_to(np.asarray(value, dtype=float), (count,)))
+
+
+def _concatenate(arrays, dtype=float):
+    if not arrays:
+        return np.zeros(0, dtype=dtype)
+    return np.concatenate(arrays).astype(dtype)
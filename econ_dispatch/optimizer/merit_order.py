@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Merit order dispatch of the use_case_1 plant without an optimization solver.
+
+All hours of the horizon are dispatched at once with NumPy:
+
+1. The chillers are started in order until they cover the cooling load.
+2. The prime mover follows the electric load (within its limits) in the
+   hours where its fuel cost less the boiler gas saved by its recovered
+   heat is lower than buying the electricity from the grid.
+3. Prime mover heat not needed for heating runs the absorption chiller,
+   which takes cooling load off the chillers. Cooling loads too small for
+   a chiller go to the absorption chiller in any case.
+4. The boiler covers the remaining heating load and the grid the
+   remaining electric load.
+
+The result has the same keys as use_case_1, so components and
+OptimizerCSVOutput work unchanged.
+"""
+
+import numpy as np
+
+from econ_dispatch.optimizer.use_case_1 import get_model_coefficients, UNSERVE_LIMIT
+
+import logging
+_log = logging.getLogger(__name__)
+
+
+def get_dispatch(forecast, parameters={}):
+    """Dispatch for the forecast horizon.
+
+    Returns the values of the use_case_1 variables keyed by name and the
+    total cost of the dispatch."""
+    coef = get_model_coefficients(parameters)
+
+    def column(key):
+        return np.array([forecast_hour[key] for forecast_hour in forecast], dtype=float)
+
+    hours = [str(hour).zfill(2) for hour in range(len(forecast))]
+    zero = np.zeros(len(forecast))
+
+    elec_load = column("elec_load") - column("solar_kW")
+    heat_load = column("heat_load")
+    cool_load = column("cool_load")
+    # hours in each period, forecasts further out may be aggregated
+    duration = np.array([forecast_hour.get("duration", 1) for forecast_hour in forecast], dtype=float)
+    natural_gas_cost = column("natural_gas_cost")
+    electricity_cost = column("electricity_cost")
+
+    result = {}
+
+    def store(template, values, *args):
+        for hour, value in zip(hours, values.tolist()):
+            result[template.format(*(args + (hour,)))] = value
+
+    # prime mover on or off, comparing the cost of the hour both ways
+    _, _, E_chillers = _chillers(coef, cool_load)
+    elec_demand = elec_load + E_chillers
+
+    E_prime_mover_elec_aux = np.clip(elec_demand - coef.xmin_prime_mover,
+                                     0, coef.xmax_prime_mover - coef.xmin_prime_mover)
+    Q_prime_mover = coef.a_Q_primer_mover * E_prime_mover_elec_aux + coef.b_Q_primer_mover
+    E_prime_mover_fuel = coef.a_E_primer_mover * E_prime_mover_elec_aux + coef.b_E_prime_mover
+    E_prime_mover_elec = E_prime_mover_elec_aux + coef.xmin_prime_mover
+
+    recovered_heat = np.minimum(coef.a_hru * Q_prime_mover, heat_load)
+    _, E_boilergas_on = _boiler(coef, heat_load - recovered_heat)
+    _, E_boilergas_off = _boiler(coef, heat_load)
+
+    cost_on = (natural_gas_cost * (E_prime_mover_fuel + E_boilergas_on) +
+               electricity_cost * (elec_demand - E_prime_mover_elec))
+    cost_off = natural_gas_cost * E_boilergas_off + electricity_cost * elec_demand
+    on = cost_on < cost_off
+
+    E_prime_mover_elec_aux = E_prime_mover_elec_aux * on
+    E_prime_mover_elec = E_prime_mover_elec * on
+    E_prime_mover_fuel = E_prime_mover_fuel * on
+    Q_prime_mover = Q_prime_mover * on
+
+    # absorption chiller on prime mover heat that heating does not need, or
+    # on any prime mover heat if the cooling load is too small for a chiller
+    surplus_heat = np.maximum(Q_prime_mover - heat_load / coef.a_hru, 0)
+    small_load = cool_load <= coef.xmin_Chiller[0] / 2.0
+    available_heat = np.where(small_load, Q_prime_mover, surplus_heat)
+    abs_on = on & (cool_load > coef.xmin_AbsChiller / 2.0) & (available_heat >= coef.b_abs) & coef.flagabs
+    Q_abs_aux = np.clip(np.minimum((available_heat - coef.b_abs) / coef.a_abs, cool_load - coef.xmin_AbsChiller),
+                        0, coef.xmax_AbsChiller - coef.xmin_AbsChiller) * abs_on
+    Q_abs = Q_abs_aux + coef.xmin_AbsChiller * abs_on
+    Q_Gencooling = coef.a_abs * Q_abs_aux + coef.b_abs * abs_on
+
+    Q_Genheating = Q_prime_mover - Q_Gencooling
+    Q_HRUheating = np.minimum(coef.a_hru * Q_Genheating, heat_load)
+
+    store("Sturbine_hour{}", on.astype(float))
+    store("E_prime_mover_fuel_hour{}", E_prime_mover_fuel)
+    store("Q_prime_mover_hour{}", Q_prime_mover)
+    store("E_prime_mover_elec_hour{}", E_prime_mover_elec)
+    store("E_prime_mover_elec_hour{}_aux1", E_prime_mover_elec_aux)
+    store("Sabs_hour{}", abs_on.astype(float))
+    store("Q_abs_hour{}", Q_abs)
+    store("Q_abs_hour{}_aux0", Q_abs_aux)
+    store("Q_Gencooling_hour{}", Q_Gencooling)
+    store("Q_Genheating_hour{}", Q_Genheating)
+    store("Q_HRUheating_hour{}", Q_HRUheating)
+
+    # boiler for the rest of the heating load
+    boiler, E_boilergas = _boiler(coef, heat_load - Q_HRUheating)
+    Q_boiler = boiler["Q_boiler_hour{}"]
+    for template, values in boiler.items():
+        store(template, values)
+    Heat_unserve = np.maximum(heat_load - Q_HRUheating - Q_boiler, 0)
+    Heat_dump = np.maximum(Q_HRUheating + Q_boiler - heat_load, 0)
+    store("E_boilergas_hour{}", E_boilergas)
+    store("Heat_unserve_hour{}", Heat_unserve)
+    store("Heat_dump_hour{}", Heat_dump)
+
+    # chillers for the rest of the cooling load
+    chillers, Q_chillers, E_chillers = _chillers(coef, cool_load - Q_abs)
+    for (template, label), values in chillers.items():
+        store(template, values, label)
+    Cool_unserve = np.maximum(cool_load - Q_abs - Q_chillers, 0)
+    Cool_dump = np.maximum(Q_abs + Q_chillers - cool_load, 0)
+    store("Cool_unserve_hour{}", Cool_unserve)
+    store("Cool_dump_hour{}", Cool_dump)
+
+    # grid covers the rest, surplus generation is sold
+    E_gridelec = elec_load + E_chillers - E_prime_mover_elec
+    store("E_gridelec_hour{}", E_gridelec)
+    store("E_unserve_hour{}", zero)
+    store("E_dump_hour{}", zero)
+
+    cost = np.dot(duration, natural_gas_cost * (E_prime_mover_fuel + E_boilergas) +
+                  electricity_cost * E_gridelec +
+                  UNSERVE_LIMIT * (Heat_unserve + Heat_dump + Cool_unserve + Cool_dump))
+
+    return result, float(cost)
+
+
+def _boiler(coef, heat_load):
+    """Boiler output following heat_load, filling the sections of its
+    efficiency curve in order. Returns the boiler variables by name
+    template and the gas use."""
+    # Below half the minimum output leaving the load unserved is cheaper
+    # than dumping the excess of running at the minimum.
+    boiler_on = heat_load > coef.xmin_boiler[0] / 2.0
+    Q_boiler = np.where(boiler_on, np.clip(heat_load, coef.xmin_boiler[0], coef.xmax_boiler[-1]), 0.0)
+    E_boilergas = coef.b_boiler * boiler_on
+
+    values = {"Sboiler_hour{}": boiler_on.astype(float),
+              "Q_boiler_hour{}": Q_boiler}
+
+    remaining = Q_boiler - coef.xmin_boiler[0] * boiler_on
+    for i in range(len(coef.xmax_boiler)):
+        aux = np.clip(remaining, 0, coef.xmax_boiler[i] - coef.xmin_boiler[i])
+        remaining = remaining - aux
+        E_boilergas = E_boilergas + coef.a_boiler[i] * aux
+        values["Q_boiler_hour{}_aux" + str(i)] = aux
+
+    return values, E_boilergas
+
+
+def _chillers(coef, cool_load):
+    """Chillers started in order until they cover cool_load, sharing it in
+    proportion to their capacity. Returns the chiller variables by
+    (name template, label), the total cooling and the total electricity use."""
+    # As for the boiler, small loads are left unserved.
+    cool_load = np.where(cool_load > coef.xmin_Chiller[0] / 2.0, cool_load, 0.0)
+
+    values = {}
+    Q_total = 0.0
+    E_total = 0.0
+
+    if coef.aggregate_chillers:
+        xmin, xmax = coef.xmin_Chiller[0], coef.xmax_Chiller[0]
+        chillers_on = np.clip(np.ceil(cool_load / xmax), 0, coef.chiller_max_on)
+        Q_chiller = np.clip(cool_load, xmin * chillers_on, xmax * chillers_on)
+        aux = Q_chiller - xmin * chillers_on
+        E_chillerelec = coef.a_chiller[0] * aux + coef.b_chiller[0] * chillers_on
+        values[("Nchiller{}_hour{}", "")] = chillers_on
+        values[("Q_chiller{}_hour{}", "")] = Q_chiller
+        values[("Q_chiller{}_hour{}_aux1", "")] = aux
+        values[("E_chillerelec{}_hour{}", "")] = E_chillerelec
+        return values, Q_chiller, E_chillerelec
+
+    capacity_before = np.cumsum([0.0] + coef.xmax_Chiller[:-1])
+    on = [cool_load > capacity for capacity in capacity_before]
+    capacity_on = sum(xmax * chiller_on for xmax, chiller_on in zip(coef.xmax_Chiller, on))
+    share = np.minimum(cool_load / np.where(capacity_on > 0, capacity_on, 1.0), 1.0)
+
+    for i, label in enumerate(coef.chiller_labels):
+        Q_chiller = np.maximum(coef.xmax_Chiller[i] * share, coef.xmin_Chiller[i]) * on[i]
+        aux = Q_chiller - coef.xmin_Chiller[i] * on[i]
+        E_chillerelec = coef.a_chiller[i] * aux + coef.b_chiller[i] * on[i]
+        values[("Schiller{}_hour{}", label)] = on[i].astype(float)
+        values[("Q_chiller{}_hour{}", label)] = Q_chiller
+        values[("Q_chiller{}_hour{}_aux1", label)] = aux
+        values[("E_chillerelec{}_hour{}", label)] = E_chillerelec
+        Q_total = Q_total + Q_chiller
+        E_total = E_total + E_chillerelec
+
+    return values, Q_total, E_total
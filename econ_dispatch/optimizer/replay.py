@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Solve archived problems again and compare with what was recorded.
+
+Reads the problems of an LP archive (the "lp_archive" option) and the
+optimizer debug CSV written in the same run, re-solves every problem in a
+process pool with the given solver backend and reports changes in status,
+objective, dispatch and solve time:
+
+    python -m econ_dispatch.optimizer.replay lps "optimizer output.csv" --solver cbc
+
+Problems are matched to CSV rows by timestamp. Runs with the stochastic
+option only archive the base forecast problem, the recorded result may
+hold a first hour commitment chosen over the scenarios, so their results
+are not expected to match.
+"""
+
+import argparse
+import csv
+import sys
+import json
+import multiprocessing
+from collections import OrderedDict
+
+import numpy as np
+
+from econ_dispatch.optimizer.archive import LPArchiveReader
+from econ_dispatch.optimizer.matrix import MatrixProblem
+from econ_dispatch.optimizer.solvers import get_solver
+from econ_dispatch.utils import OPTIMIZATION_SUMMARY_KEYS
+
+import logging
+_log = logging.getLogger(__name__)
+
+# Reader and solver of the worker process.
+_worker = {}
+
+
+def read_recorded(file_name):
+    """Rows of an optimizer debug CSV keyed by timestamp, with the summary
+    entries and the variable values (NaN where empty or not a number)
+    separated."""
+    recorded = {}
+    with _open_csv(file_name) as f:
+        for row in csv.DictReader(f):
+            values = {}
+            for name, value in row.items():
+                if name == "timestamp" or name in OPTIMIZATION_SUMMARY_KEYS:
+                    continue
+                values[name] = _float(value)
+            recorded[row["timestamp"]] = {"status": row.get("Optimization Status"),
+                                          "objective": _float(row.get("Objective Value")),
+                                          "time": _float(row.get("Convergence Time")),
+                                          "values": values}
+    return recorded
+
+
+def _open_csv(file_name):
+    # The csv module reads bytes on Python 2 and text without newline
+    # translation on Python 3.
+    if sys.version_info[0] < 3:
+        return open(file_name, "rb")
+    return open(file_name, "r", newline="")
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _init_worker(directory, solver_name, solver_options):
+    _worker["reader"] = LPArchiveReader(directory)
+    _worker["solver"] = get_solver(solver_name, **solver_options)
+
+
+def _replay(args):
+    timestamp, recorded_values = args
+    problem = _worker["reader"].load(timestamp)
+    solver = _worker["solver"]
+    if isinstance(problem, MatrixProblem):
+        solution = solver.solve(problem)
+        names = problem.var_names
+    else:
+        variables = problem.variables()
+        solution = solver.solve_pulp(problem, variables)
+        names = [var.name for var in variables]
+
+    dispatch_change = np.nan
+    if solution.x is not None and recorded_values:
+        differences = [abs(value - recorded_values[name])
+                       for name, value in zip(names, solution.x.tolist())
+                       if not np.isnan(recorded_values.get(name, np.nan))]
+        if differences:
+            dispatch_change = max(differences)
+
+    return {"timestamp": timestamp,
+            "status": solution.status,
+            "objective": np.nan if solution.objective_value is None else solution.objective_value,
+            "time": np.nan if solution.solution_time is None else solution.solution_time,
+            "dispatch_change": dispatch_change}
+
+
+def replay(directory, recorded, solver_name="default", solver_options={}, workers=None):
+    """Re-solve every archived problem and return one record per problem
+    with the replayed and recorded status, objective and solve time and the
+    largest change of a variable value."""
+    reader = LPArchiveReader(directory)
+    tasks = [(timestamp, recorded.get(timestamp, {}).get("values", {})) for timestamp in reader.timestamps]
+
+    pool = multiprocessing.Pool(workers, _init_worker, (directory, solver_name, solver_options))
+    try:
+        results = pool.map(_replay, tasks, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+    for result in results:
+        old = recorded.get(result["timestamp"], {})
+        result["recorded_status"] = old.get("status")
+        result["recorded_objective"] = old.get("objective", np.nan)
+        result["recorded_time"] = old.get("time", np.nan)
+    return results
+
+
+def objective_changed(result, tolerance=1e-6):
+    old, new = result["recorded_objective"], result["objective"]
+    if np.isnan(old) or np.isnan(new):
+        return not (np.isnan(old) and np.isnan(new))
+    return abs(new - old) > tolerance * max(1.0, abs(old))
+
+
+def changed(result, tolerance=1e-6):
+    return result["status"] != result["recorded_status"] or objective_changed(result, tolerance) or \
+        result["dispatch_change"] > tolerance
+
+
+def summarize(results, tolerance=1e-6):
+    """Counts of the problems whose status, objective (relative to
+    tolerance) or dispatch (absolute) changed and the total solve times."""
+    matched = [r for r in results if r["recorded_status"] is not None]
+    return OrderedDict([("problems", len(results)),
+                        ("matched", len(matched)),
+                        ("status_changed", sum(r["status"] != r["recorded_status"] for r in matched)),
+                        ("objective_changed", sum(objective_changed(r, tolerance) for r in matched)),
+                        ("dispatch_changed", sum(r["dispatch_change"] > tolerance for r in matched)),
+                        ("recorded_time", float(np.nansum([r["recorded_time"] for r in matched]))),
+                        ("replay_time", float(np.nansum([r["time"] for r in matched])))])
+
+
+def main(directory, recorded_file, solver_name, solver_options, workers, tolerance, output):
+    recorded = read_recorded(recorded_file)
+    results = replay(directory, recorded, solver_name, solver_options, workers)
+    summary = summarize(results, tolerance)
+
+    row = "{:>20} {:>12} {:>12} {:>16} {:>16} {:>10}"
+    print(row.format("timestamp", "status", "was", "objective", "was", "dispatch"))
+    for r in results:
+        if r["recorded_status"] is not None and changed(r, tolerance):
+            print(row.format(r["timestamp"], r["status"], r["recorded_status"],
+                             "{:.4f}".format(r["objective"]), "{:.4f}".format(r["recorded_objective"]),
+                             "{:.2e}".format(r["dispatch_change"])))
+
+    for key, value in summary.items():
+        print("{}: {}".format(key, value))
+
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("archive", help="lp_out_dir of a run with lp_archive")
+    parser.add_argument("recorded", help="Optimizer debug CSV of the same run")
+    parser.add_argument("--solver", default="default")
+    parser.add_argument("--solver-options", type=json.loads, default={}, help="JSON object of solver options")
+    parser.add_argument("--workers", type=int, help="Defaults to the number of CPUs")
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    parser.add_argument("--output", help="JSON file for the per problem results")
+    args = parser.parse_args()
+
+    main(args.archive, args.recorded, args.solver, args.solver_options, args.workers, args.tolerance,
+         args.output)
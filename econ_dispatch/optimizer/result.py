@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import re
+from collections import OrderedDict
+from itertools import chain
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+import numpy as np
+
+from econ_dispatch.utils import natural_keys, OPTIMIZER_TIMING_KEYS
+from econ_dispatch.optimizer.warm_start import shift_name
+
+import logging
+_log = logging.getLogger(__name__)
+
+# Summary entries that time the run that solved a result.
+RUN_TIMING_KEYS = ["Convergence Time"] + OPTIMIZER_TIMING_KEYS
+
+# e.g. "Q_chiller2_hour05_aux1" -> quantity "Q_chiller_aux1", unit "2", hour 5
+NAME_RE = re.compile(r"^(.*?)(\d*)_hour(\d+)(.*)$")
+
+
+class ResultLayout(object):
+    """Where each variable of an optimization problem goes in an
+    OptimizationResult. Worked out once from the variable names, the
+    problem for a given set of components always has the same names.
+
+    Variables named <quantity><unit>_hour<hour><suffix> are grouped into one
+    (unit, hour) array per quantity (with the suffix appended to the
+    quantity), anything else is only reachable by name. integer optionally
+    flags the integer (commitment) variables."""
+    def __init__(self, names, integer=None):
+        self.names = list(names)
+        self.index = dict((name, position) for position, name in enumerate(self.names))
+        if integer is None:
+            self.integer = np.zeros(len(self.names), dtype=bool)
+        else:
+            self.integer = np.asarray(integer, dtype=bool)
+        self.hours = np.full(len(self.names), -1, dtype=int)
+
+        parsed = []
+        units = OrderedDict()
+        self.n_hours = 0
+        for position, name in enumerate(self.names):
+            match = NAME_RE.match(name)
+            if match is None:
+                continue
+            prefix, unit, hour, suffix = match.groups()
+            quantity = prefix + suffix
+            hour = int(hour)
+            units.setdefault(quantity, set()).add(unit)
+            parsed.append((position, quantity, unit, hour))
+            self.hours[position] = hour
+            self.n_hours = max(self.n_hours, hour + 1)
+
+        self.units = OrderedDict()
+        self.columns = {}
+        rows = {}
+        for quantity in sorted(units, key=natural_keys):
+            labels = sorted(units[quantity], key=natural_keys)
+            self.units[quantity] = labels
+            self.columns[quantity] = np.full((len(labels), self.n_hours), -1, dtype=int)
+            rows[quantity] = dict((label, row) for row, label in enumerate(labels))
+
+        for position, quantity, unit, hour in parsed:
+            self.columns[quantity][rows[quantity][unit], hour] = position
+
+
+class OptimizationResult(MutableMapping):
+    """Optimizer output: one value per problem variable in the array x,
+    laid out by a ResultLayout, plus summary entries such as
+    "Optimization Status".
+
+    Also works as the dict of values keyed by variable name the optimizer
+    used to return, with None for variables without a value."""
+    def __init__(self, layout, x=None, summary=None):
+        self.layout = layout
+        if x is None:
+            self.x = np.full(len(layout.names), np.nan)
+        else:
+            self.x = np.array(x, dtype=float)
+        self.summary = OrderedDict() if summary is None else OrderedDict(summary)
+
+    @classmethod
+    def from_dict(cls, values):
+        """Result from values keyed by variable name, e.g. from a heuristic dispatch."""
+        names = sorted(values, key=natural_keys)
+        x = [np.nan if values[name] is None else values[name] for name in names]
+        return cls(ResultLayout(names), x)
+
+    @property
+    def n_hours(self):
+        return self.layout.n_hours
+
+    def quantities(self):
+        return list(self.layout.units)
+
+    def units(self, quantity):
+        """Unit labels of quantity in the order of the rows of array(quantity),
+        e.g. ["0", "1", "2"] for the chillers or [""] for a single boiler."""
+        return self.layout.units[quantity]
+
+    def array(self, quantity):
+        """Values of quantity as a (unit, hour) array, NaN where there is none."""
+        columns = self.layout.columns[quantity]
+        values = self.x[columns]
+        values[columns < 0] = np.nan
+        return values
+
+    def commitment(self, hour=0):
+        """Rounded values of the integer variables of hour, keyed by name."""
+        positions = np.nonzero(self.layout.integer & (self.layout.hours == hour))[0]
+        return dict((self.layout.names[position], None if np.isnan(self.x[position]) else int(round(self.x[position])))
+                    for position in positions)
+
+    def shift(self, hours):
+        """The result as seen hours later, hour h + hours becomes hour h.
+        Earlier hours and variables without an hour are dropped."""
+        positions = np.nonzero(self.layout.hours >= hours)[0]
+        names = [shift_name(self.layout.names[position], -hours) for position in positions]
+        layout = ResultLayout(names, self.layout.integer[positions])
+        return OptimizationResult(layout, self.x[positions], self.summary)
+
+    def mark_reused(self, source):
+        """Mark the result as served again without solving: source becomes
+        its "Solution Source" and the times of the run that solved it are
+        zeroed."""
+        self.summary["Solution Source"] = source
+        for key in RUN_TIMING_KEYS:
+            if key in self.summary:
+                self.summary[key] = 0.0
+
+    def __getitem__(self, name):
+        position = self.layout.index.get(name)
+        if position is None:
+            return self.summary[name]
+        value = self.x[position]
+        return None if np.isnan(value) else float(value)
+
+    def __setitem__(self, name, value):
+        position = self.layout.index.get(name)
+        if position is None:
+            self.summary[name] = value
+        else:
+            self.x[position] = np.nan if value is None else value
+
+    def __delitem__(self, name):
+        if name in self.layout.index:
+            raise KeyError("Cannot remove problem variable " + name)
+        del self.summary[name]
+
+    def __contains__(self, name):
+        return name in self.layout.index or name in self.summary
+
+    def __iter__(self):
+        return chain(self.layout.names, self.summary)
+
+    def __len__(self):
+        return len(self.layout.names) + len(self.summary)
+
+    def __repr__(self):
+        return "OptimizationResult({} variables, {} hours, {})".format(len(self.layout.names),
+                                                                       self.n_hours,
+                                                                       dict(self.summary))
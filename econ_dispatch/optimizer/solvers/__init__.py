@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import abc
+import copy
+import shutil
+import tempfile
+import logging
+_log = logging.getLogger(__name__)
+
+import numpy as np
+import pulp
+
+
+class Solution(object):
+    """Result of a solve. x holds one value per variable of the problem,
+    it is None if the solver failed. objective_value and solution_time are
+    None if the solver failed. node_count is the number of branch and
+    bound nodes, None if the backend does not report it."""
+    def __init__(self, status, objective_value=None, solution_time=None, x=None, node_count=None):
+        self.status = status
+        self.objective_value = objective_value
+        self.solution_time = solution_time
+        self.x = x
+        self.node_count = node_count
+
+
+class SolverBase(object):
+    __metaclass__ = abc.ABCMeta
+
+    # True if the solver can start from a given (partial) solution.
+    supports_warm_start = False
+
+    # True if the solver implements solve_duals.
+    supports_duals = False
+
+    def __init__(self, time_limit=None, mip_gap=None, **kwargs):
+        """time_limit is the wall clock budget of a solve in seconds and
+        mip_gap the relative MIP gap at which to stop, None for the solver
+        defaults. When the time limit is hit the solver returns its best
+        integer solution, if it found one, with a non-optimal status."""
+        self.time_limit = time_limit
+        self.mip_gap = mip_gap
+
+    def with_time_limit(self, time_limit):
+        """Copy of the solver with another time limit, e.g. the time left
+        of a budget shared by several solves."""
+        solver = copy.copy(self)
+        solver.time_limit = time_limit
+        return solver
+
+    @abc.abstractmethod
+    def solve(self, problem, warm_start=None):
+        """Solve a MatrixProblem and return a Solution.
+
+        warm_start is an optional array with a start value for each variable,
+        NaN where there is none. Solvers that do not support warm starts
+        ignore it."""
+        pass
+
+    def solve_duals(self, problem, fixed, rows):
+        """Solve the LP of a MatrixProblem with the variables in fixed (a
+        dict of index to value) held at their values and integrality
+        dropped, e.g. the commitment of a MILP solution. Returns the duals of
+        the constraints with indexes rows as an array, the change in the
+        objective per unit increase of the right-hand side. NaN where the
+        solve failed."""
+        raise NotImplementedError("Solver does not support duals")
+
+
+class PuLPSolverBase(SolverBase):
+    """Backends that go through a PuLP solver. These can also solve problems
+    built directly as a pulp.LpProblem."""
+
+    @abc.abstractmethod
+    def get_pulp_solver(self):
+        """Return the pulp solver instance or None for the PuLP default solver."""
+        pass
+
+    def solve_in_directory(self, prob):
+        """Solve prob with a solver that keeps its temporary files in a
+        directory of its own. Some PuLP versions name the files after the
+        process, so solves in threads of one process would overwrite each
+        other's files."""
+        solver = self.get_pulp_solver()
+        if solver is None:
+            solver = pulp.LpSolverDefault.copy()
+        directory = tempfile.mkdtemp(prefix="econ_dispatch_")
+        try:
+            solver.tmpDir = directory
+            prob.solve(solver)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def solve(self, problem, warm_start=None):
+        prob = problem.pulp_problem()
+        variables = prob.variablesDict()
+        return self.solve_pulp(prob, [variables.get(name) for name in problem.pulp_var_names()], warm_start)
+
+    def solve_pulp(self, prob, variables=None, warm_start=None):
+        """Solve prob and return values in the order of variables
+        (prob.variables() by default)."""
+        if variables is None:
+            variables = prob.variables()
+
+        if self.supports_warm_start:
+            # PuLP passes the current variable values as the start, so
+            # values left from the last solve must be cleared as well.
+            if warm_start is None:
+                warm_start = np.full(len(variables), np.nan)
+            for var, value in zip(variables, warm_start.tolist()):
+                if var is not None:
+                    var.varValue = None if np.isnan(value) else value
+
+        objective_value = None
+        solution_time = None
+        try:
+            self.solve_in_directory(prob)
+        except Exception as e:
+            _log.warning("PuLP failed: " + str(e))
+        else:
+            solution_time = prob.solutionTime
+            objective_value = pulp.value(prob.objective)
+
+        x = np.array([np.nan if var is None or var.varValue is None else var.varValue for var in variables])
+
+        return Solution(pulp.LpStatus[prob.status], objective_value, solution_time, x)
+
+    supports_duals = True
+
+    def solve_duals(self, problem, fixed, rows):
+        var_names = problem.pulp_var_names()
+        row_names = problem.pulp_row_names()
+        fixed = dict((var_names[j], value) for j, value in fixed.items())
+        return self.solve_pulp_duals(problem.pulp_problem(), fixed, [row_names[i] for i in rows])
+
+    def solve_pulp_duals(self, prob, fixed, row_names):
+        """solve_duals for a pulp.LpProblem, fixed is keyed by variable name
+        and the duals are returned in the order of row_names. The problem is
+        left as it was apart from the variable values."""
+        variables = prob.variablesDict()
+        saved = []
+        for name, value in fixed.items():
+            var = variables[name]
+            saved.append((var, var.lowBound, var.upBound, var.cat))
+            var.lowBound = var.upBound = value
+            var.cat = pulp.LpContinuous
+
+        solved = False
+        try:
+            self.solve_in_directory(prob)
+            solved = prob.status == pulp.LpStatusOptimal
+        except Exception as e:
+            _log.warning("PuLP failed: " + str(e))
+        finally:
+            for var, low_bound, up_bound, cat in saved:
+                var.lowBound = low_bound
+                var.upBound = up_bound
+                var.cat = cat
+
+        duals = np.full(len(row_names), np.nan)
+        if solved:
+            for i, name in enumerate(row_names):
+                pi = prob.constraints[name].pi
+                if pi is not None:
+                    duals[i] = pi
+        return duals
+
+
+def get_solver(name, **kwargs):
+    module = __import__(name, globals(), locals(), ['Solver'], 1)
+    klass = module.Solver
+    return klass(**kwargs)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import time
+import logging
+_log = logging.getLogger(__name__)
+
+import numpy as np
+try:
+    from scipy.optimize import milp, linprog, Bounds, LinearConstraint
+except ImportError:
+    # scipy.optimize.milp is new in scipy 1.9, which needs Python 3.8.
+    milp = None
+
+from econ_dispatch.optimizer.solvers import SolverBase, Solution
+from econ_dispatch.optimizer.matrix import EQ, GE
+
+# scipy.optimize.milp status codes to PuLP status names.
+STATUS = {0: "Optimal",
+          1: "Not Solved",
+          2: "Infeasible",
+          3: "Unbounded",
+          4: "Undefined"}
+
+
+class Solver(SolverBase):
+    """HiGHS through scipy.optimize.milp, solved in process directly from the
+    problem arrays. Keyword arguments are passed as milp options
+    (e.g. "disp", "presolve").
+
+    Python 3 only: needs scipy 1.9 or later and so Python 3.8 or later. The
+    rest of econ_dispatch still runs on Python 2, where this backend raises
+    ValueError and "cbc" or "glpk" have to be used."""
+    def __init__(self, time_limit=None, mip_gap=None, **kwargs):
+        if milp is None:
+            raise ValueError("The highs solver needs scipy 1.9 or later (Python 3.8 or later), "
+                             "use the cbc or glpk solver instead")
+        super(Solver, self).__init__(time_limit, mip_gap)
+        self.options = kwargs
+
+    def get_options(self):
+        options = dict(self.options)
+        if self.time_limit is not None:
+            options["time_limit"] = self.time_limit
+        if self.mip_gap is not None:
+            options["mip_rel_gap"] = self.mip_gap
+        return options
+
+    def solve(self, problem, warm_start=None):
+        lower, upper = problem.row_bounds()
+        constraints = []
+        if problem.num_rows:
+            constraints.append(LinearConstraint(problem.A_sparse(), lower, upper))
+
+        start = time.time()
+        try:
+            res = milp(problem.c,
+                       constraints=constraints,
+                       integrality=problem.integrality.astype(int),
+                       bounds=Bounds(problem.lb, problem.ub),
+                       options=self.get_options())
+        except Exception as e:
+            _log.warning("HiGHS failed: " + str(e))
+            return Solution("Undefined")
+        solution_time = time.time() - start
+
+        status = STATUS.get(res.status, "Undefined")
+        if res.status != 0:
+            _log.warning("HiGHS: " + str(res.message))
+            return Solution(status, x=res.x)
+
+        return Solution(status, float(res.fun), solution_time, np.asarray(res.x),
+                        getattr(res, "mip_node_count", None))
+
+    supports_duals = True
+
+    def solve_duals(self, problem, fixed, rows):
+        lb = problem.lb.copy()
+        ub = problem.ub.copy()
+        index = np.array(list(fixed), dtype=int)
+        lb[index] = ub[index] = [fixed[j] for j in index]
+
+        # linprog takes A_ub x <= b_ub and A_eq x == b_eq.
+        A = problem.A_sparse()
+        sense = problem.sense
+        eq = np.nonzero(sense == EQ)[0]
+        ineq = np.nonzero(sense != EQ)[0]
+        sign = np.where(sense[ineq] == GE, -1.0, 1.0)
+        A_ub = A[ineq].multiply(sign[:, None]).tocsr() if len(ineq) else None
+        A_eq = A[eq] if len(eq) else None
+
+        try:
+            res = linprog(problem.c,
+                          A_ub=A_ub, b_ub=sign * problem.b[ineq] if len(ineq) else None,
+                          A_eq=A_eq, b_eq=problem.b[eq] if len(eq) else None,
+                          bounds=np.column_stack((lb, ub)),
+                          method="highs")
+        except Exception as e:
+            _log.warning("HiGHS failed: " + str(e))
+            res = None
+
+        duals = np.full(len(rows), np.nan)
+        if res is None or res.status != 0:
+            return duals
+
+        all_duals = np.zeros(problem.num_rows)
+        all_duals[eq] = res.eqlin.marginals
+        all_duals[ineq] = sign * res.ineqlin.marginals
+        return all_duals[np.asarray(rows, dtype=int)]
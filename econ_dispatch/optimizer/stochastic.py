@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Dispatch against several forecast scenarios.
+
+The forecast models only give a point forecast, so the scenarios are drawn
+here around it (see ScenarioGenerator), electricity and gas prices are
+perturbed along with the loads. SystemModel.get_forecasts still returns the
+single forecast.
+
+The first hour decisions are the ones that get acted on, the rest of the
+horizon is re-planned at the next time step. Three ways of choosing them
+are supported:
+
+"two_stage": solve one problem over all scenarios with the first hour
+    variables shared between them and the mean cost of the scenarios as
+    objective, the extensive form of the two-stage stochastic program. The
+    result is the dispatch of the base forecast scenario. Needs an
+    optimization module with get_optimization_template. The problem is split
+    into its independent blocks (see decomposition.split_problem), with
+    use_case_1 the shared first hour and every later hour of every
+    scenario, which are solved in the pool. It is not written or archived.
+
+"consensus": solve each scenario, take the majority vote of the first hour
+    commitments and re-solve the base forecast with it if needed.
+
+"candidates": solve each scenario, then evaluate every distinct first hour
+    commitment against every scenario and keep the one with the lowest
+    expected cost. A cheaper approximation of "two_stage" that only
+    considers commitments that are optimal for some scenario.
+
+For "consensus" and "candidates" the base forecast is solved in this
+process while the other scenarios are solved in a process or thread pool,
+each worker builds its own optimization function from the configuration.
+With a time limit, it is the budget of each of these solves and of the
+whole two-stage solve.
+Only the base forecast problem is written with "write_lp" or archived with
+"lp_archive", duals and phase timings are not computed. PuLP solvers get a
+temporary directory per solve so the command line solvers work in the
+thread pool as well. The pool is closed by close() or at exit."""
+
+import threading
+import importlib
+from collections import Counter
+
+import numpy as np
+
+from econ_dispatch.optimizer.decomposition import get_pool, close_pool, split_problem, solve_decomposed
+from econ_dispatch.optimizer.matrix import MatrixProblem
+from econ_dispatch.optimizer.result import OptimizationResult, ResultLayout
+from econ_dispatch.utils import fingerprint, aggregate_forecasts
+
+import logging
+_log = logging.getLogger(__name__)
+
+METHODS = ("two_stage", "consensus", "candidates")
+
+# Optimizer settings that do not apply to the scenario solves.
+IGNORED_SETTINGS = ("stochastic", "solution_cache", "duals", "timing")
+
+# Optimizer settings that only apply to the base forecast solve, the
+# scenarios would all write their problem under the same time.
+BASE_ONLY_SETTINGS = ("write_lp", "lp_archive")
+
+# Relative forecast error per day of look ahead.
+DEFAULT_ERRORS = {"elec_load": 0.03,
+                  "heat_load": 0.05,
+                  "cool_load": 0.05,
+                  "electricity_cost": 0.05,
+                  "natural_gas_cost": 0.02}
+
+# Optimization functions of the worker, keyed by configuration.
+_local = threading.local()
+
+
+class ScenarioGenerator(object):
+    """Perturbed copies of a load and price forecast.
+
+    Each scenario multiplies the forecast values by a random walk that starts
+    at 1 in the first hour so the error grows with the look ahead, errors
+    maps forecast names to the standard deviation of the walk after a day.
+    The first scenario is the forecast itself."""
+    def __init__(self, count=8, errors=None, seed=None):
+        if count < 1:
+            raise ValueError("Scenario count must be at least 1")
+        self.count = count
+        self.errors = DEFAULT_ERRORS if errors is None else errors
+        self.random = np.random.RandomState(seed)
+
+    def generate(self, forecast):
+        durations = np.array([record.get("duration", 1) for record in forecast[1:]], dtype=float)
+        scenarios = [forecast]
+        for _ in range(self.count - 1):
+            factors = {}
+            for name, error in self.errors.items():
+                steps = self.random.normal(0.0, 1.0, len(durations)) * error * np.sqrt(durations / 24.0)
+                factors[name] = np.maximum(1.0 + np.concatenate(([0.0], np.cumsum(steps))), 0.0)
+            scenario = []
+            for i, record in enumerate(forecast):
+                record = dict(record)
+                for name, factor in factors.items():
+                    if name in record:
+                        record[name] = record[name] * factor[i]
+                scenario.append(record)
+            scenarios.append(scenario)
+        return scenarios
+
+
+def _get_optimizer(config):
+    optimizers = getattr(_local, "optimizers", None)
+    if optimizers is None:
+        optimizers = _local.optimizers = {}
+    key = fingerprint(config)
+    optimize = optimizers.get(key)
+    if optimize is None:
+        # Imported here, econ_dispatch.optimizer imports this module.
+        from econ_dispatch.optimizer import get_optimization_function
+        optimize = optimizers[key] = get_optimization_function(config)
+    return optimize
+
+
+def _solve_scenario(args):
+    config, now, forecast, parameters, fixed = args
+    return _get_optimizer(config)(now, forecast, parameters, fixed=fixed)
+
+
+def _usable(result):
+    return result.get("Solution Source") in ("solver", "incumbent")
+
+
+def extensive_form(problems, first_stage, name="Two-stage dispatch"):
+    """Extensive form of the two-stage stochastic program over scenario
+    problems, given as to_arrays() dicts of MatrixProblems with the same
+    variables and constraints.
+
+    The variables with indexes first_stage are shared by all scenarios,
+    the others are copied for each scenario (named with a "_scenario<n>"
+    suffix after the first) and the objective is the mean of the scenario
+    objectives. The first problem's variables come first, in their order."""
+    base = problems[0]
+    n = len(base["var_names"])
+    m = len(base["row_names"])
+    first_stage = np.asarray(first_stage, dtype=int)
+    second_stage = np.setdiff1d(np.arange(n), first_stage)
+    weight = 1.0 / len(problems)
+
+    var_names = list(base["var_names"])
+    row_names = []
+    lb, ub, integrality = [base["lb"]], [base["ub"]], [base["integrality"]]
+    costs, rows, cols, vals, sense, b = [], [], [], [], [], []
+    for s, problem in enumerate(problems):
+        columns = np.arange(n)
+        if s:
+            suffix = "_scenario{}".format(s)
+            columns[second_stage] = len(var_names) + np.arange(len(second_stage))
+            var_names.extend(problem["var_names"][j] + suffix for j in second_stage)
+            lb.append(problem["lb"][second_stage])
+            ub.append(problem["ub"][second_stage])
+            integrality.append(problem["integrality"][second_stage])
+            row_names.extend(row_name + suffix for row_name in problem["row_names"])
+        else:
+            row_names.extend(problem["row_names"])
+
+        problem_rows, problem_cols, problem_vals = problem["A_coo"]
+        costs.append((columns, weight * problem["c"]))
+        rows.append(problem_rows + s * m)
+        cols.append(columns[problem_cols])
+        vals.append(problem_vals)
+        sense.append(problem["sense"])
+        b.append(problem["b"])
+
+    c = np.zeros(len(var_names))
+    for columns, cost in costs:
+        np.add.at(c, columns, cost)
+
+    return MatrixProblem.from_arrays(name, var_names, row_names, c,
+                                     np.concatenate(lb), np.concatenate(ub), np.concatenate(integrality),
+                                     (np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)),
+                                     np.concatenate(sense), np.concatenate(b))
+
+
+class StochasticOptimizer(object):
+    """Optimization function that dispatches against scenarios of the
+    forecast, see the module docstring for the methods.
+
+    The forecast may also be given as a list of scenarios, the first one is
+    the base forecast. The returned result is the dispatch of the base
+    forecast under the chosen first hour decisions."""
+    def __init__(self, config, method="consensus", scenarios=8, errors=None, seed=None,
+                 pool="process", workers=None):
+        if method not in METHODS:
+            raise ValueError("Unknown stochastic dispatch method: " + str(method))
+        self.base_config = config
+        self.config = dict((key, value) for key, value in config.items() if key not in BASE_ONLY_SETTINGS)
+        self.method = method
+        self.generator = ScenarioGenerator(scenarios, errors, seed)
+
+        self.pool = get_pool(pool, workers)
+        if method == "two_stage":
+            module = importlib.import_module("econ_dispatch.optimizer." + config["name"])
+            if config.get("builder", "matrix") != "matrix" or not hasattr(module, "get_optimization_template"):
+                raise ValueError("Two-stage dispatch requires the matrix problem builder and a module "
+                                 "with get_optimization_template")
+            if any(config.get(key) for key in BASE_ONLY_SETTINGS):
+                _log.warning("The two-stage problem is not written or archived")
+            # Imported here, econ_dispatch.optimizer imports this module.
+            from econ_dispatch.optimizer import get_config_solver
+            self.get_template = module.get_optimization_template
+            _, self.solver = get_config_solver(config)
+            self.template = None
+            self.template_key = None
+
+    def __call__(self, now, forecast, parameters={}, fixed=None):
+        if forecast and isinstance(forecast[0], list):
+            scenarios = forecast
+        else:
+            scenarios = [forecast] if fixed else self.generator.generate(forecast)
+
+        if fixed:
+            # The first hour commitment is already decided.
+            return self._solve_base(now, scenarios[0], parameters, fixed)
+
+        if self.method == "two_stage":
+            result = self._two_stage(now, scenarios, parameters)
+            result["Scenario Count"] = len(scenarios)
+            return result
+
+        tasks = [(self.config, now, scenario, parameters, None) for scenario in scenarios[1:]]
+        pending = self.pool.map_async(_solve_scenario, tasks)
+        results = [self._solve_base(now, scenarios[0], parameters, None)] + pending.get()
+        commitments = [result.commitment(0) if _usable(result) else None for result in results]
+
+        if self.method == "consensus":
+            result = self._consensus(now, scenarios, parameters, results, commitments)
+        else:
+            result = self._candidates(now, scenarios, parameters, results, commitments)
+        result["Scenario Count"] = len(scenarios)
+        return result
+
+    def close(self):
+        close_pool(self.pool)
+
+    def _solve_base(self, now, forecast, parameters, fixed):
+        return _get_optimizer(self.base_config)(now, forecast, parameters, fixed=fixed)
+
+    def _solve(self, now, scenarios, parameters, fixed):
+        tasks = [(self.config, now, scenario, parameters, commitment)
+                 for scenario, commitment in zip(scenarios, fixed)]
+        return self.pool.map(_solve_scenario, tasks)
+
+    def _consensus(self, now, scenarios, parameters, results, commitments):
+        votes = [commitment for commitment in commitments if commitment is not None]
+        if not votes:
+            _log.warning("No scenario was solved, using the base forecast dispatch")
+            return results[0]
+
+        consensus = {}
+        for name in votes[0]:
+            counts = Counter(vote[name] for vote in votes if vote[name] is not None)
+            if counts:
+                consensus[name] = counts.most_common(1)[0][0]
+
+        result = results[0]
+        if commitments[0] != consensus:
+            _log.debug("Re-solving the base forecast with the consensus commitment")
+            result = self._solve_base(now, scenarios[0], parameters, consensus)
+
+        result["Scenario Agreement"] = sum(vote == consensus for vote in votes) / float(len(scenarios))
+        return result
+
+    def _two_stage(self, now, scenarios, parameters):
+        forecasts = scenarios
+        horizon_aggregation = self.config.get("horizon_aggregation")
+        if horizon_aggregation:
+            forecasts = [aggregate_forecasts(forecast, horizon_aggregation) for forecast in forecasts]
+
+        key = (fingerprint(parameters), len(forecasts[0]))
+        if key != self.template_key:
+            self.template = self.get_template(parameters, len(forecasts[0]))
+            self.template_key = key
+        template = self.template
+
+        problems = []
+        for forecast in forecasts:
+            arrays = template.update(forecast).to_arrays()
+            if self.config.get("presolve", False):
+                arrays["lb"], arrays["ub"] = template.presolve_bounds(forecast)
+            problems.append(arrays)
+
+        # The first hour is the same in every scenario, so are its decisions.
+        layout = ResultLayout(problems[0]["var_names"], problems[0]["integrality"])
+        problem = extensive_form(problems, np.nonzero(layout.hours == 0)[0])
+        problem.compact_names = self.config.get("compact_names", False)
+        blocks = split_problem(problem)
+        if len(blocks) > 1:
+            solution = solve_decomposed(problem, blocks, self.pool, self.solver)
+        else:
+            solution = self.solver.solve(problem)
+        if solution.status != "Optimal" or solution.x is None:
+            _log.warning("Two-stage problem status {}, using the base forecast dispatch".format(solution.status))
+            return self._solve_base(now, scenarios[0], parameters, None)
+
+        x = solution.x[:len(layout.names)]
+        result = OptimizationResult(layout, x)
+        result["Optimization Status"] = solution.status
+        result["Objective Value"] = float(np.dot(problems[0]["c"], x))
+        result["Convergence Time"] = -1 if solution.solution_time is None else solution.solution_time
+        result["Solution Source"] = "solver"
+        if solution.node_count is not None:
+            result["Node Count"] = solution.node_count
+        result["Expected Objective Value"] = solution.objective_value
+        return result
+
+    def _candidates(self, now, scenarios, parameters, results, commitments):
+        candidates = []
+        for commitment in commitments:
+            if commitment is not None and commitment not in candidates:
+                candidates.append(commitment)
+        if not candidates:
+            _log.warning("No scenario was solved, using the base forecast dispatch")
+            return results[0]
+
+        # Reuse the scenario solves, only solve the other candidates.
+        tasks = [(i, j) for i, candidate in enumerate(candidates)
+                 for j, commitment in enumerate(commitments) if commitment != candidate]
+        solved = self._solve(now, [scenarios[j] for i, j in tasks], parameters,
+                             [candidates[i] for i, j in tasks])
+
+        evaluated = {}
+        for j, commitment in enumerate(commitments):
+            if commitment is not None:
+                evaluated[candidates.index(commitment), j] = results[j]
+        evaluated.update(zip(tasks, solved))
+
+        costs = np.array([[evaluated[i, j]["Objective Value"] if _usable(evaluated[i, j]) else np.inf
+                           for j in range(len(scenarios))]
+                          for i in range(len(candidates))])
+        expected = costs.mean(axis=1)
+        best = int(np.argmin(expected))
+        _log.debug("Expected cost of the candidate commitments: {}".format(expected))
+
+        result = evaluated[best, 0]
+        result["Expected Objective Value"] = float(expected[best])
+        result["Candidate Commitments"] = len(candidates)
+        return result
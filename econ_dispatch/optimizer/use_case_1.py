@@ -61,6 +61,8 @@ import pandas as pd
 import pulp
 from pulp import LpVariable
 
+from econ_dispatch.optimizer.matrix import MatrixProblem, EQ, GE, LE
+
 from pprint import pformat
 
 import logging
@@ -68,10 +70,18 @@ _log = logging.getLogger(__name__)
 
 UNSERVE_LIMIT = 10000
 
+# Balance constraints whose duals are the marginal cost of each energy
+# form per hour, see the "duals" optimizer option.
+DUAL_CONSTRAINTS = ("ElecBalance", "HeatBalance", "CoolBalance")
+
 def binary_var(name):
     return LpVariable(name, 0, 1, pulp.LpInteger)
 
-def get_optimization_problem(forecast, parameters={}):
+class ModelCoefficients(object):
+    pass
+
+def get_model_coefficients(parameters):
+    """Compute the coefficients of the formulation from the component parameters."""
     # get the model parameters and bounds for variables
     # load FuelCellPara.mat
 
@@ -85,8 +95,8 @@ def get_optimization_problem(forecast, parameters={}):
 
         # load BoilerPara.mat
         mat_boiler = parameters["mat_boiler"]
-        xmax_boiler =  parameters["xmax_boiler"]
-        xmin_boiler =  parameters["xmin_boiler"]
+        xmax_boiler = np.array(parameters["xmax_boiler"], dtype=float)
+        xmin_boiler = np.array(parameters["xmin_boiler"], dtype=float)
         cap_boiler = parameters["cap_boiler"]
 
         # load ChillerIGVPara.mat
@@ -104,49 +114,99 @@ def get_optimization_problem(forecast, parameters={}):
         cap_abs = parameters["cap_abs_chiller"]
         cap_abs = cap_abs / 293.1  # kW -> mmBtu/hr
     except KeyError as e:
-        raise RuntimeError("Missing needed configuration parameter: " + e.message)
+        raise RuntimeError("Missing needed configuration parameter: " + str(e))
+
+    coef = ModelCoefficients()
 
     ## compute the parameters for the optimization
     # boiler
     xmin_boiler[0] = cap_boiler * 0.15 # !!!need to consider cases when xmin is not in the first section of the training data
     Nsection = np.where(xmax_boiler > cap_boiler)[0][0]
     Nsection = Nsection + 1
-    xmin_boiler = xmin_boiler[:Nsection]
-    xmax_boiler = xmax_boiler[:Nsection]
-    a_boiler = mat_boiler[1][:Nsection]
-    b_boiler = mat_boiler[0][0] + a_boiler[0] * xmin_boiler[0]
-    xmax_boiler[-1] = cap_boiler
+    coef.xmin_boiler = xmin_boiler[:Nsection]
+    coef.xmax_boiler = xmax_boiler[:Nsection]
+    coef.a_boiler = np.array(mat_boiler[1][:Nsection], dtype=float)
+    coef.b_boiler = mat_boiler[0][0] + coef.a_boiler[0] * coef.xmin_boiler[0]
+    coef.xmax_boiler[-1] = cap_boiler
 
     # absorption chiller
-    flagabs = True
-    xmin_AbsChiller = cap_abs * 0.15
-    a_abs = mat_abschiller[1]
-    b_abs = mat_abschiller[0] + a_abs * xmin_AbsChiller
-    xmax_AbsChiller = cap_abs
+    coef.flagabs = True
+    coef.xmin_AbsChiller = cap_abs * 0.15
+    coef.a_abs = mat_abschiller[1]
+    coef.b_abs = mat_abschiller[0] + coef.a_abs * coef.xmin_AbsChiller
+    coef.xmax_AbsChiller = cap_abs
 
     # chiller
-    xmin_Chiller= []
-    a_chiller = []
-    b_chiller = []
-    xmax_Chiller = []
+    coef.n_chiller = n_chiller
+    coef.xmin_Chiller = []
+    coef.a_chiller = []
+    coef.b_chiller = []
+    coef.xmax_Chiller = []
     for i in range(n_chiller):
-        xmin_Chiller.append(cap_chiller * 0.15)
-        a_chiller.append(mat_chillerIGV[1] + i * 0.01)  # adding 0.01 to the slopes to differentiate the chillers
-        b_chiller.append(mat_chillerIGV[0] + a_chiller[i] * xmin_chillerIGV)
-        xmax_Chiller.append(cap_chiller)
+        coef.xmin_Chiller.append(cap_chiller * 0.15)
+        coef.a_chiller.append(mat_chillerIGV[1] + i * 0.01)  # adding 0.01 to the slopes to differentiate the chillers
+        coef.b_chiller.append(mat_chillerIGV[0] + coef.a_chiller[i] * xmin_chillerIGV)
+        coef.xmax_Chiller.append(cap_chiller)
+
+    # Identical chillers may instead be modeled as one unit with an integer
+    # number of chillers on, which avoids exploring equivalent permutations.
+    coef.aggregate_chillers = bool(parameters.get("chiller_aggregate", False))
+    if coef.aggregate_chillers:
+        coef.chiller_labels = [""]
+        coef.chiller_max_on = n_chiller
+        coef.a_chiller = [mat_chillerIGV[1]]
+        coef.b_chiller = [mat_chillerIGV[0] + mat_chillerIGV[1] * xmin_chillerIGV]
+        coef.xmin_Chiller = coef.xmin_Chiller[:1]
+        coef.xmax_Chiller = coef.xmax_Chiller[:1]
+    else:
+        coef.chiller_labels = [str(i) for i in range(n_chiller)]
+        coef.chiller_max_on = 1
 
     # prime mover (fuel cell/micro turbine generator)
-    xmin_prime_mover = cap_prime_mover * 0.3
-    a_E_primer_mover = mat_prime_mover[1]
-    b_E_prime_mover = mat_prime_mover[0] + a_E_primer_mover * xmin_prime_mover
-    xmax_prime_mover = cap_prime_mover
+    coef.xmin_prime_mover = cap_prime_mover * 0.3
+    coef.a_E_primer_mover = mat_prime_mover[1]
+    coef.b_E_prime_mover = mat_prime_mover[0] + coef.a_E_primer_mover * coef.xmin_prime_mover
+    coef.xmax_prime_mover = cap_prime_mover
 
-    a_Q_primer_mover = a_E_primer_mover - 1 / 293.1
-    b_Q_primer_mover = b_E_prime_mover - xmin_prime_mover / 293.1
+    coef.a_Q_primer_mover = coef.a_E_primer_mover - 1 / 293.1
+    coef.b_Q_primer_mover = coef.b_E_prime_mover - coef.xmin_prime_mover / 293.1
 
     # heat recovery unit
-    a_hru = 0.8
+    coef.a_hru = 0.8
+
+    return coef
+
+def get_optimization_problem(forecast, parameters={}):
+    coef = get_model_coefficients(parameters)
+
+    if coef.aggregate_chillers:
+        raise RuntimeError("Aggregated chillers are only supported by the matrix problem builder")
+
+    xmin_boiler = coef.xmin_boiler
+    xmax_boiler = coef.xmax_boiler
+    a_boiler = coef.a_boiler
+    b_boiler = coef.b_boiler
+
+    flagabs = coef.flagabs
+    xmin_AbsChiller = coef.xmin_AbsChiller
+    a_abs = coef.a_abs
+    b_abs = coef.b_abs
+    xmax_AbsChiller = coef.xmax_AbsChiller
 
+    n_chiller = coef.n_chiller
+    xmin_Chiller = coef.xmin_Chiller
+    a_chiller = coef.a_chiller
+    b_chiller = coef.b_chiller
+    xmax_Chiller = coef.xmax_Chiller
+
+    xmin_prime_mover = coef.xmin_prime_mover
+    a_E_primer_mover = coef.a_E_primer_mover
+    b_E_prime_mover = coef.b_E_prime_mover
+    xmax_prime_mover = coef.xmax_prime_mover
+    a_Q_primer_mover = coef.a_Q_primer_mover
+    b_Q_primer_mover = coef.b_Q_primer_mover
+
+    a_hru = coef.a_hru
 
     ################################################################################
 
@@ -154,6 +214,8 @@ def get_optimization_problem(forecast, parameters={}):
     constraints = []
     for hour, forecast_hour in enumerate(forecast):
         hour = str(hour).zfill(2)
+        # hours in the period, forecasts further out may be aggregated
+        duration = forecast_hour.get("duration", 1)
         # binary variables
         Sturbine = binary_var("Sturbine_hour{}".format(hour))
         Sboiler = binary_var("Sboiler_hour{}".format(hour))
@@ -211,15 +273,15 @@ def get_optimization_problem(forecast, parameters={}):
 
         # constraints
         objective_component += [
-            forecast_hour["natural_gas_cost"]* E_prime_mover_fuel,
-            forecast_hour["natural_gas_cost"] * E_boilergas,
-            forecast_hour["electricity_cost"] * E_gridelec,
-            UNSERVE_LIMIT * E_unserve,
-            UNSERVE_LIMIT * E_dump,
-            UNSERVE_LIMIT * Heat_unserve,
-            UNSERVE_LIMIT * Heat_dump,
-            UNSERVE_LIMIT * Cool_unserve,
-            UNSERVE_LIMIT * Cool_dump
+            duration * forecast_hour["natural_gas_cost"]* E_prime_mover_fuel,
+            duration * forecast_hour["natural_gas_cost"] * E_boilergas,
+            duration * forecast_hour["electricity_cost"] * E_gridelec,
+            duration * UNSERVE_LIMIT * E_unserve,
+            duration * UNSERVE_LIMIT * E_dump,
+            duration * UNSERVE_LIMIT * Heat_unserve,
+            duration * UNSERVE_LIMIT * Heat_dump,
+            duration * UNSERVE_LIMIT * Cool_unserve,
+            duration * UNSERVE_LIMIT * Cool_dump
         ]
 
         # electric energy balance
@@ -377,3 +439,310 @@ def get_optimization_problem(forecast, parameters={}):
        prob += c
 
     return prob
+
+
+def get_optimization_matrix(forecast, parameters={}):
+    """Build the same formulation as get_optimization_problem as a MatrixProblem."""
+    template = get_optimization_template(parameters, len(forecast))
+    return template.update(forecast)
+
+def get_optimization_template(parameters, n_hours):
+    """Build the problem structure for the given component parameters and horizon.
+    The forecast is applied afterwards with OptimizationTemplate.update."""
+    return OptimizationTemplate(parameters, n_hours)
+
+def get_fallback_dispatch(forecast, parameters={}):
+    """Dispatch for when the solver gives no usable solution, see merit_order.
+    Returns a value for every variable of the optimization problem, keyed by name."""
+    # imported here, merit_order itself builds on this module
+    from econ_dispatch.optimizer.merit_order import get_dispatch
+    result, _ = get_dispatch(forecast, parameters)
+    return result
+
+
+def _forecast_column(forecast):
+    def column(key):
+        return np.array([forecast_hour[key] for forecast_hour in forecast], dtype=float)
+    return column
+
+
+def _forecast_duration(forecast):
+    return np.array([forecast_hour.get("duration", 1) for forecast_hour in forecast], dtype=float)
+
+
+class OptimizationTemplate(object):
+    """The use_case_1 MatrixProblem for a fixed set of component parameters
+    and horizon length. The forecast only enters the objective coefficients
+    and the right-hand sides of the energy balances, so a new forecast is
+    applied by patching those in place.
+
+    lb and ub are the variable bounds as built, the optimization function
+    sets them (or tighter ones) on the problem before every solve."""
+    def __init__(self, parameters, n_hours):
+        self.n_hours = n_hours
+        self.problem = self.build(get_model_coefficients(parameters))
+        self.lb = self.problem.lb.copy()
+        self.ub = self.problem.ub.copy()
+        self.duration = np.ones(n_hours)
+
+    def update(self, forecast):
+        if len(forecast) != self.n_hours:
+            raise ValueError("Forecast has {} hours, template was built for {}".format(len(forecast), self.n_hours))
+
+        column = _forecast_column(forecast)
+
+        problem = self.problem
+        # Costs are per hour, periods further out may be aggregated to several hours.
+        duration = _forecast_duration(forecast)
+        natural_gas_cost = duration * column("natural_gas_cost")
+        problem.set_cost(self.E_prime_mover_fuel, natural_gas_cost)
+        problem.set_cost(self.E_boilergas, natural_gas_cost)
+        problem.set_cost(self.E_gridelec, duration * column("electricity_cost"))
+
+        if not np.array_equal(duration, self.duration):
+            for index in self.penalized:
+                problem.set_cost(index, UNSERVE_LIMIT * duration)
+            self.duration = duration
+
+        problem.set_rhs(self.ElecBalance, column("elec_load") - column("solar_kW"))
+        problem.set_rhs(self.HeatBalance, column("heat_load"))
+        problem.set_rhs(self.CoolBalance, column("cool_load"))
+
+        return problem
+
+    def presolve_bounds(self, forecast):
+        """Variable bounds for presolve, tightened using the forecast.
+
+        In hours without heating (cooling) load and with non-negative prices
+        the boiler (chillers and absorption chiller) can only add cost, so
+        they are fixed off along with their output and aux variables. The
+        output of each unit is limited to the larger of the load and its
+        minimum output, anything above that could only be dumped."""
+        if len(forecast) != self.n_hours:
+            raise ValueError("Forecast has {} hours, template was built for {}".format(len(forecast), self.n_hours))
+
+        coef = self.coef
+        column = _forecast_column(forecast)
+        heat_load = column("heat_load")
+        cool_load = column("cool_load")
+
+        lb = self.lb.copy()
+        ub = self.ub.copy()
+
+        def limit(output, aux, xmin, load, max_on=1):
+            bound = np.maximum(load, xmin * max_on)
+            ub[output] = np.minimum(ub[output], bound)
+            for index in aux:
+                ub[index] = np.minimum(ub[index], bound - xmin)
+
+        def fix_off(off, *variables):
+            for index in variables:
+                lb[index[off]] = 0.0
+                ub[index[off]] = 0.0
+
+        limit(self.Q_boiler, self.Q_boiler_aux, coef.xmin_boiler[0], heat_load)
+        limit(self.Q_abs, self.Q_abs_aux, coef.xmin_AbsChiller, cool_load)
+        for i in range(len(self.Q_chiller)):
+            limit(self.Q_chiller[i], [self.Q_chiller_aux[i]], coef.xmin_Chiller[i], cool_load, coef.chiller_max_on)
+
+        heat_off = (heat_load <= 0) & (column("natural_gas_cost") >= 0)
+        fix_off(heat_off, self.Sboiler, self.Q_boiler, self.E_boilergas, *self.Q_boiler_aux)
+
+        cool_off = cool_load <= 0
+        fix_off(cool_off, self.Sabs, self.Q_abs, self.Q_Gencooling, *self.Q_abs_aux)
+
+        chillers_off = cool_off & (column("electricity_cost") >= 0)
+        fix_off(chillers_off, *(self.Schiller + self.Q_chiller + self.Q_chiller_aux + self.E_chillerelec))
+
+        return lb, ub
+
+    def build(self, coef):
+        hours = [str(hour).zfill(2) for hour in range(self.n_hours)]
+
+        def names(template, *args):
+            return [template.format(*(args + (hour,))) for hour in hours]
+
+        problem = MatrixProblem("Building Optimization")
+
+        # binary variables
+        Sturbine = problem.add_binaries(names("Sturbine_hour{}"))
+        Sboiler = problem.add_binaries(names("Sboiler_hour{}"))
+        Sabs = problem.add_binaries(names("Sabs_hour{}"))
+        Schiller = []
+        if coef.aggregate_chillers:
+            # number of chillers on
+            Schiller.append(problem.add_variables(names("Nchiller_hour{}"), 0, coef.chiller_max_on, integer=True))
+        else:
+            for label in coef.chiller_labels:
+                Schiller.append(problem.add_binaries(names("Schiller{}_hour{}", label)))
+
+        # free variables
+        E_gridelec = problem.add_variables(names("E_gridelec_hour{}"), None)
+
+        # regular variables
+        E_unserve = problem.add_variables(names("E_unserve_hour{}"))
+        E_dump = problem.add_variables(names("E_dump_hour{}"))
+        Heat_unserve = problem.add_variables(names("Heat_unserve_hour{}"))
+        Heat_dump = problem.add_variables(names("Heat_dump_hour{}"))
+        Cool_unserve = problem.add_variables(names("Cool_unserve_hour{}"))
+        Cool_dump = problem.add_variables(names("Cool_dump_hour{}"))
+
+        E_prime_mover_fuel = problem.add_variables(names("E_prime_mover_fuel_hour{}"), coef.xmin_boiler[0])
+        Q_prime_mover = problem.add_variables(names("Q_prime_mover_hour{}"))
+        E_prime_mover_elec = problem.add_variables(names("E_prime_mover_elec_hour{}"))
+        E_prime_mover_elec_aux = problem.add_variables(
+            [name + "_aux1" for name in names("E_prime_mover_elec_hour{}")],
+            0, coef.xmax_prime_mover - coef.xmin_prime_mover)
+
+        E_boilergas = problem.add_variables(names("E_boilergas_hour{}"))
+
+        Q_boiler = problem.add_variables(names("Q_boiler_hour{}"))
+        Q_boiler_aux = []
+        for i in range(len(coef.xmax_boiler)):
+            Q_boiler_aux.append(problem.add_variables(
+                [name + "_aux{}".format(i) for name in names("Q_boiler_hour{}")],
+                0, coef.xmax_boiler[i] - coef.xmin_boiler[i]))
+
+        E_chillerelec = []
+        for label in coef.chiller_labels:
+            E_chillerelec.append(problem.add_variables(names("E_chillerelec{}_hour{}", label)))
+
+        Q_chiller = []
+        Q_chiller_aux = []
+        for i, label in enumerate(coef.chiller_labels):
+            Q_chiller.append(problem.add_variables(names("Q_chiller{}_hour{}", label)))
+            Q_chiller_aux.append(problem.add_variables(
+                [name + "_aux1" for name in names("Q_chiller{}_hour{}", label)],
+                0, (coef.xmax_Chiller[i] - coef.xmin_Chiller[i]) * coef.chiller_max_on))
+
+        Q_abs = problem.add_variables(names("Q_abs_hour{}"))
+        Q_abs_aux = [problem.add_variables([name + "_aux0" for name in names("Q_abs_hour{}")])]
+
+        Q_HRUheating = problem.add_variables(names("Q_HRUheating_hour{}"))
+        Q_Genheating = problem.add_variables(names("Q_Genheating_hour{}"))
+        Q_Gencooling = problem.add_variables(names("Q_Gencooling_hour{}"))
+
+        # objective, costs from the forecast are set in update
+        problem.add_cost(E_prime_mover_fuel, 0)
+        problem.add_cost(E_boilergas, 0)
+        problem.add_cost(E_gridelec, 0)
+        self.penalized = (E_unserve, E_dump, Heat_unserve, Heat_dump, Cool_unserve, Cool_dump)
+        for var in self.penalized:
+            problem.add_cost(var, UNSERVE_LIMIT)
+
+        # electric energy balance
+        terms = [(1, E_prime_mover_elec), (1, E_gridelec)]
+        terms += [(-1, e_chill) for e_chill in E_chillerelec]
+        terms += [(1, E_unserve), (-1, E_dump)]
+        self.ElecBalance = problem.add_constraints(names("ElecBalance{}"), terms, EQ)
+
+        # heating balance
+        terms = [(1, Q_boiler), (1, Q_HRUheating), (1, Heat_unserve), (-1, Heat_dump)]
+        self.HeatBalance = problem.add_constraints(names("HeatBalance{}"), terms, EQ)
+
+        # cooling balance
+        terms = [(1, q_chill) for q_chill in Q_chiller]
+        if coef.flagabs:
+            terms.insert(0, (1, Q_abs))
+        terms += [(1, Cool_unserve), (-1, Cool_dump)]
+        self.CoolBalance = problem.add_constraints(names("CoolBalance{}"), terms, EQ)
+
+        # generator gas
+        terms = [(1, E_prime_mover_fuel), (-coef.a_E_primer_mover, E_prime_mover_elec_aux), (-coef.b_E_prime_mover, Sturbine)]
+        problem.add_constraints(names("PrimeMoverFuelConsume{}"), terms, EQ)
+
+        # generator heat
+        terms = [(1, Q_prime_mover), (-coef.a_Q_primer_mover, E_prime_mover_elec_aux), (-coef.b_Q_primer_mover, Sturbine)]
+        problem.add_constraints(names("PrimeMoverHeatGenerate{}"), terms, EQ)
+
+        # microturbine elec
+        terms = [(1, E_prime_mover_elec), (-1, E_prime_mover_elec_aux), (-coef.xmin_prime_mover, Sturbine)]
+        problem.add_constraints(names("PrimeMoverElecGenerate{}"), terms, EQ)
+
+        terms = [(1, E_prime_mover_elec), (-coef.xmin_prime_mover, Sturbine)]
+        problem.add_constraints(names("PrimeMoverElower{}"), terms, GE)
+
+        terms = [(1, E_prime_mover_elec), (-coef.xmax_prime_mover, Sturbine)]
+        problem.add_constraints(names("PrimeMoverEupper{}"), terms, LE)
+
+        # boiler
+        terms = [(1, E_boilergas)]
+        terms += [(-a, q_boil) for a, q_boil in zip(coef.a_boiler, Q_boiler_aux)]
+        terms += [(-coef.b_boiler, Sboiler)]
+        problem.add_constraints(names("BoilerGasConsume{}"), terms, EQ)
+
+        terms = [(1, Q_boiler)]
+        terms += [(-1, q) for q in Q_boiler_aux]
+        terms += [(-coef.xmin_boiler[0], Sboiler)]
+        problem.add_constraints(names("BoilerHeatGenerate{}"), terms, EQ)
+
+        terms = [(1, Q_boiler), (-coef.xmin_boiler[0], Sboiler)]
+        problem.add_constraints(names("BoilerQlower{}"), terms, GE)
+
+        terms = [(1, Q_boiler), (-coef.xmax_boiler[-1], Sboiler)]
+        problem.add_constraints(names("BoilerQupper{}"), terms, LE)
+
+        # chillers
+        for chiller, label in enumerate(coef.chiller_labels):
+            terms = [(1, E_chillerelec[chiller]),
+                     (-coef.a_chiller[chiller], Q_chiller_aux[chiller]),
+                     (-coef.b_chiller[chiller], Schiller[chiller])]
+            problem.add_constraints(names("ChillerElecConsume{}_{}", label), terms, EQ)
+
+            terms = [(1, Q_chiller[chiller]),
+                     (-1, Q_chiller_aux[chiller]),
+                     (-coef.xmin_Chiller[chiller], Schiller[chiller])]
+            problem.add_constraints(names("ChillerCoolGenerate{}_{}", label), terms, EQ)
+
+            terms = [(1, Q_chiller[chiller]), (-coef.xmin_Chiller[chiller], Schiller[chiller])]
+            problem.add_constraints(names("ChillerQlower{}_{}", label), terms, GE)
+
+            terms = [(1, Q_chiller[chiller]), (-coef.xmax_Chiller[chiller], Schiller[chiller])]
+            problem.add_constraints(names("ChillerQupper{}_{}", label), terms, LE)
+
+        # abschiller
+        terms = [(1, Q_Gencooling)]
+        terms += [(-coef.a_abs, q) for q in Q_abs_aux]
+        terms += [(-coef.b_abs, Sabs)]
+        problem.add_constraints(names("AbsChillerHeatCoolConsume{}"), terms, EQ)
+
+        terms = [(1, Q_abs)]
+        terms += [(-1, q) for q in Q_abs_aux]
+        terms += [(-coef.xmin_AbsChiller, Sabs)]
+        problem.add_constraints(names("AbsChillerHeatGenerate{}"), terms, EQ)
+
+        terms = [(1, Q_abs), (-coef.xmin_AbsChiller, Sabs)]
+        problem.add_constraints(names("AbschillerQlower{}"), terms, GE)
+
+        terms = [(1, Q_abs), (-coef.xmax_AbsChiller, Sabs)]
+        problem.add_constraints(names("AbschillerQupper{}"), terms, LE)
+
+        # HRU
+        terms = [(1, Q_Genheating)]
+        if coef.flagabs:
+            terms.append((1, Q_Gencooling))
+        terms.append((-1, Q_prime_mover))
+        problem.add_constraints(names("HRUWasteheat{}"), terms, EQ)
+
+        terms = [(1, Q_HRUheating), (-coef.a_hru, Q_Genheating)]
+        problem.add_constraints(names("HRUHeatlimit{}"), terms, LE)
+
+        self.coef = coef
+
+        self.E_prime_mover_fuel = E_prime_mover_fuel
+        self.E_boilergas = E_boilergas
+        self.E_gridelec = E_gridelec
+
+        self.Sboiler = Sboiler
+        self.Q_boiler = Q_boiler
+        self.Q_boiler_aux = Q_boiler_aux
+        self.Sabs = Sabs
+        self.Q_abs = Q_abs
+        self.Q_abs_aux = Q_abs_aux
+        self.Q_Gencooling = Q_Gencooling
+        self.Schiller = Schiller
+        self.Q_chiller = Q_chiller
+        self.Q_chiller_aux = Q_chiller_aux
+        self.E_chillerelec = E_chillerelec
+
+        return problem
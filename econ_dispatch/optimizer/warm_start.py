@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import re
+import datetime
+
+import numpy as np
+
+import logging
+_log = logging.getLogger(__name__)
+
+HOUR_RE = re.compile(r"_hour(\d+)")
+
+
+def shift_name(name, steps):
+    """Name of the same variable steps hours later, e.g.
+    shift_name("Q_boiler_hour03_aux0", 1) == "Q_boiler_hour04_aux0".
+    Returns None for names without an hour."""
+    match = HOUR_RE.search(name)
+    if match is None:
+        return None
+    hour = str(int(match.group(1)) + steps).zfill(2)
+    return name[:match.start(1)] + hour + name[match.end(1):]
+
+
+class WarmStart(object):
+    """Keeps the last solution of a rolling horizon optimization and shifts
+    it by the time elapsed since then to use as the start of the next solve.
+
+    Hour h of the new problem starts from hour h + steps of the last
+    solution. Hours beyond the end of the last horizon are left unset."""
+    def __init__(self, time_step=datetime.timedelta(hours=1)):
+        self.time_step = time_step
+        self.last_time = None
+        self.last_values = {}
+
+        self.attempts = 0
+        self.hits = 0
+
+    @property
+    def hit_rate(self):
+        if not self.attempts:
+            return 0.0
+        return float(self.hits) / self.attempts
+
+    def get(self, now, names):
+        """Return a start value for each name (NaN if unknown), or None if
+        there is no usable previous solution."""
+        self.attempts += 1
+
+        if self.last_time is None:
+            return None
+
+        try:
+            elapsed = now - self.last_time
+            steps, remainder = divmod(elapsed.total_seconds(), self.time_step.total_seconds())
+        except (TypeError, AttributeError):
+            return None
+
+        if remainder or steps < 0:
+            return None
+
+        x = np.full(len(names), np.nan)
+        for i, name in enumerate(names):
+            value = self.last_values.get(shift_name(name, int(steps)))
+            if value is not None:
+                x[i] = value
+
+        if np.isnan(x).all():
+            return None
+
+        self.hits += 1
+        return x
+
+    def update(self, now, names, x):
+        self.last_time = now
+        if x is None:
+            self.last_values = {}
+        else:
+            self.last_values = dict((name, value) for name, value in zip(names, x.tolist())
+                                    if not np.isnan(value))
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+
+"""Snapshots of fitted models for a fast start.
+
+Building the system model reads every training file and fits the
+component and forecast models. A snapshot cache pickles each model once it
+is fitted and loads it on the next start instead. Snapshots are keyed by
+the model class and settings, the contents of every file the settings
+name, the source of the model code and the numpy/pandas versions, so a
+change to any of them fits the model again."""
+
+import os
+import sys
+import gzip
+import json
+import pickle
+import hashlib
+import inspect
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import logging
+_log = logging.getLogger(__name__)
+
+# Source files hashed for every model besides its own classes, the fitting
+# helpers live here.
+SHARED_MODULES = ("econ_dispatch.utils",)
+
+
+def _source_file(module_name):
+    module = sys.modules.get(module_name)
+    file_name = getattr(module, "__file__", None)
+    if file_name is None:
+        return None
+    source = os.path.splitext(file_name)[0] + ".py"
+    return source if os.path.exists(source) else file_name
+
+
+def _setting_files(value):
+    """Existing files named anywhere in the settings."""
+    if isinstance(value, dict):
+        for item in value.values():
+            for file_name in _setting_files(item):
+                yield file_name
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            for file_name in _setting_files(item):
+                yield file_name
+    elif isinstance(value, basestring) and os.path.isfile(value):
+        yield value
+
+
+class SnapshotCache(object):
+    """Fitted models pickled and gzipped in directory, one file per model."""
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, klass, settings):
+        digest = hashlib.sha1()
+        header = [klass.__module__, klass.__name__, settings,
+                  list(sys.version_info[:2]), np.__version__, pd.__version__]
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode("utf-8"))
+
+        modules = set(cls.__module__ for cls in inspect.getmro(klass)
+                      if cls.__module__.startswith("econ_dispatch"))
+        modules.update(SHARED_MODULES)
+        for module_name in sorted(modules):
+            source = _source_file(module_name)
+            if source is not None:
+                with open(source, "rb") as source_file:
+                    digest.update(source_file.read())
+
+        for file_name in sorted(set(_setting_files(settings))):
+            digest.update(file_name.encode("utf-8"))
+            with open(file_name, "rb") as data_file:
+                for chunk in iter(lambda: data_file.read(1 << 20), b""):
+                    digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def get(self, kind, name, klass, settings, build):
+        """Model of class klass with settings, from its snapshot if it is
+        current, otherwise made by build() and snapshotted."""
+        key = self.key(klass, settings)
+        prefix = "{}.{}.".format(kind, name)
+        file_name = os.path.join(self.directory, prefix + key[:16] + ".snapshot")
+
+        if os.path.exists(file_name):
+            try:
+                with gzip.open(file_name, "rb") as snapshot_file:
+                    model = pickle.load(snapshot_file)
+            except Exception as e:
+                _log.warning("Could not read snapshot {}: {}".format(file_name, e))
+            else:
+                self.hits += 1
+                _log.debug("Loaded {} {} from snapshot".format(kind, name))
+                return model
+
+        self.misses += 1
+        model = build()
+        # Fit what is otherwise fitted on the first run so the snapshot has it.
+        prepare = getattr(model, "prepare_parameters", None)
+        if prepare is not None:
+            prepare()
+        self.save(prefix, file_name, model)
+        return model
+
+    def save(self, prefix, file_name, model):
+        # Written next to the snapshot and renamed into place so another
+        # process never reads a partly written file.
+        handle, temp_name = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                with gzip.GzipFile(fileobj=temp_file, mode="wb") as snapshot_file:
+                    pickle.dump(model, snapshot_file, pickle.HIGHEST_PROTOCOL)
+            os.rename(temp_name, file_name)
+        except Exception as e:
+            _log.warning("Could not write snapshot {}: {}".format(file_name, e))
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            return
+
+        # Snapshots of the same model with other keys are stale now.
+        current = os.path.basename(file_name)
+        for other in os.listdir(self.directory):
+            if not other.endswith(".snapshot") or other == current:
+                continue
+            if other[:-len(".snapshot")].rsplit(".", 1)[0] + "." == prefix:
+                os.remove(os.path.join(self.directory, other))
@@ -59,18 +59,26 @@ import logging
 _log = logging.getLogger(__name__)
 
 import networkx as nx
+import pandas as pd
 
 import datetime
 
 from pprint import pformat
 
+from econ_dispatch.utils import aggregate_forecasts, PhaseTimer, NullTimer, OPTIMIZER_TIMING_KEYS
+
 class SystemModel(object):
-    def __init__(self, optimizer, weather_model, optimization_frequency, optimizer_debug_csv=None):
+    def __init__(self, optimizer, weather_model, optimization_frequency, optimizer_debug_csv=None,
+                 horizon_aggregation=None, trigger_policy=None, timing=False, forecast_buffer=True):
         self.component_graph = nx.MultiDiGraph()
         self.instance_map = {}
 
         self.forecast_models = {}
 
+        # Forecast records of the last horizon by timestamp with the weather
+        # they were derived from, None to derive every hour every time.
+        self.forecast_buffer = {} if forecast_buffer else None
+
         self.optimizer = optimizer
         self.weather_model = weather_model
 
@@ -79,8 +87,31 @@ class SystemModel(object):
         self.optimization_frequency = optimization_frequency
         self.next_optimization = None
 
+        # Blocks for aggregate_forecasts, None for an hourly horizon.
+        self.horizon_aggregation = horizon_aggregation
+
+        # TriggerPolicy to only solve again when the inputs drift, None to solve every time.
+        self.trigger_policy = trigger_policy
+
+        # Seconds per phase of the last run in timer.phases, see PhaseTimer.
+        self.timing = timing
+        self.timer = PhaseTimer() if timing else NullTimer()
+
     def add_forecast_model(self, model, name):
         self.forecast_models[name] = model
+        self.invalidate_forecasts()
+
+    def add_training_data(self, name, now, variable_values={}):
+        """Pass training data to a forecast model, its forecasts change."""
+        self.forecast_models[name].add_training_data(now, variable_values)
+        self.invalidate_forecasts()
+
+    def invalidate_forecasts(self):
+        """Derive every hour again on the next run, e.g. after a forecast
+        model was retrained or the weather source changed in a way that the
+        weather values do not show."""
+        if self.forecast_buffer is not None:
+            self.forecast_buffer.clear()
 
     def add_component(self, component, type_name):
         self.component_graph.add_node(component.name, type = type_name)
@@ -125,15 +156,43 @@ class SystemModel(object):
     def get_forecasts(self, now):
         weather_forecasts = self.weather_model.get_weather_forecast(now)
         #Loads were updated previously when we updated all components
-        forecasts = []
+        buffer = self.forecast_buffer
+        new_buffer = {}
+        timestamps = []
+        records = []
+        missing = []
 
         for weather_forecast in weather_forecasts:
             timestamp = weather_forecast.pop("timestamp")
-            record = {}
+            timestamps.append(timestamp)
+
+            # Hours already in the last horizon are reused unless their weather changed.
+            buffered = buffer.get(timestamp) if buffer is not None else None
+            if buffered is not None and buffered[0] == weather_forecast:
+                records.append(buffered[1])
+            else:
+                records.append({})
+                missing.append(len(records) - 1)
+
+        # Derive all remaining hours at once, one batch per forecast model.
+        if missing:
+            missing_timestamps = [timestamps[i] for i in missing]
+            weather_frame = pd.DataFrame([weather_forecasts[i] for i in missing])
             for name, model in self.forecast_models.iteritems():
-                record.update(model.derive_variables(timestamp, weather_forecast))
+                derived = model.derive_horizon(missing_timestamps, weather_frame)
+                for i, values in zip(missing, derived.to_dict("records")):
+                    records[i].update(values)
 
-            forecasts.append(record)
+        forecasts = []
+        for timestamp, weather_forecast, record in zip(timestamps, weather_forecasts, records):
+            new_buffer[timestamp] = (weather_forecast, record)
+            forecasts.append(dict(record))
+
+        if buffer is not None:
+            self.forecast_buffer = new_buffer
+
+        if self.horizon_aggregation:
+            forecasts = aggregate_forecasts(forecasts, self.horizon_aggregation)
 
         return forecasts
 
@@ -142,14 +201,32 @@ class SystemModel(object):
         _log.debug("Updating Components")
         _log.debug("Inputs:\n"+pformat(inputs))
         for component in self.instance_map.itervalues():
-            component.update_parameters(now, inputs)
+            component.refresh_parameters(now, inputs)
 
     def run_general_optimizer(self, now, predicted_loads, parameters):
         _log.debug("Running General Optimizer")
-        results = self.optimizer(now, predicted_loads, parameters)
-
-        if self.optimizer_debug_csv is not None:
-            self.optimizer_debug_csv.writerow(results, predicted_loads, now)
+        return self.optimizer(now, predicted_loads, parameters)
+
+    def run_triggered_optimizer(self, now, predicted_loads, parameters):
+        policy = self.trigger_policy
+        trigger = policy.check(now, predicted_loads, parameters)
+
+        if trigger is None:
+            _log.info("Keeping the last plan: " + str(now))
+            results = policy.planned(now)
+            results["Reoptimization Trigger"] = ""
+            if policy.track_penalty:
+                penalty = policy.add_penalty(self.optimizer, now, predicted_loads, parameters, results)
+                _log.info("Re-optimization penalty: {}, total: {}".format(penalty, policy.penalty))
+                results["Reoptimization Penalty"] = penalty
+        else:
+            _log.info("Running optimizer ({}): {}".format(trigger, now))
+            results = self.optimizer(now, predicted_loads, parameters)
+            policy.update(now, predicted_loads, parameters, results, trigger)
+            results["Reoptimization Trigger"] = trigger
+            results["Reoptimization Skip"] = ""
+            if policy.track_penalty:
+                results["Reoptimization Penalty"] = 0.0
 
         return results
 
@@ -157,11 +234,16 @@ class SystemModel(object):
 
         results = {}
         for component in self.instance_map.itervalues():
-            parameters = component.get_optimization_parameters()
+            parameters = component.get_cached_optimization_parameters()
             results.update(parameters)
 
         return results
 
+    def get_parameter_cache_stats(self):
+        """Optimization parameter cache hits and misses by component."""
+        return {name: (component.parameter_cache_hits, component.parameter_cache_misses)
+                for name, component in self.instance_map.iteritems()}
+
     def get_commands(self, component_loads):
         _log.debug("Gathering commands")
         result = {}
@@ -172,19 +254,39 @@ class SystemModel(object):
         return result
 
     def run(self, now, inputs):
+        timer = self.timer
+        timer.reset()
+
         self.update_components(now, inputs)
+        timer.lap("Update Components Time")
 
         if self.next_optimization is None:
             self.next_optimization = self.find_starting_datetime(now)
 
         commands = {}
         if (self.next_optimization <= now):
-            _log.info("Running optimizer: " + str(now))
             self.next_optimization = self.next_optimization + self.optimization_frequency
             forecasts = self.get_forecasts(now)
+            timer.lap("Forecast Time")
             parameters = self.get_parameters(now, inputs)
-            component_loads = self.run_general_optimizer(now, forecasts, parameters)
+            timer.lap("Parameters Time")
+            if self.trigger_policy is None:
+                _log.info("Running optimizer: " + str(now))
+                component_loads = self.run_general_optimizer(now, forecasts, parameters)
+            else:
+                component_loads = self.run_triggered_optimizer(now, forecasts, parameters)
+            timer.lap("Optimizer Time")
             commands = self.get_commands(component_loads)
+            timer.lap("Commands Time")
+
+            if self.timing:
+                for key in OPTIMIZER_TIMING_KEYS:
+                    if key in component_loads:
+                        timer.add(key, component_loads[key])
+                component_loads.update(timer.phases)
+
+            if self.optimizer_debug_csv is not None:
+                self.optimizer_debug_csv.writerow(component_loads, forecasts, now)
 
         return commands
 
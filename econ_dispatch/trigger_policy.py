@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+"""Event triggered re-optimization.
+
+Instead of solving at every optimization time the system model can keep
+the last plan and serve it, shifted by the hours elapsed, until the inputs
+drift too far from what the plan assumed."""
+
+import datetime
+from collections import Counter
+
+import numpy as np
+
+from econ_dispatch.utils import fingerprint
+
+import logging
+_log = logging.getLogger(__name__)
+
+# Largest change of a forecast value, relative to the peak the plan
+# assumed over the same hours, that the plan is kept for.
+DEFAULT_THRESHOLDS = {"elec_load": 0.1,
+                      "heat_load": 0.1,
+                      "cool_load": 0.1,
+                      "electricity_cost": 0.05,
+                      "natural_gas_cost": 0.05}
+
+# Solution sources of a plan worth keeping, fallback dispatches are not.
+# Only solver and heuristic results are cached.
+PLAN_SOURCES = ("solver", "incumbent", "heuristic", "cache")
+
+
+class TriggerPolicy(object):
+    """Decides at each optimization time whether to solve again or to keep
+    serving the last plan.
+
+    The plan is solved again when there is none yet, when it is max_plan_age
+    hours old or has run out of hourly records, when the component
+    parameters changed or when a value of the fresh forecast differs from
+    the plan's forecast for the same hour by more than its threshold.
+    The first hour of the fresh forecast reflects the realized inputs.
+
+    With track_penalty the system model also solves on skipped steps,
+    without acting on it, to measure what keeping the plan costs."""
+    def __init__(self, thresholds=None, max_plan_age=None, track_penalty=False,
+                 time_step=datetime.timedelta(hours=1)):
+        self.thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+        self.max_plan_age = max_plan_age
+        self.track_penalty = track_penalty
+        self.time_step = time_step
+
+        self.plan = None
+        self.plan_time = None
+        self.plan_forecasts = None
+        self.plan_parameters = None
+        self.skip_reason = None
+
+        self.solves = 0
+        self.skipped = 0
+        self.penalty = 0.0
+        self.triggers = Counter()
+
+    def _elapsed_steps(self, now):
+        try:
+            steps, remainder = divmod((now - self.plan_time).total_seconds(), self.time_step.total_seconds())
+        except (TypeError, AttributeError):
+            return None
+        if remainder or steps < 0:
+            return None
+        return int(steps)
+
+    def check(self, now, forecasts, parameters):
+        """Reason to solve again, or None to keep the plan."""
+        if self.plan is None:
+            return "no plan"
+
+        steps = self._elapsed_steps(now)
+        if steps is None:
+            return "time"
+        if self.max_plan_age is not None and steps >= self.max_plan_age:
+            return "plan age"
+
+        # Only hourly records can be shifted, aggregated ones cover several hours.
+        hourly = 0
+        for record in self.plan_forecasts:
+            if record.get("duration", 1) != 1:
+                break
+            hourly += 1
+        if steps >= hourly:
+            return "plan exhausted"
+
+        if fingerprint(parameters) != self.plan_parameters:
+            return "parameters"
+
+        planned = self.plan_forecasts[steps:hourly]
+        fresh = forecasts[:len(planned)]
+        largest = None
+        for name, threshold in sorted(self.thresholds.items()):
+            old = np.array([record.get(name, 0.0) for record in planned[:len(fresh)]], dtype=float)
+            new = np.array([record.get(name, 0.0) for record in fresh], dtype=float)
+            scale = max(np.abs(old).max(), np.finfo(float).eps) if len(old) else 1.0
+            drift = np.abs(new - old).max() / scale if len(old) else 0.0
+            if drift > threshold:
+                _log.debug("{} drifted by {:.3f} from the plan".format(name, drift))
+                return name
+            if largest is None or drift > largest[1]:
+                largest = name, drift
+
+        self.skip_reason = "plan {} h old".format(steps)
+        if largest is not None:
+            self.skip_reason += ", largest drift {} {:.3f}".format(*largest)
+        return None
+
+    def update(self, now, forecasts, parameters, result, trigger):
+        """Keep result as the plan if it is worth keeping."""
+        self.solves += 1
+        self.triggers[trigger] += 1
+        if result.get("Solution Source") in PLAN_SOURCES:
+            self.plan = result
+            self.plan_time = now
+            self.plan_forecasts = forecasts
+            self.plan_parameters = fingerprint(parameters)
+        else:
+            self.plan = None
+
+    def planned(self, now):
+        """The plan as seen from now, hour 0 is the current hour, with the
+        reason it was kept from the last check and zero solve times. The
+        objective value is blank, the one of the plan was for the horizon
+        of the solve."""
+        self.skipped += 1
+        result = self.plan.shift(self._elapsed_steps(now))
+        result.mark_reused("plan")
+        result["Objective Value"] = ""
+        result["Reoptimization Skip"] = self.skip_reason
+        return result
+
+    def add_penalty(self, optimize, now, forecasts, parameters, result):
+        """Cost of keeping result instead of solving again: the objective
+        with the first hour commitment of result held fixed, minus the
+        objective of a free solve. Returns None if it cannot be measured."""
+        commitment = result.commitment(0)
+        if not commitment:
+            return None
+        free = optimize(now, forecasts, parameters)
+        held = optimize(now, forecasts, parameters, fixed=commitment)
+        if free.get("Solution Source") not in PLAN_SOURCES or held.get("Solution Source") not in PLAN_SOURCES:
+            return None
+        penalty = held["Objective Value"] - free["Objective Value"]
+        self.penalty += penalty
+        return penalty
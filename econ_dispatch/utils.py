@@ -2,6 +2,12 @@ import numpy as np
 import random
 import csv
 import re
+import json
+import hashlib
+import itertools
+import numbers
+import time
+from collections import OrderedDict
 
 
 def least_squares_regression(inputs=None, output=None):
@@ -32,6 +38,145 @@ def natural_keys(text):
     '''
     return [ atoi(c) for c in re.split('(\d+)', text) ]
 
+def _plain(value):
+    if isinstance(value, dict):
+        return dict((str(k), _plain(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _plain(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def fingerprint(value):
+    """Stable hash of nested dicts/lists of numbers and strings, NumPy values included.
+    Used to detect when component parameters have changed."""
+    return hashlib.sha1(json.dumps(_plain(value), sort_keys=True).encode("utf-8")).hexdigest()
+
+def aggregate_forecasts(forecasts, blocks):
+    """Merge hourly forecast records into longer blocks further out in the horizon.
+
+    blocks is a list of [hours, block_length] pairs, e.g. [[24, 1], [48, 4]]
+    keeps the first 24 hours hourly and merges the next 48 into 4 hour
+    blocks. Hours past the listed ones use the last block length.
+
+    A merged record holds the duration weighted average of each numeric
+    value and its "duration" in hours, other values such as the time
+    column of a history model are those of the first hour of the block. Records that are not merged are returned as
+    they are, without a duration (i.e. one hour)."""
+    lengths = []
+    for hours, block_length in blocks:
+        while hours > 0:
+            lengths.append(min(block_length, hours))
+            hours -= lengths[-1]
+
+    results = []
+    start = 0
+    for i in itertools.count():
+        if start >= len(forecasts):
+            break
+        length = lengths[i] if i < len(lengths) else blocks[-1][1]
+        records = forecasts[start:start + length]
+        start += length
+
+        if len(records) == 1:
+            results.append(records[0])
+            continue
+
+        weights = [record.get("duration", 1) for record in records]
+        duration = float(sum(weights))
+        merged = {}
+        for name in records[0]:
+            if name == "duration":
+                continue
+            value = records[0][name]
+            if isinstance(value, numbers.Number) and not isinstance(value, bool):
+                value = sum(weight * record[name] for weight, record in zip(weights, records)) / duration
+            merged[name] = value
+        merged["duration"] = duration
+        results.append(merged)
+
+    return results
+
+class PhaseTimer(object):
+    """Wall clock time of the phases of a cycle, e.g. of SystemModel.run.
+
+    Call reset at the start of the cycle and lap(name) at the end of each
+    phase, phases holds the seconds per phase of the current cycle and
+    totals/counts add up over all cycles."""
+    def __init__(self):
+        self.phases = OrderedDict()
+        self.totals = OrderedDict()
+        self.counts = {}
+        self.last = time.time()
+
+    def reset(self):
+        self.phases = OrderedDict()
+        self.last = time.time()
+
+    def lap(self, name):
+        now = time.time()
+        self.add(name, now - self.last)
+        self.last = now
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def means(self):
+        return OrderedDict((name, total / self.counts[name]) for name, total in self.totals.items())
+
+class NullTimer(object):
+    """PhaseTimer that records nothing, for when timing is off."""
+    phases = totals = OrderedDict()
+
+    def reset(self):
+        pass
+
+    def lap(self, name):
+        pass
+
+    def add(self, name, seconds):
+        pass
+
+    def means(self):
+        return OrderedDict()
+
+# Phases timed in SystemModel.run and by the optimization function.
+SYSTEM_TIMING_KEYS = ["Update Components Time",
+                      "Forecast Time",
+                      "Parameters Time",
+                      "Optimizer Time",
+                      "Commands Time"]
+
+OPTIMIZER_TIMING_KEYS = ["Build Time",
+                         "LP Write Time",
+                         "Solve Time",
+                         "Extract Time",
+                         "Duals Time"]
+
+# Result entries that describe the optimization run rather than a variable.
+# These come first in the optimizer debug CSV, in this order.
+OPTIMIZATION_SUMMARY_KEYS = ["Optimization Status",
+                             "Objective Value",
+                             "Convergence Time",
+                             "Solution Source",
+                             "Node Count",
+                             "Solution Cache Hit",
+                             "Warm Start",
+                             "Warm Start Hit Rate",
+                             "Presolve Fixed Variables",
+                             "Presolve Inactive Constraints",
+                             "Scenario Count",
+                             "Scenario Agreement",
+                             "Candidate Commitments",
+                             "Expected Objective Value",
+                             "Reoptimization Trigger",
+                             "Reoptimization Skip",
+                             "Reoptimization Penalty"] + SYSTEM_TIMING_KEYS + OPTIMIZER_TIMING_KEYS
+
 class OptimizerCSVOutput(object):
     def __init__(self, file_name):
         self.file_name = file_name
@@ -51,15 +196,13 @@ class OptimizerCSVOutput(object):
                                    })
 
         if self.csv_file is None:
-            optimization_keys = optimization.keys()
-            optimization_keys.remove("Optimization Status")
-            optimization_keys.remove("Convergence Time")
-            optimization_keys.remove("Objective Value")
+            summary_keys = [key for key in OPTIMIZATION_SUMMARY_KEYS if key in optimization]
+            optimization_keys = [key for key in optimization.keys() if key not in summary_keys]
             optimization_keys.sort(key=natural_keys)
             forecast_keys = flat_forecasts.keys()
             forecast_keys.sort(key=natural_keys)
             self.csv_file = csv.DictWriter(self.file,
-                                           ["timestamp", "Optimization Status", "Objective Value", "Convergence Time"] +
+                                           ["timestamp"] + summary_keys +
                                            optimization_keys + forecast_keys, extrasaction='ignore')
             self.csv_file.writeheader()
 
@@ -156,6 +156,29 @@ def main(config_file, start, end,
             _log.info("Application Run Standard Deviation: " + str(std))
             _log.info("Application Run Max: " + str(max_time))
 
+        for phase, mean_time in application.model.timer.means().items():
+            _log.info("{} Average: {}".format(phase, mean_time))
+
+        trigger_policy = application.model.trigger_policy
+        if trigger_policy is not None:
+            _log.info("Optimizer Solves: " + str(trigger_policy.solves))
+            _log.info("Optimizer Solves Skipped: " + str(trigger_policy.skipped))
+            _log.info("Optimizer Solve Triggers: " + str(dict(trigger_policy.triggers)))
+            if trigger_policy.track_penalty:
+                _log.info("Re-optimization Penalty: " + str(trigger_policy.penalty))
+
+        for name, (hits, misses) in sorted(application.model.get_parameter_cache_stats().items()):
+            _log.info("{} Parameter Cache Hits: {}, Misses: {}".format(name, hits, misses))
+
+        cache = getattr(application.model.optimizer, "cache", None)
+        if cache is not None:
+            _log.info("Solution Cache Hits: " + str(cache.hits))
+            _log.info("Solution Cache Misses: " + str(cache.misses))
+
+        close_optimizer = getattr(application.model.optimizer, "close", None)
+        if close_optimizer is not None:
+            close_optimizer()
+
         if output_csv_file is not None:
             if results:
                 topics = set()
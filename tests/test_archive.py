@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import os
+import json
+import shutil
+import datetime
+import tempfile
+
+import numpy as np
+import pulp
+import pytest
+
+from econ_dispatch.optimizer.archive import LPArchive, LPArchiveReader, INDEX_FILE
+from econ_dispatch.optimizer.matrix import MatrixProblem
+from econ_dispatch.optimizer.solvers import get_solver
+from econ_dispatch.optimizer.use_case_1 import get_optimization_matrix, get_optimization_problem
+from tests.common import get_parameters, synthetic_forecast
+
+START = datetime.datetime(2017, 7, 1, 23)
+
+
+@pytest.fixture
+def directory():
+    directory = tempfile.mkdtemp()
+    yield directory
+    shutil.rmtree(directory)
+
+
+def pulp_problem():
+    prob = pulp.LpProblem("small", pulp.LpMinimize)
+    x = pulp.LpVariable("x", 0, 3)
+    prob += x
+    prob += x >= 1, "low"
+    return prob
+
+
+def test_round_trip(directory):
+    problems = [get_optimization_matrix(synthetic_forecast(4, seed), get_parameters()) for seed in range(2)]
+    archive = LPArchive(directory)
+    archive.put(START, problems[0])
+    archive.put(START + datetime.timedelta(hours=1), problems[1])
+    archive.put(START + datetime.timedelta(hours=2), pulp_problem())
+    archive.close()
+
+    assert sorted(os.listdir(directory)) == ["2017-07-01.gz", "2017-07-02.gz", INDEX_FILE]
+    reader = LPArchiveReader(directory)
+    assert reader.timestamps == [str(START + datetime.timedelta(hours=hour)) for hour in range(3)]
+
+    for hour, problem in enumerate(problems):
+        loaded = reader.load(START + datetime.timedelta(hours=hour))
+        assert isinstance(loaded, MatrixProblem)
+        assert loaded.var_names == problem.var_names
+        assert loaded.row_names == problem.row_names
+        for name in ("c", "lb", "ub", "b", "sense", "integrality"):
+            assert np.array_equal(getattr(loaded, name), getattr(problem, name)), name
+
+    loaded = reader.load(str(START + datetime.timedelta(hours=2)))
+    assert isinstance(loaded, MatrixProblem)
+    assert loaded.var_names == ["x"] and loaded.row_names == ["low"]
+    assert loaded.lb.tolist() == [0.0] and loaded.ub.tolist() == [3.0]
+
+
+def test_pulp_problem_is_archived_as_arrays(directory):
+    """The solve result of the archived PuLP problem is that of the original."""
+    prob = get_optimization_problem(synthetic_forecast(4), get_parameters())
+    solver = get_solver("cbc")
+    archive = LPArchive(directory)
+    archive.put(START, prob)
+    archive.close()
+    loaded = LPArchiveReader(directory).load(START)
+    assert sorted(loaded.var_names) == sorted(var.name for var in prob.variables())
+    assert loaded.integrality.sum() == sum(var.cat == pulp.LpInteger for var in prob.variables())
+    assert solver.solve(loaded).objective_value == \
+        pytest.approx(solver.solve_pulp(prob).objective_value, rel=1e-9)
+
+
+def test_pickled_pulp_records_are_read(directory):
+    """Archives written before problems were stored as arrays."""
+    archive = LPArchive(directory)
+    archive._write(START, ("pulp", pulp_problem()))
+    archive.close()
+    loaded = LPArchiveReader(directory).load(START)
+    assert isinstance(loaded, pulp.LpProblem)
+    assert list(loaded.constraints) == ["low"]
+
+
+def test_archived_problem_is_a_copy(directory):
+    """The template is updated in place by the next run after put."""
+    problem = get_optimization_matrix(synthetic_forecast(4), get_parameters())
+    b = problem.b.copy()
+    archive = LPArchive(directory)
+    archive.put(START, problem)
+    problem.set_rhs(np.arange(problem.num_rows), 0.0)
+    archive.close()
+    assert np.array_equal(LPArchiveReader(directory).load(START).b, b)
+
+
+def test_replay(directory):
+    problem = get_optimization_matrix(synthetic_forecast(4), get_parameters())
+    solver = get_solver("cbc")
+    archive = LPArchive(directory)
+    archive.put(START, problem)
+    archive.close()
+    solution = LPArchiveReader(directory).replay(START, solver)
+    assert solution.objective_value == pytest.approx(solver.solve(problem).objective_value)
+
+
+def test_truncated_record_is_rejected(directory):
+    archive = LPArchive(directory)
+    archive.put(START, pulp_problem())
+    archive.close()
+    data_file = os.path.join(directory, "2017-07-01.gz")
+    with open(data_file, "r+b") as f:
+        f.truncate(os.path.getsize(data_file) - 1)
+    with pytest.raises(ValueError):
+        LPArchiveReader(directory).load(START)
+
+
+def test_damaged_index_row_is_skipped(directory):
+    archive = LPArchive(directory)
+    archive.put(START, pulp_problem())
+    archive.close()
+    with open(os.path.join(directory, INDEX_FILE), "ab") as f:
+        f.write(json.dumps({"timestamp": "2017-07-02"})[:10].encode("utf-8"))
+    assert LPArchiveReader(directory).timestamps == [str(START)]
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import os
+import shutil
+import datetime
+import tempfile
+
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.optimizer.cache import SolutionCache, CachedOptimizer
+from econ_dispatch.optimizer.result import OptimizationResult
+from tests.common import get_parameters, synthetic_forecast
+
+FORECAST = [{"elec_load": 500.0, "heat_load": 1.0}, {"elec_load": 600.0, "heat_load": 1.5}]
+PARAMETERS = {"cap_boiler": 8.0, "xmax_boiler": [1.0, 2.0]}
+
+
+def changed(forecast, hour, name, value):
+    forecast = [dict(record) for record in forecast]
+    forecast[hour][name] = value
+    return forecast
+
+
+def test_key_depends_on_inputs():
+    cache = SolutionCache()
+    key = cache.key(FORECAST, PARAMETERS)
+    assert key == cache.key([dict(record) for record in FORECAST], dict(PARAMETERS))
+    assert key != cache.key(changed(FORECAST, 1, "elec_load", 600.001), PARAMETERS)
+    assert key != cache.key(FORECAST[:1], PARAMETERS)
+    assert key != cache.key(FORECAST, dict(PARAMETERS, cap_boiler=9.0))
+    assert key != SolutionCache(namespace="other").key(FORECAST, PARAMETERS)
+
+
+def test_key_ignores_other_values():
+    """History forecast models return the time and weather of the row."""
+    cache = SolutionCache()
+    key = cache.key(FORECAST, PARAMETERS)
+    history = [dict(record, timestamp=datetime.datetime(2017, 7, 1, hour), tempm=20.0 + hour)
+               for hour, record in enumerate(FORECAST)]
+    assert cache.key(history, PARAMETERS) == key
+    history[0]["timestamp"] = datetime.datetime(2018, 7, 1)
+    assert cache.key(history, PARAMETERS) == key
+    assert cache.key(changed(history, 0, "duration", 2.0), PARAMETERS) != key
+
+
+def test_key_tolerance():
+    cache = SolutionCache(tolerance={"elec_load": 10.0})
+    key = cache.key(FORECAST, PARAMETERS)
+    assert key == cache.key(changed(FORECAST, 0, "elec_load", 503.0), PARAMETERS)
+    assert key != cache.key(changed(FORECAST, 0, "elec_load", 510.0), PARAMETERS)
+    # Names without a tolerance are compared exactly.
+    assert key != cache.key(changed(FORECAST, 0, "heat_load", 1.001), PARAMETERS)
+
+    cache = SolutionCache(tolerance=0.5)
+    assert cache.key(FORECAST, PARAMETERS) == cache.key(changed(FORECAST, 1, "heat_load", 1.6), PARAMETERS)
+
+
+def make_result(value):
+    result = OptimizationResult.from_dict({"Q_boiler_hour00": value})
+    result["Optimization Status"] = "Optimal"
+    result["Solution Source"] = "solver"
+    result["Convergence Time"] = 1.5
+    return result
+
+
+def test_least_recently_used_is_dropped():
+    cache = SolutionCache(size=2)
+    for key in ("a", "b"):
+        cache.put(key, make_result(1.0))
+    cache.get("a")
+    cache.put("c", make_result(2.0))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_get_returns_a_copy():
+    cache = SolutionCache()
+    cache.put("a", make_result(1.0))
+    result = cache.get("a")
+    result["Q_boiler_hour00"] = 5.0
+    result["Solution Source"] = "cache"
+    assert cache.get("a")["Q_boiler_hour00"] == 1.0
+    assert cache.get("a")["Solution Source"] == "solver"
+
+
+def test_save_and_load():
+    directory = tempfile.mkdtemp()
+    try:
+        file_name = os.path.join(directory, "cache.pickle")
+        cache = SolutionCache(file_name=file_name)
+        cache.put("a", make_result(1.0))
+        cache.save()
+        assert SolutionCache(file_name=file_name).get("a")["Q_boiler_hour00"] == 1.0
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_cached_optimizer_hits_and_misses():
+    calls = []
+
+    def optimize(now, forecast, parameters={}, fixed=None):
+        calls.append(fixed)
+        return make_result(float(len(calls)))
+
+    cached = CachedOptimizer(optimize, SolutionCache())
+    first = cached(None, FORECAST, PARAMETERS)
+    second = cached(None, FORECAST, PARAMETERS)
+    other = cached(None, changed(FORECAST, 0, "heat_load", 2.0), PARAMETERS)
+    held = cached(None, FORECAST, PARAMETERS, fixed={"Sboiler_hour00": 1})
+
+    assert len(calls) == 3 and calls[-1] == {"Sboiler_hour00": 1}
+    assert not first["Solution Cache Hit"] and first["Solution Source"] == "solver"
+    assert second["Solution Cache Hit"] and second["Solution Source"] == "cache"
+    assert second["Convergence Time"] == 0.0
+    assert second["Q_boiler_hour00"] == first["Q_boiler_hour00"]
+    assert not other["Solution Cache Hit"]
+    assert "Solution Cache Hit" not in held
+
+
+def test_cached_use_case_1():
+    forecast = synthetic_forecast(6)
+    parameters = get_parameters()
+    optimize = get_optimization_function({"name": "use_case_1", "solver": "cbc", "solution_cache": True})
+    solved = optimize(None, forecast, parameters)
+    cached = optimize(None, forecast, parameters)
+    assert cached["Solution Source"] == "cache"
+    assert cached["Objective Value"] == solved["Objective Value"]
+    assert optimize.cache.hits == 1
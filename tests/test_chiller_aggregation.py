@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import pytest
+
+from econ_dispatch.component_models import get_component_class
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.optimizer.use_case_1 import get_optimization_matrix
+from tests.common import get_parameters, synthetic_forecast
+
+TRAINING_DATA = "./component_example_training_data/CH-Cent-IGV-Historical-Data.json"
+
+
+def aggregated_parameters(chiller_count):
+    return dict(get_parameters(chiller_count), chiller_aggregate=True)
+
+
+def solve(forecast, parameters, builder="matrix"):
+    return get_optimization_function({"name": "use_case_1", "solver": "cbc", "builder": builder})(
+        None, forecast, parameters)
+
+
+def test_one_integer_per_hour():
+    problem = get_optimization_matrix(synthetic_forecast(4), aggregated_parameters(3))
+    chiller_names = [name for name in problem.var_names if name.startswith(("Nchiller", "Schiller"))]
+    assert chiller_names == ["Nchiller_hour{:02d}".format(hour) for hour in range(4)]
+    index = problem.var_names.index("Nchiller_hour00")
+    assert problem.integrality[index] and problem.ub[index] == 3
+
+
+def test_single_chiller_is_unchanged():
+    """Without the symmetry breaking slope offsets there is nothing to lose with one chiller."""
+    forecast = synthetic_forecast(12, 1)
+    single = solve(forecast, get_parameters(1))
+    aggregated = solve(forecast, aggregated_parameters(1))
+    assert aggregated["Objective Value"] == pytest.approx(single["Objective Value"], rel=1e-9)
+
+
+@pytest.mark.parametrize("chiller_count", [2, 4])
+def test_aggregated_objective(chiller_count):
+    """The per-chiller model makes every further chiller slightly less efficient."""
+    forecast = synthetic_forecast(12, 2)
+    for record in forecast:
+        record["cool_load"] *= 3
+    separate = solve(forecast, get_parameters(chiller_count))
+    aggregated = solve(forecast, aggregated_parameters(chiller_count))
+    assert aggregated["Optimization Status"] == "Optimal"
+    assert aggregated["Objective Value"] <= separate["Objective Value"] * (1 + 1e-9)
+    assert aggregated["Objective Value"] == pytest.approx(separate["Objective Value"], rel=1e-2)
+    assert 0 <= aggregated["Nchiller_hour00"] <= chiller_count
+
+
+def test_pulp_builder_is_rejected():
+    with pytest.raises(RuntimeError):
+        solve(synthetic_forecast(4), aggregated_parameters(3), builder="pulp")
+
+
+@pytest.mark.parametrize("aggregate, loads, commands", [
+    (True, {"Nchiller_hour00": 2.0}, [True, True, False]),
+    (True, {"Nchiller_hour00": 0.0}, [False, False, False]),
+    (False, {"E_chillerelec0_hour00": 0.0, "E_chillerelec1_hour00": 5.0, "E_chillerelec2_hour00": 0.0},
+     [False, True, False]),
+])
+def test_commands(aggregate, loads, commands):
+    chiller = get_component_class("centrifugal_chiller_igv")(name="chiller", training_data_file=TRAINING_DATA,
+                                                            count=3, aggregate=aggregate)
+    points = chiller.get_commands(loads)["chiller"]
+    assert [points["chiller{}_on".format(i)] for i in range(3)] == commands
+    assert chiller.get_optimization_parameters()["chiller_aggregate"] == aggregate
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import os
+
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.optimizer.use_case_1 import get_optimization_matrix
+from tests.common import get_parameters, synthetic_forecast
+
+
+def test_pulp_names():
+    problem = get_optimization_matrix(synthetic_forecast(3), get_parameters())
+    assert problem.pulp_var_names() == problem.var_names
+    assert problem.pulp_row_names() == problem.row_names
+
+    problem.compact_names = True
+    assert problem.pulp_var_names() == ["x{}".format(j) for j in range(problem.num_vars)]
+    assert problem.pulp_row_names() == ["c{}".format(i) for i in range(problem.num_rows)]
+
+    prob = problem.to_pulp()
+    assert sorted(var.name for var in prob.variables()) == sorted(problem.pulp_var_names())
+    assert sorted(prob.constraints) == sorted(problem.pulp_row_names())
+
+
+def test_names_file_translates_the_lp_file(tmpdir):
+    """Reading the .names file back gives the full name of every variable
+    and constraint in the LP file."""
+    problem = get_optimization_matrix(synthetic_forecast(3), get_parameters())
+    problem.compact_names = True
+    lp_file = str(tmpdir.join("problem.lp"))
+    problem.pulp_problem().writeLP(lp_file)
+    problem.write_names(lp_file + ".names")
+
+    with open(lp_file + ".names") as f:
+        names = dict(line.split() for line in f)
+    assert len(names) == problem.num_vars + problem.num_rows
+    assert [names[name] for name in problem.pulp_var_names()] == problem.var_names
+    assert [names[name] for name in problem.pulp_row_names()] == problem.row_names
+
+    with open(lp_file) as f:
+        text = f.read()
+    assert "x0" in text and "c0:" in text
+    assert problem.var_names[0] not in text
+
+
+def test_results_keep_the_full_names(tmpdir):
+    forecast = synthetic_forecast(6)
+    parameters = get_parameters()
+    config = {"name": "use_case_1", "solver": "cbc", "write_lp": True, "lp_out_dir": str(tmpdir)}
+    full = get_optimization_function(config)(None, forecast, parameters)
+    compact = get_optimization_function(dict(config, compact_names=True))(None, forecast, parameters)
+
+    assert compact.layout.names == full.layout.names
+    assert compact["Objective Value"] == full["Objective Value"]
+    assert os.path.exists(str(tmpdir.join("None.lp.names")))
+
+
+def test_compact_names_require_the_matrix_builder():
+    with pytest.raises(ValueError):
+        get_optimization_function({"name": "use_case_1", "builder": "pulp", "compact_names": True})
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import os
+import subprocess
+import sys
+
+from econ_dispatch import component_models
+from econ_dispatch.component_models import ComponentBase, get_component_class
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOOKUP = """
+import sys
+from econ_dispatch.component_models import get_component_class, _componentList
+assert not [name for name in _componentList if "econ_dispatch.component_models." + name in sys.modules]
+get_component_class("boiler")
+print(" ".join(sorted(name for name in _componentList if "econ_dispatch.component_models." + name in sys.modules)))
+"""
+
+
+def test_only_the_requested_module_is_imported():
+    """Run in a fresh interpreter, other tests import component modules."""
+    output = subprocess.check_output([sys.executable, "-c", LOOKUP], cwd=ROOT)
+    assert output.decode().split() == ["boiler"]
+
+
+def test_class_is_imported_once(monkeypatch):
+    monkeypatch.setattr(component_models, "_componentDict", {})
+    klass = get_component_class("static_boiler")
+    assert issubclass(klass, ComponentBase)
+    assert component_models._componentDict == {"static_boiler": klass}
+    assert get_component_class("static_boiler") is klass
+
+
+def test_unknown_component():
+    assert get_component_class("no_such_component") is None
+    assert "no_such_component" not in component_models._componentDict
+
+
+def test_module_that_fails_to_import(monkeypatch):
+    monkeypatch.setattr(component_models, "_componentList", component_models._componentList + ["missing_module"])
+    monkeypatch.setattr(component_models, "_componentDict", {})
+    assert get_component_class("missing_module") is None
+    assert component_models._componentDict == {"missing_module": None}
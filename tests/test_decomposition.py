@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import numpy as np
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.optimizer.matrix import MatrixProblem, GE, LE
+from econ_dispatch.optimizer.decomposition import get_pool, close_pool, split_problem, solve_decomposed
+from econ_dispatch.optimizer.solvers import get_solver
+from econ_dispatch.optimizer.use_case_1 import get_optimization_matrix
+from tests.common import get_parameters, synthetic_forecast
+
+
+def chain_problem():
+    """x0 + x1 >= 1 and x1 + x2 >= 2 share x1, x3 >= 3 stands alone and x4
+    is in no constraint."""
+    problem = MatrixProblem("chain")
+    x = problem.add_variables(["x0", "x1", "x2", "x3", "x4"], 0.0, 10.0)
+    problem.add_cost(x, [1.0, 3.0, 1.0, 1.0, 1.0])
+    problem.add_constraints(["a", "b"], [(1.0, x[[0, 1]]), (1.0, x[[1, 2]])], GE, [1.0, 2.0])
+    problem.add_constraints(["c"], [(1.0, x[[3]])], GE, 3.0)
+    problem.add_constraints(["d"], [(1.0, x[[3]])], LE, 5.0)
+    return problem
+
+
+def test_find_blocks():
+    blocks = chain_problem().find_blocks()
+    assert [(sorted(var_index.tolist()), sorted(row_index.tolist())) for var_index, row_index in blocks] == \
+        [([0, 1, 2, 4], [0, 1]), ([3], [2, 3])]
+
+
+def test_find_blocks_without_constraints():
+    problem = MatrixProblem()
+    problem.add_variables(["x", "y"])
+    [(var_index, row_index)] = problem.find_blocks()
+    assert var_index.tolist() == [0, 1]
+    assert row_index.tolist() == []
+
+
+def test_use_case_1_splits_by_hour():
+    problem = get_optimization_matrix(synthetic_forecast(4), get_parameters())
+    blocks = split_problem(problem)
+    assert len(blocks) == 4
+    for var_index, sub_problem in blocks:
+        hours = set(problem.var_names[j].split("_hour")[1][:2] for j in var_index if "_hour" in problem.var_names[j])
+        assert len(hours) == 1
+        assert sub_problem.num_vars == len(var_index)
+
+
+@pytest.mark.parametrize("pool_type", ["thread", "process"])
+def test_solve_decomposed_matches_solve(pool_type):
+    problem = get_optimization_matrix(synthetic_forecast(6), get_parameters())
+    solver = get_solver("cbc")
+    pool = get_pool(pool_type, 2)
+    try:
+        decomposed = solve_decomposed(problem, split_problem(problem), pool, solver)
+    finally:
+        close_pool(pool)
+    whole = solver.solve(problem)
+
+    assert decomposed.status == whole.status == "Optimal"
+    assert decomposed.objective_value == pytest.approx(whole.objective_value, rel=1e-9)
+    assert problem.is_feasible(decomposed.x)
+
+
+def test_time_limit_is_shared():
+    """A budget used up before a sub-problem starts leaves it unsolved."""
+    problem = get_optimization_matrix(synthetic_forecast(4), get_parameters())
+    pool = get_pool("thread", 1)
+    try:
+        solution = solve_decomposed(problem, split_problem(problem), pool, get_solver("cbc", time_limit=1e-9))
+        assert solution.status == "Not Solved"
+        assert solution.objective_value is None and solution.solution_time is None
+
+        solution = solve_decomposed(problem, split_problem(problem), pool, get_solver("cbc", time_limit=60))
+        assert solution.status == "Optimal"
+        assert solution.solution_time < 60
+    finally:
+        close_pool(pool)
+
+
+def test_with_time_limit():
+    solver = get_solver("cbc", time_limit=60, mip_gap=0.01)
+    limited = solver.with_time_limit(5.0)
+    assert limited.time_limit == 5.0 and solver.time_limit == 60
+    assert limited.get_pulp_solver().maxSeconds == 5.0
+    assert solver.get_pulp_solver().maxSeconds == 60
+    assert limited.get_pulp_solver().fracGap == 0.01
+
+
+def test_decomposed_optimizer_matches():
+    forecast = synthetic_forecast(6)
+    parameters = get_parameters()
+    config = {"name": "use_case_1", "solver": "cbc"}
+    whole = get_optimization_function(config)(None, forecast, parameters)
+    decomposed = get_optimization_function(dict(config, decompose="thread", decompose_workers=3))(None, forecast,
+                                                                                                  parameters)
+    assert decomposed["Objective Value"] == pytest.approx(whole["Objective Value"], rel=1e-9)
+
+
+def test_unknown_pool_type():
+    with pytest.raises(ValueError):
+        get_pool("fiber")
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from econ_dispatch.forecast_models import get_forecast_model_class
+
+START = datetime.datetime(2012, 7, 1, 20)
+
+
+def horizon(hours=30, start=START, step=datetime.timedelta(hours=1), seed=0):
+    timestamps = [start + i * step for i in range(hours)]
+    rng = np.random.RandomState(seed)
+    weather_frame = pd.DataFrame({"tempm": rng.uniform(15.0, 30.0, hours),
+                                  "hum": rng.uniform(30.0, 90.0, hours)})
+    return timestamps, weather_frame
+
+
+def hour_by_hour(model, timestamps, weather_frame):
+    """What the default ForecastModelBase.derive_horizon returns."""
+    records = [model.derive_variables(timestamp, values)
+               for timestamp, values in zip(timestamps, weather_frame.to_dict("records"))]
+    return pd.DataFrame(records, index=range(len(records)))
+
+
+def assert_same(model, timestamps, weather_frame):
+    expected = hour_by_hour(model, timestamps, weather_frame)
+    derived = model.derive_horizon(timestamps, weather_frame)
+    assert list(derived.index) == list(expected.index)
+    assert sorted(derived.columns) == sorted(expected.columns)
+    for column in expected.columns:
+        if expected[column].dtype.kind in "fi":
+            assert np.allclose(derived[column].values.astype(float), expected[column].values.astype(float),
+                               rtol=1e-9, equal_nan=True), column
+        else:
+            assert list(derived[column]) == list(expected[column]), column
+
+
+@pytest.fixture(scope="module")
+def building_history():
+    return get_forecast_model_class("building_load", "history", history_data_file="hospital_data_no_leap_day.csv")
+
+
+@pytest.mark.parametrize("step", [datetime.timedelta(hours=1), datetime.timedelta(minutes=30),
+                                  datetime.timedelta(minutes=20)])
+def test_history(building_history, step):
+    """Includes times between rows to check the nearest hour lookup."""
+    assert_same(building_history, *horizon(step=step))
+
+
+def test_history_other_year(building_history):
+    """Forecast years are mapped to the year of the history."""
+    timestamps, weather_frame = horizon(start=START.replace(year=2017))
+    assert_same(building_history, timestamps, weather_frame)
+
+
+def test_history_ends(building_history):
+    """Times before the first and after the last row."""
+    times = building_history.historical_data[building_history.time_column]
+    timestamps = [times.min() - datetime.timedelta(minutes=10), times.max() + datetime.timedelta(minutes=10)]
+    assert_same(building_history, [t.to_pydatetime() for t in timestamps], horizon(2)[1])
+
+
+def test_solar_history():
+    model = get_forecast_model_class("solar_pv", "history", history_data_file="SolarPV-Historical.csv")
+    assert_same(model, *horizon(step=datetime.timedelta(minutes=45)))
+
+
+@pytest.mark.parametrize("name,type,settings", [("electricity_cost", "static", {"cost": 0.1}),
+                                                ("natural_gas_cost", "static", {"cost": 7.614}),
+                                                ("solar_pv", "zero", {})])
+def test_constant(name, type, settings):
+    assert_same(get_forecast_model_class(name, type, **settings), *horizon())
+
+
+@pytest.fixture(scope="module")
+def dependent_variable_model():
+    return get_forecast_model_class("building_load", "dependent_variable_model",
+                                    training_csv="Hospital Modeled Data2.csv",
+                                    dependent_variables=["elec_load", "heat_load", "cool_load"])
+
+
+@pytest.mark.parametrize("tolerances", [{}, {"tempm": 1.2}, {"tempm": 5.0}])
+def test_dependent_variable_model(dependent_variable_model, tolerances):
+    dependent_variable_model.independent_variable_tolerances = tolerances
+    assert_same(dependent_variable_model, *horizon())
+
+
+def test_dependent_variable_model_no_training_rows(dependent_variable_model):
+    """Hours without a training row within the tolerance are NaN either way."""
+    dependent_variable_model.independent_variable_tolerances = {"tempm": 0.01}
+    timestamps, weather_frame = horizon()
+    assert dependent_variable_model.derive_horizon(timestamps, weather_frame).isnull().values.any()
+    assert_same(dependent_variable_model, timestamps, weather_frame)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.optimizer.result import ResultLayout
+from econ_dispatch.optimizer.solvers import get_solver
+from econ_dispatch.optimizer.use_case_1 import get_optimization_matrix
+from tests.common import get_parameters, synthetic_forecast
+
+
+def optimize(forecast, **config):
+    return get_optimization_function(dict({"name": "use_case_1", "solver": "cbc", "duals": True}, **config))(
+        None, forecast, get_parameters())
+
+
+@pytest.mark.parametrize("builder", ["matrix", "pulp"])
+def test_electricity_dual_is_the_grid_price(builder):
+    """The grid is always available, so another kWh costs the grid price
+    (electricity_cost 0.1 as in example.config)."""
+    forecast = synthetic_forecast(6)
+    forecast[2]["electricity_cost"] = 0.13
+    result = optimize(forecast, builder=builder)
+    prices = [record["electricity_cost"] for record in forecast]
+    assert [result["ElecBalance{:02d}".format(hour)] for hour in range(6)] == pytest.approx(prices)
+    for hour in range(6):
+        assert result["HeatBalance{:02d}".format(hour)] is not None
+        assert result["CoolBalance{:02d}".format(hour)] is not None
+
+
+def test_aggregated_period_dual():
+    """Per unit of the average load of a period, so duration times the price."""
+    result = optimize(synthetic_forecast(6), horizon_aggregation=[[2, 1], [4, 4]])
+    assert result["ElecBalance00"] == pytest.approx(0.1)
+    assert result["ElecBalance02"] == pytest.approx(0.4)
+
+
+def test_dual_is_the_marginal_cost():
+    """With the commitment held, one more unit of heat load costs the dual."""
+    forecast = synthetic_forecast(6)
+    problem = get_optimization_matrix(forecast, get_parameters())
+    layout = ResultLayout(problem.var_names, problem.integrality)
+    solver = get_solver("cbc")
+    solution = solver.solve(problem)
+    fixed = dict((j, round(solution.x[j])) for j in layout.integer.nonzero()[0])
+    row = problem.row_names.index("HeatBalance00")
+    dual = solver.solve_duals(problem, fixed, [row])[0]
+
+    def fixed_cost(heat_load):
+        forecast[0]["heat_load"] = heat_load
+        problem = get_optimization_matrix(forecast, get_parameters())
+        lb, ub = problem.lb.copy(), problem.ub.copy()
+        for j, value in fixed.items():
+            lb[j] = ub[j] = value
+        problem.set_bounds(lb, ub)
+        return solver.solve(problem).objective_value
+
+    base = forecast[0]["heat_load"]
+    assert fixed_cost(base + 0.01) - fixed_cost(base) == pytest.approx(0.01 * dual, rel=1e-4)
+
+
+def test_commitment_is_restored():
+    """The duals LP fixes the integer variables of the built model in place."""
+    problem = get_optimization_matrix(synthetic_forecast(4), get_parameters())
+    prob = problem.pulp_problem()
+    before = [(var.name, var.lowBound, var.upBound, var.cat) for var in prob.variables()]
+    solver = get_solver("cbc")
+    solution = solver.solve(problem)
+    layout = ResultLayout(problem.var_names, problem.integrality)
+    solver.solve_duals(problem, dict((j, round(solution.x[j])) for j in layout.integer.nonzero()[0]), [0])
+    assert [(var.name, var.lowBound, var.upBound, var.cat) for var in problem.pulp_problem().variables()] == before
+
+
+def test_glpk_has_no_duals():
+    """PuLP does not read the duals back from glpsol."""
+    assert not get_solver("glpk").supports_duals
+    assert get_solver("cbc").supports_duals
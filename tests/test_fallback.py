@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import numpy as np
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.optimizer.matrix import MatrixProblem, GE
+from econ_dispatch.optimizer.solvers import get_solver
+from tests.common import get_parameters, synthetic_forecast
+
+
+def test_is_feasible():
+    problem = MatrixProblem()
+    x = problem.add_variables(["x", "y"], 0.0, 4.0)
+    n = problem.add_binaries(["n"])
+    problem.add_constraints(["c"], [(1.0, x[[0]]), (1.0, x[[1]]), (-2.0, n)], GE, 1.0)
+
+    assert problem.is_feasible([1.0, 2.0, 1.0])
+    assert problem.is_feasible([1.0, 0.0, 0.0])
+    assert not problem.is_feasible([0.5, 0.0, 0.0])
+    assert not problem.is_feasible([1.0, 2.0, 0.5])
+    assert not problem.is_feasible([5.0, 0.0, 0.0])
+    assert not problem.is_feasible([1.0, np.nan, 0.0])
+    assert not problem.is_feasible([1.0, 0.0])
+
+
+def test_solver_limits():
+    cbc = get_solver("cbc", time_limit=5, mip_gap=0.01)
+    assert cbc.get_pulp_solver().maxSeconds == 5
+    assert cbc.get_pulp_solver().fracGap == 0.01
+
+    glpk = get_solver("glpk", options=["--nopresol"], time_limit=2.5, mip_gap=0.02)
+    assert glpk.get_pulp_solver().options == ["--nopresol", "--tmlim", "3", "--mipgap", "0.02"]
+
+
+@pytest.mark.parametrize("builder", ["matrix", "pulp"])
+def test_fallback_dispatch_when_infeasible(builder):
+    forecast = synthetic_forecast(24, 0)
+    parameters = get_parameters()
+    optimize = get_optimization_function({"name": "use_case_1", "solver": "cbc", "builder": builder})
+    free = optimize(None, forecast, parameters)
+    # Every first hour unit switched the other way cannot meet the loads.
+    flipped = dict((name, 1 - value) for name, value in free.commitment(0).items())
+    result = optimize(None, forecast, parameters, fixed=flipped)
+
+    assert result["Optimization Status"] == "Infeasible"
+    assert result["Solution Source"] == "fallback"
+    assert result["Objective Value"] > 0
+    assert not any(result[name] is None for name in result.layout.names)
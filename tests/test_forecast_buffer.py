@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import copy
+import datetime
+
+import pytest
+
+from econ_dispatch.system_model import SystemModel
+from econ_dispatch.forecast_models import get_forecast_model_class
+from econ_dispatch.forecast_models.electricity_cost.static import Model as StaticCostModel
+from econ_dispatch.weather.history import Weather
+
+NOW = datetime.datetime(2017, 7, 1, 12)
+HOUR = datetime.timedelta(hours=1)
+
+
+class CountingModel(StaticCostModel):
+    """The static cost model recording the hours it derived."""
+    def __init__(self, **kwargs):
+        super(CountingModel, self).__init__(**kwargs)
+        self.derived = []
+
+    def derive_horizon(self, timestamps, weather_frame):
+        self.derived.append(list(timestamps))
+        return super(CountingModel, self).derive_horizon(timestamps, weather_frame)
+
+
+@pytest.fixture(scope="module")
+def history():
+    """Parsing the history files is slow, tests get copies."""
+    return (Weather(hours_forecast=6, history_data_file="USA_IL_Chicago-OHare.csv"),
+            get_forecast_model_class("building_load", "history", history_data_file="hospital_data_no_leap_day.csv"))
+
+
+@pytest.fixture
+def get_system(history):
+    def get_system(forecast_buffer=True):
+        weather, building_load = copy.deepcopy(history)
+        system = SystemModel(None, weather, 60, forecast_buffer=forecast_buffer)
+        system.add_forecast_model(building_load, "building_load")
+        counter = CountingModel(cost=0.1)
+        system.add_forecast_model(counter, "electricity_cost")
+        return system, counter
+    return get_system
+
+
+def test_buffered_hours_are_reused(get_system):
+    system, counter = get_system()
+    plain, _ = get_system(forecast_buffer=False)
+
+    for hour in range(3):
+        now = NOW + hour * HOUR
+        assert system.get_forecasts(now) == plain.get_forecasts(now)
+
+    assert [len(t) for t in counter.derived] == [6, 1, 1]
+    assert counter.derived[1] == [(NOW + 7 * HOUR).replace(year=system.weather_model.history_year)]
+    assert len(system.forecast_buffer) == 6
+
+
+def test_no_buffer(get_system):
+    system, counter = get_system(forecast_buffer=False)
+    system.get_forecasts(NOW)
+    system.get_forecasts(NOW + HOUR)
+    assert [len(t) for t in counter.derived] == [6, 6]
+    assert system.forecast_buffer is None
+
+
+def test_training_data_invalidates(get_system):
+    system, counter = get_system()
+    system.get_forecasts(NOW)
+    system.add_training_data("electricity_cost", NOW, {})
+    assert system.forecast_buffer == {}
+    system.get_forecasts(NOW)
+    assert [len(t) for t in counter.derived] == [6, 6]
+
+
+def test_changed_weather_is_derived_again(get_system):
+    system, counter = get_system()
+    system.get_forecasts(NOW)
+
+    # Change the weather of the last hour of the horizon.
+    weather = system.weather_model
+    last = (NOW + 6 * HOUR).replace(year=weather.history_year)
+    index = abs(weather.historical_data[weather.time_column] - last).idxmin()
+    weather.historical_data.loc[index, "tempm"] += 1.0
+
+    system.get_forecasts(NOW)
+    assert counter.derived[1] == [last]
+
+
+def test_forecasts_are_copies(get_system):
+    system, counter = get_system()
+    forecasts = system.get_forecasts(NOW)
+    forecasts[-1]["electricity_cost"] = 10.0
+    assert system.get_forecasts(NOW)[-1]["electricity_cost"] == 0.1
+    assert len(counter.derived) == 1
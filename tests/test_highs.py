@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import numpy as np
+import pytest
+
+from econ_dispatch.optimizer.matrix import MatrixProblem, GE, EQ
+from econ_dispatch.optimizer.solvers import get_solver
+from econ_dispatch.optimizer.solvers import highs
+
+needs_milp = pytest.mark.skipif(highs.milp is None, reason="scipy.optimize.milp needs scipy 1.9 and Python 3.8")
+
+
+def small_problem():
+    """Cover a demand of 2.5 with an integer unit at cost 3 and a
+    continuous one at cost 2 that can give at most 1."""
+    problem = MatrixProblem("small")
+    x = np.concatenate([problem.add_variables(["unit"], 0.0, 5.0, integer=True),
+                        problem.add_variables(["extra"], 0.0, 1.0)])
+    problem.add_cost(x, [3.0, 2.0])
+    problem.add_constraints(["demand"], [(1.0, x[[0]]), (1.0, x[[1]])], GE, 2.5)
+    problem.add_constraints(["balance"], [(1.0, x[[1]])], EQ, 0.5)
+    return problem
+
+
+@pytest.mark.skipif(highs.milp is not None, reason="scipy.optimize.milp is available")
+def test_missing_milp():
+    with pytest.raises(ValueError):
+        get_solver("highs")
+
+
+@needs_milp
+def test_solve():
+    solution = get_solver("highs", time_limit=10, mip_gap=0.0).solve(small_problem())
+    assert solution.status == "Optimal"
+    assert solution.objective_value == pytest.approx(7.0)
+    assert np.allclose(solution.x, [2.0, 0.5])
+
+
+@needs_milp
+def test_duals():
+    problem = small_problem()
+    duals = get_solver("highs").solve_duals(problem, {0: 2.0}, [0, 1])
+    assert duals.tolist() == pytest.approx([0.0, 2.0])
+
+
+@needs_milp
+def test_options():
+    solver = get_solver("highs", time_limit=10, mip_gap=0.01, disp=False)
+    assert solver.with_time_limit(2.0).get_options() == {"time_limit": 2.0, "mip_rel_gap": 0.01, "disp": False}
+    assert solver.get_options()["time_limit"] == 10
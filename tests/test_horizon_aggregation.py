@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import datetime
+
+import pytest
+
+from econ_dispatch.forecast_models import get_forecast_model_class
+from econ_dispatch.application import build_model_from_config
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.utils import aggregate_forecasts
+from tests.common import get_parameters, make_forecast, synthetic_forecast
+
+
+def hours(count):
+    return [{"elec_load": float(hour), "electricity_cost": 1.0} for hour in range(count)]
+
+
+def test_block_lengths():
+    aggregated = aggregate_forecasts(hours(10), [[2, 1], [6, 3]])
+    assert [record.get("duration", 1) for record in aggregated] == [1, 1, 3.0, 3.0, 2.0]
+    # Hours past the listed ones use the last block length.
+    aggregated = aggregate_forecasts(hours(12), [[2, 1], [3, 3]])
+    assert [record.get("duration", 1) for record in aggregated] == [1, 1, 3.0, 3.0, 3.0, 1]
+
+
+def test_hourly_records_are_kept():
+    forecast = hours(3)
+    aggregated = aggregate_forecasts(forecast, [[3, 1]])
+    assert aggregated == forecast
+    assert aggregated[0] is forecast[0]
+
+
+def test_duration_weighted_average():
+    aggregated = aggregate_forecasts(hours(4), [[1, 1], [3, 3]])
+    assert aggregated[1] == {"elec_load": 2.0, "electricity_cost": 1.0, "duration": 3.0}
+
+    # Aggregating again weights by the durations of the merged records.
+    again = aggregate_forecasts(aggregated, [[2, 2]])
+    assert again[0]["duration"] == 4.0
+    assert again[0]["elec_load"] == pytest.approx((0.0 + 3 * 2.0) / 4.0)
+
+
+def test_history_model_records(tmpdir):
+    """History models return the whole row, time column included."""
+    data_file = tmpdir.join("history.csv")
+    data_file.write("timestamp,elec_load,heat_load,cool_load\n" +
+                    "".join("2012-07-01 {:02d}:00,{},293.1,586.2\n".format(hour, 500.0 + hour) for hour in range(6)))
+    model = get_forecast_model_class("building_load", "history", history_data_file=str(data_file))
+    forecast = [model.derive_variables(datetime.datetime(2012, 7, 1, hour)) for hour in range(6)]
+
+    aggregated = aggregate_forecasts(forecast, [[1, 1], [5, 5]])
+    assert aggregated[0] is forecast[0]
+    assert aggregated[1]["timestamp"] == forecast[1]["timestamp"]
+    assert aggregated[1]["elec_load"] == pytest.approx(503.0)
+    assert aggregated[1]["cool_load"] == pytest.approx(2.0)
+    assert aggregated[1]["duration"] == 5.0
+
+
+def test_aggregated_cost_of_constant_loads():
+    """With the same loads every hour a block of n hours costs n times one hour."""
+    forecast = make_forecast([700.0] * 8, [1.0] * 8, [2.0] * 8)
+    parameters = get_parameters()
+    config = {"name": "use_case_1", "solver": "cbc"}
+    hourly = get_optimization_function(config)(None, forecast, parameters)
+    aggregated = get_optimization_function(dict(config, horizon_aggregation=[[1, 1], [7, 7]]))(None, forecast,
+                                                                                               parameters)
+    assert aggregated["Objective Value"] == pytest.approx(hourly["Objective Value"], rel=1e-6)
+    assert aggregated.n_hours == 2
+
+
+def test_aggregation_set_twice_is_rejected():
+    config = {"horizon_aggregation": [[24, 1], [48, 4]],
+              "optimizer": {"name": "use_case_1", "horizon_aggregation": [[24, 1], [48, 4]]}}
+    with pytest.raises(ValueError):
+        build_model_from_config(config)
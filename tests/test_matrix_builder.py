@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import re
+
+import numpy as np
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from tests.common import get_parameters, synthetic_forecast
+
+HOUR0_RE = re.compile(r"_hour00$")
+
+
+def solve(builder, forecast, parameters, **config):
+    optimize = get_optimization_function(dict({"name": "use_case_1", "solver": "cbc", "builder": builder},
+                                              **config))
+    return optimize(None, forecast, parameters)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("chiller_count", [1, 3])
+def test_matrix_matches_pulp(seed, chiller_count):
+    forecast = synthetic_forecast(24, seed)
+    parameters = get_parameters(chiller_count)
+    pulp_result = solve("pulp", forecast, parameters)
+    matrix_result = solve("matrix", forecast, parameters)
+
+    assert pulp_result["Optimization Status"] == matrix_result["Optimization Status"] == "Optimal"
+    assert matrix_result["Objective Value"] == pytest.approx(pulp_result["Objective Value"], rel=1e-9)
+
+    names = sorted(name for name in pulp_result.layout.names if HOUR0_RE.search(name))
+    assert names == sorted(name for name in matrix_result.layout.names if HOUR0_RE.search(name))
+    for name in names:
+        assert matrix_result[name] == pytest.approx(pulp_result[name], rel=1e-6, abs=1e-6), name
+
+
+def test_matrix_problem_matches_pulp_problem():
+    from econ_dispatch.optimizer.use_case_1 import get_optimization_problem, get_optimization_matrix
+    forecast = synthetic_forecast(6)
+    parameters = get_parameters()
+    prob = get_optimization_problem(forecast, parameters)
+    problem = get_optimization_matrix(forecast, parameters)
+
+    assert sorted(var.name for var in prob.variables()) == sorted(problem.var_names)
+    assert sorted(prob.constraints) == sorted(problem.row_names)
+
+    # Same objective for any point, here the upper bounds where finite.
+    x = np.where(np.isinf(problem.ub), 1.0, problem.ub)
+    values = dict(zip(problem.var_names, x))
+    for var in prob.variables():
+        var.varValue = values[var.name]
+    assert problem.objective_value(x) == pytest.approx(prob.objective.value(), rel=1e-9)
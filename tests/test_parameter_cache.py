@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import datetime
+
+from econ_dispatch.component_models import ComponentBase, get_component_class
+from econ_dispatch.system_model import SystemModel
+
+NOW = datetime.datetime(2017, 7, 1)
+
+
+class Counting(ComponentBase):
+    """Parameters computed from the inputs, counting the computations."""
+    def __init__(self, parameter_inputs=None, **kwargs):
+        super(Counting, self).__init__(**kwargs)
+        self.parameter_inputs = parameter_inputs
+        self.inputs = {}
+        self.computed = 0
+
+    def get_optimization_parameters(self):
+        self.computed += 1
+        return {self.name + "_" + key: value for key, value in self.inputs.items()}
+
+    def update_parameters(self, timestamp, inputs):
+        self.inputs = dict(inputs)
+
+
+def test_any_input_change():
+    component = Counting(name="c")
+    component.refresh_parameters(NOW, {"a": 1, "b": 2})
+    assert component.get_cached_optimization_parameters() == {"c_a": 1, "c_b": 2}
+    component.refresh_parameters(NOW, {"a": 1, "b": 2})
+    component.get_cached_optimization_parameters()
+    component.refresh_parameters(NOW, {"a": 1, "b": 3})
+    assert component.get_cached_optimization_parameters() == {"c_a": 1, "c_b": 3}
+    assert component.computed == 2
+    assert (component.parameter_cache_hits, component.parameter_cache_misses) == (1, 2)
+
+
+def test_listed_inputs_only():
+    component = Counting(("a",), name="c")
+    component.refresh_parameters(NOW, {"a": 1, "b": 2})
+    component.get_cached_optimization_parameters()
+    # b is not a parameter input, the parameters are kept.
+    component.refresh_parameters(NOW, {"a": 1, "b": 3})
+    assert component.get_cached_optimization_parameters() == {"c_a": 1, "c_b": 2}
+    component.refresh_parameters(NOW, {"a": 2, "b": 3})
+    assert component.get_cached_optimization_parameters() == {"c_a": 2, "c_b": 3}
+    assert component.computed == 2
+
+
+def test_configuration_only():
+    component = Counting((), name="c")
+    component.prepare_parameters()
+    assert component.computed == 1
+    for value in range(3):
+        component.refresh_parameters(NOW, {"a": value})
+        assert component.get_cached_optimization_parameters() == {}
+    assert component.computed == 1
+    assert (component.parameter_cache_hits, component.parameter_cache_misses) == (3, 0)
+
+
+def test_invalidate():
+    component = Counting(("a",), name="c")
+    component.refresh_parameters(NOW, {"a": 1})
+    component.get_cached_optimization_parameters()
+    component.invalidate_parameters()
+    component.get_cached_optimization_parameters()
+    assert component.computed == 2
+    # The inputs are unchanged, the recomputed parameters are kept.
+    component.refresh_parameters(NOW, {"a": 1})
+    component.get_cached_optimization_parameters()
+    assert component.computed == 2
+
+
+def test_returns_copies():
+    component = Counting(name="c")
+    component.refresh_parameters(NOW, {"a": 1})
+    component.get_cached_optimization_parameters()["c_a"] = 5
+    assert component.get_cached_optimization_parameters() == {"c_a": 1}
+
+
+def test_system_model():
+    meter = get_component_class("natural_gas_meter")(name="natural_gas_meter")
+    boiler = get_component_class("static_boiler")(name="boiler", mat_boiler=[1.0], xmax_boiler=[2.0],
+                                                  xmin_boiler=[0.5])
+    system = SystemModel(None, None, 60)
+    system.add_component(meter, "natural_gas_meter")
+    system.add_component(boiler, "static_boiler")
+    boiler.prepare_parameters()
+
+    for cost, outdoor in [(7.0, 20.0), (7.0, 25.0), (8.0, 25.0)]:
+        inputs = {"cost": cost, "T_OA": outdoor}
+        system.update_components(NOW, inputs)
+        parameters = system.get_parameters(NOW, inputs)
+        assert parameters["cost"] == cost
+        assert parameters["mat_boiler"] == [1.0]
+
+    assert system.get_parameter_cache_stats() == {"natural_gas_meter": (1, 2), "boiler": (3, 0)}
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import numpy as np
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.optimizer.matrix import MatrixProblem, GE, EQ
+from econ_dispatch.optimizer.presolve import count_fixed
+from econ_dispatch.optimizer.use_case_1 import get_optimization_template
+from tests.common import get_parameters, make_forecast, synthetic_forecast
+
+
+def small_problem():
+    problem = MatrixProblem("small")
+    x = problem.add_variables(["x", "y", "z"], 0.0, 10.0)
+    problem.add_cost(x, 1.0)
+    problem.add_constraints(["xy", "yz"], [(1.0, x[[0, 1]]), (1.0, x[[1, 2]])], GE, [2.0, 1.0])
+    problem.add_constraints(["z"], [(1.0, x[[2]])], EQ, 1.0)
+    return problem
+
+
+def test_set_bounds_patches_pulp_model():
+    problem = small_problem()
+    prob = problem.pulp_problem()
+    lb, ub = problem.lb.copy(), problem.ub.copy()
+    lb[0] = ub[0] = 3.0
+    ub[2] = np.inf
+    problem.set_bounds(lb, ub)
+
+    assert problem.pulp_problem() is prob
+    variables = prob.variablesDict()
+    assert (variables["x"].lowBound, variables["x"].upBound) == (3.0, 3.0)
+    assert variables["z"].upBound is None
+    assert (variables["y"].lowBound, variables["y"].upBound) == (0.0, 10.0)
+
+    # Setting the same bounds again changes nothing.
+    problem.set_bounds(lb, ub)
+    assert not problem._pulp_bounds
+
+
+def test_count_fixed():
+    problem = small_problem()
+    lb, ub = problem.lb.copy(), problem.ub.copy()
+    lb[2] = ub[2] = 1.0
+    # z is fixed, which leaves "z" without a free variable, "yz" still has y.
+    assert count_fixed(problem, lb, ub) == (1, 1)
+    lb[1] = ub[1] = 2.0
+    assert count_fixed(problem, lb, ub) == (2, 2)
+
+
+def test_presolve_bounds_fix_units_off_without_load():
+    forecast = make_forecast([500.0] * 4, [0.0, 1.0, 0.0, 1.0], [0.0, 0.0, 2.0, 2.0])
+    template = get_optimization_template(get_parameters(), 4)
+    template.update(forecast)
+    lb, ub = template.presolve_bounds(forecast)
+
+    for hour, (heat, cool) in enumerate([(False, False), (True, False), (False, True), (True, True)]):
+        assert (ub[template.Sboiler[hour]] > 0) == heat
+        assert (ub[template.Sabs[hour]] > 0) == cool
+    # The template keeps its own bounds.
+    assert np.array_equal(template.problem.lb, template.lb)
+    assert np.array_equal(template.problem.ub, template.ub)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_presolve_keeps_objective(seed):
+    forecast = synthetic_forecast(24, seed)
+    # Hours without cooling load give presolve something to fix.
+    for record in forecast[:6]:
+        record["cool_load"] = 0.0
+    parameters = get_parameters()
+    config = {"name": "use_case_1", "solver": "cbc"}
+    plain = get_optimization_function(config)(None, forecast, parameters)
+    presolved = get_optimization_function(dict(config, presolve=True))(None, forecast, parameters)
+
+    assert presolved["Objective Value"] == pytest.approx(plain["Objective Value"], rel=1e-9)
+    assert presolved["Presolve Fixed Variables"] > 0
+
+
+def test_bounds_reset_between_runs():
+    """Fixed variables and presolve bounds of one run do not carry over to
+    the next run on the same template."""
+    forecast = synthetic_forecast(24, 3)
+    parameters = get_parameters()
+    optimize = get_optimization_function({"name": "use_case_1", "solver": "cbc", "presolve": True})
+
+    free = optimize(None, forecast, parameters)
+    flipped = free.commitment(0)
+    flipped["Sboiler_hour00"] = 1 - flipped["Sboiler_hour00"]
+    held = optimize(None, forecast, parameters, fixed=flipped)
+    assert held["Solution Source"] == "solver"
+    assert held.commitment(0) == flipped
+    assert held["Objective Value"] > free["Objective Value"] + 1e-6
+
+    again = optimize(None, forecast, parameters)
+    assert again["Objective Value"] == pytest.approx(free["Objective Value"], rel=1e-9)
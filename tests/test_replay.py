@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import os
+import shutil
+import datetime
+import tempfile
+
+import numpy as np
+import pytest
+
+from econ_dispatch.optimizer.archive import LPArchive
+from econ_dispatch.optimizer.replay import read_recorded, replay, summarize
+from econ_dispatch.optimizer.solvers import get_solver
+from econ_dispatch.optimizer.use_case_1 import get_optimization_matrix
+from econ_dispatch.utils import OptimizerCSVOutput
+from tests.common import get_parameters, synthetic_forecast
+
+START = datetime.datetime(2017, 7, 1)
+
+
+@pytest.fixture
+def directory():
+    directory = tempfile.mkdtemp()
+    yield directory
+    shutil.rmtree(directory)
+
+
+def record_run(directory, hours=3):
+    """Archive and solve a few problems, writing the results the way the
+    optimizer debug CSV does."""
+    lp_dir = os.path.join(directory, "lps")
+    csv_file = os.path.join(directory, "optimizer.csv")
+    solver = get_solver("cbc")
+    archive = LPArchive(lp_dir)
+    output = OptimizerCSVOutput(csv_file)
+    for hour in range(hours):
+        now = START + datetime.timedelta(hours=hour)
+        forecast = synthetic_forecast(6, hour)
+        problem = get_optimization_matrix(forecast, get_parameters())
+        archive.put(now, problem)
+        solution = solver.solve(problem)
+        result = dict(zip(problem.var_names, solution.x.tolist()))
+        result.update({"Optimization Status": solution.status,
+                       "Objective Value": solution.objective_value,
+                       "Convergence Time": solution.solution_time,
+                       "Note": "text"})
+        output.writerow(result, forecast, now)
+    output.close()
+    archive.close()
+    return lp_dir, csv_file
+
+
+def test_read_recorded(directory):
+    _, csv_file = record_run(directory, hours=1)
+    recorded = read_recorded(csv_file)
+    assert list(recorded) == [str(START)]
+    row = recorded[str(START)]
+    assert row["status"] == "Optimal"
+    assert row["objective"] > 0
+    assert "Objective Value" not in row["values"]
+    assert np.isnan(row["values"]["Note"])
+    assert not np.isnan(row["values"]["elec_load0"])
+
+
+def test_replay_matches_recorded_run(directory):
+    lp_dir, csv_file = record_run(directory)
+    results = replay(lp_dir, read_recorded(csv_file), "cbc", workers=2)
+    assert [r["timestamp"] for r in results] == [str(START + datetime.timedelta(hours=hour)) for hour in range(3)]
+    summary = summarize(results)
+    assert summary["problems"] == summary["matched"] == 3
+    assert summary["status_changed"] == summary["objective_changed"] == summary["dispatch_changed"] == 0
+
+
+def test_replay_without_recorded_run(directory):
+    lp_dir, _ = record_run(directory, hours=1)
+    results = replay(lp_dir, {}, "cbc", workers=1)
+    assert results[0]["recorded_status"] is None
+    assert np.isnan(results[0]["dispatch_change"])
+    assert summarize(results)["matched"] == 0
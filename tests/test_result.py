@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import numpy as np
+import pytest
+
+from econ_dispatch.optimizer.result import NAME_RE, ResultLayout, OptimizationResult
+
+
+def test_name_re():
+    assert NAME_RE.match("Q_chiller2_hour05_aux1").groups() == ("Q_chiller", "2", "05", "_aux1")
+    assert NAME_RE.match("Q_boiler_hour00").groups() == ("Q_boiler", "", "00", "")
+    assert NAME_RE.match("E_chillerelec10_hour23").groups() == ("E_chillerelec", "10", "23", "")
+    assert NAME_RE.match("Objective Value") is None
+
+
+def make_result():
+    names = ["Q_chiller1_hour01", "Q_chiller0_hour00", "Q_chiller1_hour00", "Q_boiler_hour00",
+             "Q_boiler_hour01", "Schiller0_hour00", "Q_boiler_hour00_aux0", "total"]
+    integer = [False, False, False, False, False, True, False, False]
+    return OptimizationResult(ResultLayout(names, integer), [1.0, 2.0, 3.0, 4.0, 5.0, 1.0, 6.0, 7.0])
+
+
+def test_layout_groups_by_quantity():
+    layout = make_result().layout
+    assert layout.n_hours == 2
+    assert list(layout.units) == ["Q_boiler", "Q_boiler_aux0", "Q_chiller", "Schiller"]
+    assert layout.units["Q_chiller"] == ["0", "1"]
+    assert layout.units["Q_boiler"] == [""]
+    assert layout.hours.tolist() == [1, 0, 0, 0, 1, 0, 0, -1]
+
+
+def test_array_and_lookup():
+    result = make_result()
+    chiller = result.array("Q_chiller")
+    assert chiller[0, 0] == 2.0 and np.isnan(chiller[0, 1])
+    assert chiller[1].tolist() == [3.0, 1.0]
+    assert result.array("Q_boiler").tolist() == [[4.0, 5.0]]
+    assert result["total"] == 7.0
+    assert result.commitment(0) == {"Schiller0_hour00": 1}
+
+
+def test_summary_entries():
+    result = make_result()
+    result["Optimization Status"] = "Optimal"
+    assert result["Optimization Status"] == "Optimal"
+    assert "Optimization Status" in result
+    assert list(result)[-1] == "Optimization Status"
+    del result["Optimization Status"]
+    with pytest.raises(KeyError):
+        del result["total"]
+    result["Q_boiler_hour00"] = None
+    assert result["Q_boiler_hour00"] is None
+
+
+def test_from_dict_matches_values():
+    values = {"Q_boiler_hour00": 1.0, "Q_boiler_hour01": None, "cost": 2.0}
+    result = OptimizationResult.from_dict(values)
+    assert dict((name, result[name]) for name in result) == values
+
+
+def test_shift():
+    shifted = make_result().shift(1)
+    assert sorted(shifted.layout.names) == ["Q_boiler_hour00", "Q_chiller1_hour00"]
+    assert shifted["Q_chiller1_hour00"] == 1.0
+    assert shifted["Q_boiler_hour00"] == 5.0
+    assert shifted.n_hours == 1
+
+
+def test_mark_reused():
+    result = make_result()
+    result["Solution Source"] = "solver"
+    result["Convergence Time"] = 2.5
+    result["Solve Time"] = 2.0
+    result.mark_reused("cache")
+    assert result["Solution Source"] == "cache"
+    assert result["Convergence Time"] == 0.0
+    assert result["Solve Time"] == 0.0
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from econ_dispatch.component_models import get_component_class
+from econ_dispatch.forecast_models import get_forecast_model_type
+from econ_dispatch.snapshot import SnapshotCache
+
+CSV = "timestamp,elec_load,heat_load,cool_load\n2012-07-01 00:00,{},293.1,293.1\n"
+
+
+@pytest.fixture
+def directory():
+    directory = tempfile.mkdtemp()
+    yield directory
+    shutil.rmtree(directory)
+
+
+def get_model(cache, kind, name, klass, settings):
+    built = []
+
+    def build():
+        built.append(True)
+        return klass(**settings)
+
+    model = cache.get(kind, name, klass, settings, build)
+    return model, bool(built)
+
+
+def snapshots(directory):
+    return sorted(os.listdir(os.path.join(directory, "snapshots")))
+
+
+def test_hit_and_settings_change(directory):
+    cache = SnapshotCache(os.path.join(directory, "snapshots"))
+    klass = get_forecast_model_type("electricity_cost", "static")
+
+    model, built = get_model(cache, "forecast", "electricity_cost", klass, {"cost": 0.1})
+    assert built
+    model, built = get_model(cache, "forecast", "electricity_cost", klass, {"cost": 0.1})
+    assert not built and model.cost == 0.1
+    model, built = get_model(cache, "forecast", "electricity_cost", klass, {"cost": 0.2})
+    assert built and model.cost == 0.2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # The snapshot for the old settings is stale and removed, no temporary file is left.
+    assert len(snapshots(directory)) == 1
+    assert snapshots(directory)[0].startswith("forecast.electricity_cost.")
+    assert snapshots(directory)[0].endswith(".snapshot")
+
+
+def test_setting_file_contents(directory):
+    data_file = os.path.join(directory, "history.csv")
+    with open(data_file, "w") as f:
+        f.write(CSV.format(500.0))
+    settings = {"history_data_file": data_file}
+    klass = get_forecast_model_type("building_load", "history")
+    cache = SnapshotCache(os.path.join(directory, "snapshots"))
+    key = cache.key(klass, settings)
+
+    model, built = get_model(cache, "forecast", "building_load", klass, settings)
+    assert built
+    assert get_model(cache, "forecast", "building_load", klass, settings)[1] is False
+
+    with open(data_file, "w") as f:
+        f.write(CSV.format(600.0))
+    assert cache.key(klass, settings) != key
+    model, built = get_model(cache, "forecast", "building_load", klass, settings)
+    assert built
+    assert model.historical_data["elec_load"][0] == 600.0
+    assert len(snapshots(directory)) == 1
+
+
+def test_other_models_are_kept(directory):
+    cache = SnapshotCache(os.path.join(directory, "snapshots"))
+    klass = get_forecast_model_type("electricity_cost", "static")
+    get_model(cache, "forecast", "electricity_cost", klass, {"cost": 0.1})
+    get_model(cache, "forecast", "natural_gas_cost", get_forecast_model_type("natural_gas_cost", "static"),
+              {"cost": 7.0})
+    get_model(cache, "forecast", "electricity_cost", klass, {"cost": 0.2})
+    names = snapshots(directory)
+    assert len(names) == 2
+    assert [name.rsplit(".", 2)[0] for name in names] == ["forecast.electricity_cost", "forecast.natural_gas_cost"]
+
+
+def test_prepared_parameters_are_snapshotted(directory):
+    cache = SnapshotCache(os.path.join(directory, "snapshots"))
+    klass = get_component_class("static_boiler")
+    settings = {"name": "boiler", "mat_boiler": [1.0], "xmax_boiler": [2.0], "xmin_boiler": [0.5]}
+    get_model(cache, "component", "boiler", klass, settings)
+    model, built = get_model(cache, "component", "boiler", klass, settings)
+    assert not built
+    model.refresh_parameters(None, {})
+    assert model.get_cached_optimization_parameters()["mat_boiler"] == [1.0]
+    assert model.parameter_cache_misses == 0
+
+
+def test_unreadable_snapshot_is_rebuilt(directory):
+    cache = SnapshotCache(os.path.join(directory, "snapshots"))
+    klass = get_forecast_model_type("electricity_cost", "static")
+    get_model(cache, "forecast", "electricity_cost", klass, {"cost": 0.1})
+    file_name = os.path.join(directory, "snapshots", snapshots(directory)[0])
+    with open(file_name, "wb") as f:
+        f.write(b"not a snapshot")
+    model, built = get_model(cache, "forecast", "electricity_cost", klass, {"cost": 0.1})
+    assert built and model.cost == 0.1
+    assert snapshots(directory) == [os.path.basename(file_name)]
+
+
+def test_failed_write_leaves_no_file(directory):
+    cache = SnapshotCache(os.path.join(directory, "snapshots"))
+    klass = get_forecast_model_type("electricity_cost", "static")
+
+    def build():
+        model = klass(cost=0.1)
+        model.unpicklable = lambda: None
+        return model
+
+    model = cache.get("forecast", "electricity_cost", klass, {"cost": 0.1}, build)
+    assert model.cost == 0.1
+    assert snapshots(directory) == []
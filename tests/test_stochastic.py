@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import datetime
+
+import numpy as np
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.optimizer.result import ResultLayout
+from econ_dispatch.optimizer.solvers import get_solver
+from econ_dispatch.optimizer.stochastic import ScenarioGenerator, StochasticOptimizer, extensive_form
+from econ_dispatch.optimizer.use_case_1 import get_optimization_matrix
+from tests.common import get_parameters, synthetic_forecast
+
+NOW = datetime.datetime(2017, 7, 1)
+CONFIG = {"name": "use_case_1", "solver": "cbc"}
+
+
+@pytest.fixture
+def optimizers():
+    optimizers = []
+
+    def get(method, scenarios=3):
+        optimizer = StochasticOptimizer(CONFIG, method, scenarios, seed=0, pool="thread", workers=2)
+        optimizers.append(optimizer)
+        return optimizer
+    yield get
+    for optimizer in optimizers:
+        optimizer.close()
+
+
+def test_scenarios():
+    forecast = synthetic_forecast(12)
+    scenarios = ScenarioGenerator(4, seed=1).generate(forecast)
+    assert len(scenarios) == 4
+    assert scenarios[0] is forecast
+    for scenario in scenarios[1:]:
+        assert scenario[0] == forecast[0]
+        for name in ("elec_load", "cool_load", "electricity_cost", "natural_gas_cost"):
+            assert [record[name] for record in scenario[1:]] != [record[name] for record in forecast[1:]], name
+            assert all(record[name] >= 0 for record in scenario)
+    assert ScenarioGenerator(4, seed=1).generate(forecast) == scenarios
+
+    with pytest.raises(ValueError):
+        ScenarioGenerator(0)
+
+
+def test_extensive_form_of_one_scenario():
+    problem = get_optimization_matrix(synthetic_forecast(6), get_parameters())
+    layout = ResultLayout(problem.var_names, problem.integrality)
+    solver = get_solver("cbc")
+    combined = extensive_form([problem.to_arrays()], np.nonzero(layout.hours == 0)[0])
+    assert combined.var_names == problem.var_names
+    assert combined.objective_value(solver.solve(combined).x) == \
+        pytest.approx(solver.solve(problem).objective_value, rel=1e-6)
+
+
+def test_extensive_form_shares_first_stage():
+    problems = [get_optimization_matrix(synthetic_forecast(6, seed), get_parameters()).to_arrays()
+                for seed in range(3)]
+    layout = ResultLayout(problems[0]["var_names"], problems[0]["integrality"])
+    first_stage = np.nonzero(layout.hours == 0)[0]
+    combined = extensive_form(problems, first_stage)
+    n = len(layout.names)
+    assert combined.num_vars == n + 2 * (n - len(first_stage))
+    assert combined.num_rows == 3 * len(problems[0]["row_names"])
+    assert combined.var_names[:n] == problems[0]["var_names"]
+    assert combined.var_names[n].endswith("_scenario1")
+
+
+def test_two_stage_one_scenario(optimizers):
+    forecast = synthetic_forecast(6)
+    deterministic = get_optimization_function(CONFIG)(NOW, forecast, get_parameters())
+    result = optimizers("two_stage", 1)(NOW, forecast, get_parameters())
+    assert result["Optimization Status"] == "Optimal"
+    assert result["Scenario Count"] == 1
+    assert result["Objective Value"] == pytest.approx(deterministic["Objective Value"], rel=1e-6)
+    assert result["Expected Objective Value"] == pytest.approx(deterministic["Objective Value"], rel=1e-6)
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_two_stage_is_decomposed(pool):
+    """The blocks of the extensive form solved in the pool give the whole solve."""
+    scenarios = ScenarioGenerator(3, seed=2).generate(synthetic_forecast(6))
+    optimizer = StochasticOptimizer(CONFIG, "two_stage", pool=pool, workers=2)
+    try:
+        result = optimizer(NOW, scenarios, get_parameters())
+    finally:
+        optimizer.close()
+
+    problems = [get_optimization_matrix(scenario, get_parameters()).to_arrays() for scenario in scenarios]
+    layout = ResultLayout(problems[0]["var_names"], problems[0]["integrality"])
+    whole = get_solver("cbc").solve(extensive_form(problems, np.nonzero(layout.hours == 0)[0]))
+    assert result["Expected Objective Value"] == pytest.approx(whole.objective_value, rel=1e-6)
+
+
+def test_two_stage_is_no_worse_than_candidates(optimizers):
+    scenarios = ScenarioGenerator(3, seed=2).generate(synthetic_forecast(6))
+    two_stage = optimizers("two_stage")(NOW, scenarios, get_parameters())
+    candidates = optimizers("candidates")(NOW, scenarios, get_parameters())
+    assert two_stage["Scenario Count"] == candidates["Scenario Count"] == 3
+    assert two_stage["Expected Objective Value"] <= candidates["Expected Objective Value"] * (1 + 1e-6)
+
+
+def test_consensus(optimizers):
+    result = optimizers("consensus")(NOW, synthetic_forecast(6), get_parameters())
+    assert result["Optimization Status"] == "Optimal"
+    assert result["Scenario Count"] == 3
+    assert 0 < result["Scenario Agreement"] <= 1
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        StochasticOptimizer(CONFIG, "average")
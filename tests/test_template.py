@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import datetime
+
+import numpy as np
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.optimizer.use_case_1 import get_optimization_matrix, get_optimization_template
+from tests.common import get_parameters, synthetic_forecast
+
+NOW = datetime.datetime(2017, 7, 1)
+
+
+def arrays_equal(problem, other):
+    a, b = problem.to_arrays(), other.to_arrays()
+    assert a["var_names"] == b["var_names"]
+    assert a["row_names"] == b["row_names"]
+    for name in ("c", "lb", "ub", "integrality", "sense", "b"):
+        assert np.array_equal(a[name], b[name]), name
+    assert np.array_equal(problem.A_sparse().toarray(), other.A_sparse().toarray())
+
+
+def test_update_matches_fresh_build():
+    parameters = get_parameters()
+    template = get_optimization_template(parameters, 6)
+    forecasts = [synthetic_forecast(6, seed) for seed in range(3)]
+    # Aggregated periods change the unserved load penalties as well.
+    forecasts.append([dict(record, duration=2.0) for record in forecasts[0]])
+    forecasts.append(forecasts[1])
+    for forecast in forecasts:
+        arrays_equal(template.update(forecast), get_optimization_matrix(forecast, parameters))
+
+
+def test_patched_pulp_problem_matches():
+    parameters = get_parameters()
+    template = get_optimization_template(parameters, 6)
+    template.update(synthetic_forecast(6, 0)).pulp_problem()
+    forecast = synthetic_forecast(6, 1)
+    patched = template.update(forecast).pulp_problem()
+    fresh = get_optimization_matrix(forecast, parameters).to_pulp()
+    assert str(patched.objective) == str(fresh.objective)
+    for name, constraint in fresh.constraints.items():
+        assert patched.constraints[name].constant == constraint.constant, name
+
+
+def test_wrong_horizon():
+    with pytest.raises(ValueError):
+        get_optimization_template(get_parameters(), 6).update(synthetic_forecast(5))
+
+
+def test_reused_model_gives_the_same_results():
+    config = {"name": "use_case_1", "solver": "cbc"}
+    reused = get_optimization_function(config)
+    fresh = get_optimization_function(dict(config, reuse_model=False))
+    runs = [(synthetic_forecast(6, 0), get_parameters()),
+            (synthetic_forecast(6, 1), get_parameters()),
+            (synthetic_forecast(6, 2), get_parameters(2)),
+            (synthetic_forecast(4, 3), get_parameters(2)),
+            (synthetic_forecast(6, 4), get_parameters())]
+    for forecast, parameters in runs:
+        a = reused(NOW, forecast, parameters)
+        b = fresh(NOW, forecast, parameters)
+        assert a["Optimization Status"] == b["Optimization Status"] == "Optimal"
+        assert a["Objective Value"] == pytest.approx(b["Objective Value"], rel=1e-9)
+        assert a.layout.names == b.layout.names
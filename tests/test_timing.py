@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import time
+import datetime
+
+import pytest
+
+from econ_dispatch.optimizer import get_optimization_function
+from econ_dispatch.system_model import SystemModel
+from econ_dispatch.utils import PhaseTimer, NullTimer, SYSTEM_TIMING_KEYS, OPTIMIZER_TIMING_KEYS
+from tests.common import get_parameters, synthetic_forecast
+
+NOW = datetime.datetime(2017, 7, 1)
+
+
+class Weather(object):
+    """Two hours of constant weather."""
+    def get_weather_forecast(self, now):
+        return [{"timestamp": now + datetime.timedelta(hours=hour), "tempm": 20.0} for hour in (1, 2)]
+
+
+def test_phase_timer():
+    timer = PhaseTimer()
+    for _ in range(2):
+        timer.reset()
+        time.sleep(0.01)
+        timer.lap("First")
+        timer.lap("Second")
+        timer.add("Second", 1.0)
+    assert list(timer.phases) == ["First", "Second"]
+    assert timer.phases["First"] >= 0.01
+    assert timer.phases["Second"] == pytest.approx(1.0, abs=0.01)
+    assert timer.counts == {"First": 2, "Second": 4}
+    assert timer.means()["Second"] == pytest.approx(0.5, abs=0.01)
+    assert timer.totals["Second"] == pytest.approx(2.0, abs=0.01)
+
+
+def test_null_timer():
+    timer = NullTimer()
+    timer.reset()
+    timer.lap("First")
+    timer.add("Second", 1.0)
+    assert timer.phases == {} and timer.totals == {} and timer.means() == {}
+
+
+@pytest.mark.parametrize("builder", ["matrix", "pulp"])
+def test_optimizer_phases(builder):
+    config = {"name": "use_case_1", "solver": "cbc", "builder": builder}
+    timed = get_optimization_function(dict(config, timing=True, duals=True))(NOW, synthetic_forecast(4),
+                                                                             get_parameters())
+    for key in OPTIMIZER_TIMING_KEYS:
+        assert timed[key] >= 0.0, key
+
+    untimed = get_optimization_function(config)(NOW, synthetic_forecast(4), get_parameters())
+    assert not [key for key in OPTIMIZER_TIMING_KEYS if key in untimed.summary]
+
+
+def test_heuristic_phases():
+    result = get_optimization_function({"name": "merit_order", "timing": True})(NOW, synthetic_forecast(4),
+                                                                                get_parameters())
+    assert result["Solve Time"] == result["Convergence Time"]
+
+
+def test_system_phases():
+    def optimize(now, forecast, parameters):
+        return {"Build Time": 0.25, "Solve Time": 0.5}
+
+    system = SystemModel(optimize, Weather(), datetime.timedelta(hours=1), timing=True)
+    for hour in range(2):
+        system.run(NOW + datetime.timedelta(hours=hour), {})
+    assert list(system.timer.phases) == SYSTEM_TIMING_KEYS + ["Build Time", "Solve Time"]
+    assert system.timer.counts["Solve Time"] == 2
+    assert system.timer.means()["Build Time"] == 0.25
+
+    system = SystemModel(optimize, Weather(), datetime.timedelta(hours=1))
+    system.run(NOW, {})
+    assert system.timer.phases == {}
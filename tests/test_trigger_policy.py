@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import csv
+import datetime
+
+import pytest
+
+from econ_dispatch.system_model import SystemModel
+from econ_dispatch.trigger_policy import TriggerPolicy
+from econ_dispatch.optimizer.result import OptimizationResult
+from econ_dispatch.utils import OptimizerCSVOutput
+
+START = datetime.datetime(2017, 7, 1)
+HOUR = datetime.timedelta(hours=1)
+
+
+def forecast(elec_load=500.0, hours=4, **values):
+    return [dict({"elec_load": elec_load, "electricity_cost": 0.1}, **values) for _ in range(hours)]
+
+
+def plan(source="solver"):
+    result = OptimizationResult.from_dict(dict(("Q_boiler_hour{:02d}".format(hour), float(hour))
+                                               for hour in range(4)))
+    result["Solution Source"] = source
+    result["Objective Value"] = 100.0
+    result["Convergence Time"] = 2.0
+    result["Build Time"] = 0.5
+    return result
+
+
+def planned_policy(**kwargs):
+    policy = TriggerPolicy(**kwargs)
+    assert policy.check(START, forecast(), {}) == "no plan"
+    policy.update(START, forecast(), {}, plan(), "no plan")
+    return policy
+
+
+def test_keeps_plan_within_thresholds():
+    policy = planned_policy()
+    assert policy.check(START + HOUR, forecast(520.0), {}) is None
+    result = policy.planned(START + HOUR)
+    assert result["Q_boiler_hour00"] == 1.0
+    assert result["Solution Source"] == "plan"
+    assert result["Convergence Time"] == 0.0 and result["Build Time"] == 0.0
+    assert result["Objective Value"] == ""
+    assert result["Reoptimization Skip"] == "plan 1 h old, largest drift elec_load 0.040"
+    assert policy.skipped == 1
+
+
+@pytest.mark.parametrize("now, new_forecast, parameters, trigger", [
+    (START + HOUR, forecast(600.0), {}, "elec_load"),
+    (START + HOUR, forecast(electricity_cost=0.2), {}, "electricity_cost"),
+    (START + HOUR, forecast(), {"cap_boiler": 9.0}, "parameters"),
+    (START + HOUR / 2, forecast(), {}, "time"),
+    (START + 4 * HOUR, forecast(), {}, "plan exhausted"),
+])
+def test_triggers(now, new_forecast, parameters, trigger):
+    assert planned_policy().check(now, new_forecast, parameters) == trigger
+
+
+def test_plan_age():
+    policy = planned_policy(max_plan_age=2)
+    assert policy.check(START + HOUR, forecast(), {}) is None
+    assert policy.check(START + 2 * HOUR, forecast(), {}) == "plan age"
+
+
+def test_fallback_is_not_kept():
+    policy = planned_policy()
+    policy.update(START + HOUR, forecast(), {}, plan("fallback"), "elec_load")
+    assert policy.check(START + 2 * HOUR, forecast(), {}) == "no plan"
+    assert policy.solves == 2
+    assert policy.triggers == {"no plan": 1, "elec_load": 1}
+
+
+def test_cached_result_is_kept():
+    policy = planned_policy()
+    policy.update(START + HOUR, forecast(), {}, plan("cache"), "elec_load")
+    assert policy.check(START + 2 * HOUR, forecast(), {}) is None
+
+
+def test_debug_csv(tmpdir):
+    """The skip reason of a kept plan is written after a solve row."""
+    system = SystemModel(lambda now, forecasts, parameters: plan(), None, 60, trigger_policy=TriggerPolicy())
+    file_name = str(tmpdir.join("optimizer.csv"))
+    output = OptimizerCSVOutput(file_name)
+    for now, loads in [(START, forecast()), (START + HOUR, forecast(520.0))]:
+        output.writerow(system.run_triggered_optimizer(now, loads, {}), loads, now)
+    output.close()
+
+    with open(file_name, "rb") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["Reoptimization Trigger"] for row in rows] == ["no plan", ""]
+    assert [row["Reoptimization Skip"] for row in rows] == ["", "plan 1 h old, largest drift elec_load 0.040"]
+    assert [row["Objective Value"] for row in rows] == ["100.0", ""]
+    assert [row["Solution Source"] for row in rows] == ["solver", "plan"]
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+# }}}
+
+import datetime
+
+import numpy as np
+
+from econ_dispatch.optimizer.warm_start import shift_name, WarmStart
+
+
+def test_shift_name():
+    assert shift_name("Q_boiler_hour03_aux0", 1) == "Q_boiler_hour04_aux0"
+    assert shift_name("Q_chiller2_hour10", -3) == "Q_chiller2_hour07"
+    assert shift_name("Sturbine_hour09", 1) == "Sturbine_hour10"
+    assert shift_name("Q_boiler_hour00", 0) == "Q_boiler_hour00"
+    assert shift_name("Objective Value", 1) is None
+
+
+def test_shift_name_round_trip():
+    for name in ("E_chillerelec1_hour05", "Q_abs_hour23_aux0", "Heat_unserve_hour11"):
+        assert shift_name(shift_name(name, 4), -4) == name
+
+
+def test_warm_start_shifts_last_solution():
+    names = ["x_hour00", "x_hour01", "x_hour02", "y"]
+    start = datetime.datetime(2017, 7, 1)
+    warm_start = WarmStart()
+    assert warm_start.get(start, names) is None
+
+    warm_start.update(start, names, np.array([1.0, 2.0, 3.0, 4.0]))
+    x = warm_start.get(start + datetime.timedelta(hours=1), names)
+    assert x[:2].tolist() == [2.0, 3.0]
+    assert np.isnan(x[2]) and np.isnan(x[3])
+    assert warm_start.hit_rate == 0.5
+
+
+def test_warm_start_needs_whole_steps():
+    names = ["x_hour00", "x_hour01"]
+    start = datetime.datetime(2017, 7, 1)
+    warm_start = WarmStart()
+    warm_start.update(start, names, np.array([1.0, 2.0]))
+    assert warm_start.get(start + datetime.timedelta(minutes=30), names) is None
+    assert warm_start.get(start - datetime.timedelta(hours=1), names) is None
+    assert warm_start.get(None, names) is None
+    # Shifted past the end of the horizon.
+    assert warm_start.get(start + datetime.timedelta(hours=2), names) is None